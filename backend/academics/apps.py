@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+from django.db.models.signals import pre_migrate
+
+
+class AcademicsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'academics'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .search import ensure_extensions
+
+        pre_migrate.connect(ensure_extensions, sender=self)
@@ -0,0 +1,276 @@
+"""
+Promedios: por trimestre (GradeAverage), anual por materia (SubjectAverage)
+y general de la matrícula (EnrollmentAverage).
+
+Toda escritura de StudentGrade marca como "sucia" su clave
+(enrollment_id, subject_id, grading_period_id):
+
+- save/delete lo hacen solos (academics/signals.py);
+- las escrituras masivas sin señales (bulk_create, update) llaman a
+  mark_dirty() con las claves que tocaron.
+
+Las claves se juntan por colegio hasta que la transacción confirma y se
+recalculan juntas en recalculate(): una query de notas, una de dimensiones
+activas, una de pesos y un upsert de GradeAverage, sin importar cuántas notas
+se hayan guardado. Fuera de un atomic() el on_commit corre enseguida, así que
+un save suelto recalcula en el momento.
+
+El promedio es la media ponderada de las notas de las dimensiones activas:
+el peso de cada dimensión es el de DimensionWeight para la materia y el grado
+o, si no hay, su default_weight. Solo hay promedio cuando están todas las
+dimensiones activas; si una clave queda incompleta (p. ej. se borró una
+nota), su GradeAverage se elimina.
+
+Los promedios anuales se mantienen igual, un nivel más arriba: todo cambio
+de GradeAverage marca su (enrollment_id, subject_id) con mark_annual_dirty()
+(save/delete por señal; recalculate() y academics/recompute.py a mano) y al
+confirmar refresh_annual() rehace en bloque:
+
+- SubjectAverage: media de los trimestres con promedio de esa materia;
+- EnrollmentAverage: media de los SubjectAverage de la matrícula.
+
+Así la libreta y los rankings son una lectura indexada de una tabla.
+"""
+
+import threading
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import connection, transaction
+from django.db.models import Count, Q, Sum
+
+from core.cache import tenant_cache
+
+from .models import (
+    DimensionWeight,
+    EnrollmentAverage,
+    GradeAverage,
+    GradingDimension,
+    StudentGrade,
+    SubjectAverage,
+)
+
+_state = threading.local()
+
+CENT = Decimal("0.01")
+
+
+def _pending(kind):
+    if not hasattr(_state, "pending"):
+        _state.pending = {}
+    return _state.pending.setdefault((connection.schema_name, kind), set())
+
+
+def _take(kind):
+    keys = _pending(kind)
+    batch = set(keys)
+    keys.clear()
+    return batch
+
+
+def _mark(kind, keys):
+    if not keys:
+        return
+    _pending(kind).update(keys)
+    # Uno por llamada: si un savepoint se revierte, se pierde su callback
+    # pero no las claves, que salen con el siguiente. flush() es idempotente.
+    transaction.on_commit(flush)
+
+
+def mark_dirty(*keys):
+    """Agenda el recálculo de (enrollment_id, subject_id, grading_period_id)."""
+    _mark("period", keys)
+
+
+def mark_annual_dirty(*pairs):
+    """Agenda el recálculo anual de (enrollment_id, subject_id)."""
+    _mark("annual", pairs)
+
+
+def flush():
+    keys = _take("period")
+    if keys:
+        recalculate(keys)
+    # Después de recalculate(): junta también los pares que marcó
+    pairs = _take("annual")
+    if pairs:
+        refresh_annual(pairs)
+
+
+def weighted_average(scores, weights):
+    """Media ponderada de {dimension_id: nota} con {dimension_id: peso}."""
+    total = sum(weights[dimension] for dimension in scores)
+    if not total:
+        return None
+    value = sum(score * weights[dimension] for dimension, score in scores.items()) / total
+    return value.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def load_weights(subject_ids=None, grade_ids=None):
+    """
+    ({dimension_id: default_weight} de las dimensiones activas,
+     {(subject_id, grade_id): {dimension_id: peso}} de DimensionWeight).
+    Sin filtros trae todos los DimensionWeight del colegio.
+    """
+    defaults = dict(
+        GradingDimension.objects.filter(is_active=True).values_list("id", "default_weight")
+    )
+    rows = DimensionWeight.objects.all()
+    if subject_ids is not None:
+        rows = rows.filter(subject_id__in=subject_ids)
+    if grade_ids is not None:
+        rows = rows.filter(grade_id__in=grade_ids)
+    custom = {}
+    for subject_id, grade_id, dimension_id, weight in rows.values_list(
+        "subject_id", "grade_id", "dimension_id", "weight"
+    ):
+        custom.setdefault((subject_id, grade_id), {})[dimension_id] = weight
+    return defaults, custom
+
+
+def weights_for(pair, defaults, custom):
+    """Pesos de las dimensiones activas para (subject_id, grade_id)."""
+    own = custom.get(pair, {})
+    return {dimension_id: own.get(dimension_id, default) for dimension_id, default in defaults.items()}
+
+
+def dimension_weights(pairs):
+    """
+    {(subject_id, grade_id): {dimension_id: peso}} para las dimensiones
+    activas, con DimensionWeight si la materia/grado tiene pesos propios.
+    """
+    if not pairs:
+        return {}
+    defaults, custom = load_weights(
+        subject_ids={subject_id for subject_id, _ in pairs},
+        grade_ids={grade_id for _, grade_id in pairs},
+    )
+    return {pair: weights_for(pair, defaults, custom) for pair in pairs}
+
+
+def recalculate(keys):
+    """Recalcula y guarda en bloque los promedios de las claves dadas."""
+    keys = set(keys)
+    if not keys:
+        return
+
+    scores, grade_of = {}, {}
+    # Superconjunto de las claves (una query); se filtra en memoria
+    rows = StudentGrade.objects.filter(
+        enrollment_id__in={k[0] for k in keys},
+        subject_id__in={k[1] for k in keys},
+        grading_period_id__in={k[2] for k in keys},
+    ).order_by().values_list(
+        "enrollment_id", "subject_id", "grading_period_id",
+        "enrollment__grade_id", "dimension_id", "score",
+    )
+    for enrollment_id, subject_id, grading_period_id, grade_id, dimension_id, score in rows:
+        key = (enrollment_id, subject_id, grading_period_id)
+        if key in keys:
+            scores.setdefault(key, {})[dimension_id] = score
+            grade_of[key] = (subject_id, grade_id)
+
+    weights = dimension_weights(set(grade_of.values()))
+    averages = []
+    for key, by_dimension in scores.items():
+        active = weights[grade_of[key]]
+        if not active or not active.keys() <= by_dimension.keys():
+            continue
+        average = weighted_average(
+            {dimension: by_dimension[dimension] for dimension in active}, active
+        )
+        if average is not None:
+            averages.append(
+                GradeAverage(
+                    enrollment_id=key[0], subject_id=key[1], grading_period_id=key[2],
+                    average=average,
+                )
+            )
+
+    stale = keys - {
+        (a.enrollment_id, a.subject_id, a.grading_period_id) for a in averages
+    }
+    with transaction.atomic():
+        GradeAverage.objects.bulk_create(
+            averages,
+            update_conflicts=True,
+            unique_fields=["enrollment", "subject", "grading_period"],
+            update_fields=["average", "calculated_at"],
+        )
+        if stale:
+            condition = Q()
+            for enrollment_id, subject_id, grading_period_id in stale:
+                condition |= Q(
+                    enrollment_id=enrollment_id,
+                    subject_id=subject_id,
+                    grading_period_id=grading_period_id,
+                )
+            GradeAverage.objects.filter(condition).delete()
+        mark_annual_dirty(*{(enrollment_id, subject_id) for enrollment_id, subject_id, _ in keys})
+        # bulk_create no emite post_save
+        transaction.on_commit(lambda: tenant_cache.bump(GradeAverage))
+
+
+def _mean(total, count):
+    return (total / count).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def refresh_annual(pairs):
+    """Rehace en bloque los SubjectAverage de `pairs` y los EnrollmentAverage de sus matrículas."""
+    pairs = set(pairs)
+    if not pairs:
+        return
+    enrollment_ids = {enrollment_id for enrollment_id, _ in pairs}
+
+    subject_rows = GradeAverage.objects.filter(
+        enrollment_id__in=enrollment_ids,
+        subject_id__in={subject_id for _, subject_id in pairs},
+    ).order_by().values("enrollment_id", "subject_id").annotate(
+        total=Sum("average"), count=Count("id")
+    )
+    subject_averages = [
+        SubjectAverage(
+            enrollment_id=row["enrollment_id"],
+            subject_id=row["subject_id"],
+            average=_mean(row["total"], row["count"]),
+            periods_count=row["count"],
+        )
+        for row in subject_rows
+        if (row["enrollment_id"], row["subject_id"]) in pairs
+    ]
+    stale = pairs - {(a.enrollment_id, a.subject_id) for a in subject_averages}
+
+    with transaction.atomic():
+        SubjectAverage.objects.bulk_create(
+            subject_averages,
+            update_conflicts=True,
+            unique_fields=["enrollment", "subject"],
+            update_fields=["average", "periods_count", "calculated_at"],
+        )
+        if stale:
+            condition = Q()
+            for enrollment_id, subject_id in stale:
+                condition |= Q(enrollment_id=enrollment_id, subject_id=subject_id)
+            SubjectAverage.objects.filter(condition).delete()
+
+        overall = [
+            EnrollmentAverage(
+                enrollment_id=row["enrollment_id"],
+                average=_mean(row["total"], row["count"]),
+                subjects_count=row["count"],
+            )
+            for row in SubjectAverage.objects.filter(enrollment_id__in=enrollment_ids)
+            .order_by()
+            .values("enrollment_id")
+            .annotate(total=Sum("average"), count=Count("id"))
+        ]
+        EnrollmentAverage.objects.bulk_create(
+            overall,
+            update_conflicts=True,
+            unique_fields=["enrollment"],
+            update_fields=["average", "subjects_count", "calculated_at"],
+        )
+        empty = enrollment_ids - {a.enrollment_id for a in overall}
+        if empty:
+            EnrollmentAverage.objects.filter(enrollment_id__in=empty).delete()
+        # bulk_create no emite post_save
+        transaction.on_commit(lambda: tenant_cache.bump(SubjectAverage, EnrollmentAverage))
@@ -0,0 +1,82 @@
+"""
+Snapshot de catálogos: GET /api/catalog/snapshot.
+
+El frontend arranca pidiendo ocho catálogos chicos (niveles, períodos,
+grados, secciones, materias, dimensiones, trimestres y pesos). El snapshot
+los devuelve en una sola respuesta compacta, por columnas:
+
+    {
+      "version": "3f9c...",
+      "tables": {
+        "levels": {"columns": ["id", "name", ...], "rows": [[1, "Primaria", ...], ...]},
+        ...
+      }
+    }
+
+- Se arma con values_list() (sin instancias ni serializers) y se guarda ya
+  renderado en el cache del colegio.
+- version sale de los contadores por modelo de core/cache.py; save/delete de
+  cualquiera de estos modelos los incrementa (tenant_cache.watch), así que la
+  clave cambia sola y no hay que borrar nada.
+- El cliente manda la versión que tiene (?version= o If-None-Match) y recibe
+  304 si sigue vigente.
+"""
+
+import hashlib
+
+from rest_framework.renderers import JSONRenderer
+
+from core.cache import tenant_cache, tenant_key
+
+from .models import (
+    AcademicPeriod,
+    DimensionWeight,
+    EducationLevel,
+    Grade,
+    GradingDimension,
+    GradingPeriod,
+    Section,
+    Subject,
+)
+
+CATALOG = {
+    "levels": (EducationLevel, ("id", "name", "short_name", "is_active")),
+    "periods": (AcademicPeriod, ("id", "name", "start_date", "end_date", "is_active")),
+    "grades": (Grade, ("id", "level_id", "name", "order", "is_active")),
+    "sections": (Section, ("id", "grade_id", "name", "capacity", "is_active")),
+    "subjects": (Subject, ("id", "level_id", "name", "short_name", "is_active")),
+    "grading_dimensions": (GradingDimension, ("id", "name", "default_weight", "is_active")),
+    "grading_periods": (
+        GradingPeriod,
+        ("id", "academic_period_id", "name", "start_date", "end_date", "is_active"),
+    ),
+    "dimension_weights": (DimensionWeight, ("id", "subject_id", "grade_id", "dimension_id", "weight")),
+}
+MODELS = [model for model, _ in CATALOG.values()]
+
+tenant_cache.watch(*MODELS)
+
+
+def snapshot_version():
+    versions = ".".join(map(str, tenant_cache.version(*MODELS)))
+    return hashlib.blake2b(tenant_key("catalog", versions).encode(), digest_size=8).hexdigest()
+
+
+def build_snapshot(version):
+    tables = {}
+    for name, (model, columns) in CATALOG.items():
+        # Por id: el Meta.ordering de grados y secciones ordena con JOIN a otras tablas
+        rows = model.objects.order_by("id").values_list(*columns)
+        tables[name] = {"columns": list(columns), "rows": [list(row) for row in rows]}
+    return {"version": version, "tables": tables}
+
+
+def snapshot_content():
+    """(versión, JSON renderado) desde el cache o recién armado."""
+    version = snapshot_version()
+    key = f"catalog:snapshot:{version}"
+    content = tenant_cache.get(key)
+    if content is None:
+        content = JSONRenderer().render(build_snapshot(version))
+        tenant_cache.set(key, content)
+    return version, content
@@ -0,0 +1,154 @@
+"""
+Sparse fieldsets para las lecturas de academics: ?fields= y ?expand=.
+
+    GET /api/enrollments?fields=id,status,student
+    GET /api/enrollments?fields=id,status&expand=student,section
+
+- Sin ?fields= la respuesta es la de siempre (todos los campos).
+- ?fields= deja solo los campos pedidos (los desconocidos se ignoran).
+- ?expand= agrega los campos derivados de una relación: los que siguen una
+  cadena source= (student.person.__str__) que empieza en esa relación, o cuyo
+  nombre empieza con "<relación>_" (expand=student -> student_code,
+  student_name).
+
+SparseFieldsMixin (serializers) poda los campos; SparseQuerysetMixin (vistas)
+traduce los campos elegidos a select_related() + only() para que la query
+traiga solo esas columnas y las relaciones necesarias. Se usa only() y no
+values() porque los serializers (validaciones, SerializerMethodField) trabajan
+sobre instancias. Si algún campo elegido depende de algo que no se puede
+deducir (una property, un método), el queryset queda como estaba.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+from .models import Person
+
+# Columnas que usa __str__ de los modelos que aparecen en source=
+STR_FIELDS = {
+    Person: ("first_name", "last_name"),
+}
+
+
+def _param_set(request, name):
+    raw = request.query_params.get(name, "") if request is not None else ""
+    return {part.strip() for part in raw.split(",") if part.strip()}
+
+
+def requested_fieldset(request):
+    """(fields, expand) de la request o (None, None) si no hay que podar."""
+    if request is None or request.method not in ("GET", "HEAD"):
+        return None, None
+    fields = _param_set(request, "fields")
+    if not fields:
+        return None, None
+    return fields, _param_set(request, "expand")
+
+
+def _expanded(name, field, expand):
+    source = field.source or name
+    return any(
+        source == e or source.startswith(f"{e}.") or name.startswith(f"{e}_") for e in expand
+    )
+
+
+def select_fields(all_fields, fields, expand):
+    return [
+        name
+        for name, field in all_fields.items()
+        if name in fields or ("." in (field.source or "") and _expanded(name, field, expand))
+    ]
+
+
+class SparseFieldsMixin:
+    """Serializer que respeta ?fields= / ?expand= en lecturas."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields, expand = requested_fieldset(self.context.get("request"))
+        if fields is None:
+            return
+        keep = set(select_fields(self.fields, fields, expand))
+        for name in list(self.fields):
+            if name not in keep:
+                self.fields.pop(name)
+
+
+# --- proyección del queryset ---
+def _source_columns(model, source):
+    """
+    Para un source= (p. ej. "student.person.__str__") devuelve
+    (relaciones a select_related, columnas para only()) o None si no se
+    puede deducir.
+    """
+    path, related = [], []
+    parts = source.split(".")
+    for index, attr in enumerate(parts):
+        last = index == len(parts) - 1
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            field = None
+
+        if field is not None and field.concrete:
+            column = "__".join(path + [field.name])  # level_id -> level
+            if field.is_relation and not last:
+                related.append(column)
+                path.append(field.name)
+                model = field.related_model
+                continue
+            return related, [column]
+
+        # Métodos conocidos sobre el modelo actual
+        if attr == "__str__" and model in STR_FIELDS:
+            columns = STR_FIELDS[model]
+        elif attr.startswith("get_") and attr.endswith("_display"):
+            columns = (attr[4:-8],)
+        else:
+            return None
+        return related, ["__".join(path + [c]) for c in columns]
+    return None
+
+
+def projection(model, serializer):
+    """(select_related, only) para los campos del serializer ya podado."""
+    dependencies = getattr(getattr(serializer, "Meta", None), "sparse_dependencies", {})
+    related, columns = set(), {"pk"}
+    for name, field in serializer.fields.items():
+        if name in dependencies:
+            columns.update(dependencies[name])
+            continue
+        if field.source == "*":
+            return None
+        resolved = _source_columns(model, field.source)
+        if resolved is None:
+            return None
+        related.update(resolved[0])
+        columns.update(resolved[1])
+    # Los saltos de select_related tienen que estar cargados para poder recorrerse
+    columns.update(related)
+    return sorted(related), sorted(columns)
+
+
+class SparseQuerysetMixin:
+    """
+    Vista de lectura que reduce el queryset a la proyección de ?fields=.
+    Los campos de keyset_ordering siempre se cargan (el cursor los lee).
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields, _ = requested_fieldset(self.request)
+        if fields is None:
+            return queryset
+        serializer = self.get_serializer()
+        if not isinstance(serializer, serializers.ModelSerializer):
+            return queryset
+        projected = projection(queryset.model, serializer)
+        if projected is None:
+            return queryset
+        related, columns = projected
+        opts = queryset.model._meta
+        for name in getattr(self, "keyset_ordering", ()):
+            columns.append(opts.get_field(name.lstrip("-")).name)
+        return queryset.select_related(None).select_related(*related).only(*columns)
@@ -0,0 +1,247 @@
+"""
+Planilla de notas de una sección (GradeSheetView).
+
+build_grade_sheet() arma la planilla con un número fijo de queries, sin
+importar cuántos estudiantes tenga la sección:
+
+    1. dimensiones activas
+    2. matrículas activas de la sección (con código y nombre del estudiante)
+    3. todas las notas de la sección para la materia y el trimestre
+    4. todos los promedios de la sección para la materia y el trimestre
+
+Todas con values(), y el cruce estudiante x dimensión se hace en memoria.
+
+upsert_grades() guarda la planilla (POST) por conjuntos:
+
+    1. carga de una vez matrículas, materias, dimensiones, trimestres y
+       asignaciones referenciadas (in_bulk) y las notas ya existentes
+    2. valida cada fila en memoria, con los mismos mensajes que
+       StudentGradeSerializer
+    3. escribe todo con un INSERT ... ON CONFLICT sobre
+       (enrollment, subject, dimension, grading_period) en una transacción
+    4. marca cada (matrícula, materia, trimestre) tocado para que
+       academics/averages.py recalcule sus promedios juntos al confirmar
+
+bulk_create no emite post_save: la versión del cache (core/cache.py) se sube
+a mano al confirmar la transacción.
+"""
+
+from django.db import transaction
+from rest_framework import serializers
+
+from core.cache import tenant_cache
+
+from . import averages
+from .models import (
+    Enrollment,
+    GradeAverage,
+    GradingDimension,
+    GradingPeriod,
+    StudentGrade,
+    Subject,
+    TeacherAssignment,
+)
+
+# Queries de build_grade_sheet() y de upsert_grades() más el recálculo de promedios
+# (trimestre y anuales); bench_grade_sheet falla si se superan
+SHEET_QUERIES = 4
+SAVE_QUERIES = 15
+
+GRADE_KEY = ("enrollment", "subject", "dimension", "grading_period")
+REFERENCES = {
+    "enrollment": Enrollment.objects.select_related("grade"),
+    "subject": Subject.objects.all(),
+    "dimension": GradingDimension.objects.all(),
+    "grading_period": GradingPeriod.objects.all(),
+    "teacher_assignment": TeacherAssignment.objects.all(),
+}
+PK_MESSAGES = serializers.PrimaryKeyRelatedField(read_only=True).error_messages
+ROW_MESSAGES = serializers.Serializer().error_messages
+SCORE_FIELD = serializers.DecimalField(max_digits=5, decimal_places=2)
+
+
+def _person_name(first_name, last_name):
+    # Igual que Person.__str__
+    return f"{last_name}, {first_name}".strip()
+
+
+def build_grade_sheet(grade_id, section_id, period_id, subject_id, grading_period_id):
+    dimensions = list(
+        GradingDimension.objects.filter(is_active=True).order_by("name").values_list("name", flat=True)
+    )
+
+    scope = {
+        "enrollment__grade_id": grade_id,
+        "enrollment__section_id": section_id,
+        "enrollment__period_id": period_id,
+        "enrollment__status": "ACTIVE",
+        "subject_id": subject_id,
+        "grading_period_id": grading_period_id,
+    }
+    enrollments = (
+        Enrollment.objects.filter(
+            grade_id=grade_id, section_id=section_id, period_id=period_id, status="ACTIVE"
+        )
+        .order_by("student__code")
+        .values_list("id", "student__code", "student__person__first_name", "student__person__last_name")
+    )
+    grades = StudentGrade.objects.filter(**scope).values_list(
+        "id", "enrollment_id", "dimension__name", "score", "notes"
+    )
+    averages = GradeAverage.objects.filter(**scope).values_list("enrollment_id", "average")
+
+    by_enrollment = {}
+    for pk, enrollment_id, dimension, score, notes in grades:
+        by_enrollment.setdefault(enrollment_id, {})[dimension] = {
+            "id": pk,
+            "score": float(score),
+            "notes": notes,
+        }
+    average_of = {enrollment_id: float(average) for enrollment_id, average in averages}
+
+    students = [
+        {
+            "enrollment_id": enrollment_id,
+            "student_code": code,
+            "student_name": _person_name(first_name, last_name),
+            "grades": by_enrollment.get(enrollment_id, {}),
+            "average": average_of.get(enrollment_id),
+        }
+        for enrollment_id, code, first_name, last_name in enrollments
+    ]
+    return {"dimensions": dimensions, "students": students}
+
+
+def _as_pk(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _field_errors(row, refs):
+    """Valida los campos de una fila; devuelve (valores, errores) como el serializer."""
+    values, errors = {}, {}
+    for name in REFERENCES:
+        raw, pk = row.get(name), _as_pk(row.get(name))
+        if raw in (None, ""):
+            errors[name] = [PK_MESSAGES["required" if name not in row else "null"]]
+        elif pk is None:
+            errors[name] = [PK_MESSAGES["incorrect_type"].format(data_type=type(raw).__name__)]
+        elif pk not in refs[name]:
+            errors[name] = [PK_MESSAGES["does_not_exist"].format(pk_value=raw)]
+        else:
+            values[name] = refs[name][pk]
+
+    try:
+        score = SCORE_FIELD.run_validation(row.get("score", serializers.empty))
+        if score < 1 or score > 100:
+            raise serializers.ValidationError("La nota debe estar entre 1 y 100")
+        values["score"] = score
+    except serializers.ValidationError as exc:
+        errors["score"] = exc.detail
+
+    if "notes" in row:
+        values["notes"] = str(row["notes"] or "")
+    return values, errors
+
+
+def _consistency_error(enrollment, subject, grading_period, assignment):
+    # Mismas reglas que StudentGradeSerializer.validate
+    if enrollment.status != "ACTIVE":
+        return "No se puede calificar una matrícula inactiva"
+    if subject.level_id != enrollment.grade.level_id:
+        return "La materia debe pertenecer al nivel educativo del estudiante"
+    if grading_period.academic_period_id != enrollment.period_id:
+        return "El trimestre debe pertenecer al período académico de la matrícula"
+    valid = (
+        assignment.subject_id == subject.id
+        and assignment.grade_id == enrollment.grade_id
+        and assignment.section_id == enrollment.section_id
+        and assignment.period_id == enrollment.period_id
+        and assignment.is_active
+    )
+    if not valid:
+        return "El docente no tiene asignación válida para esta materia/grado/sección"
+    return None
+
+
+def upsert_grades(rows, user):
+    """
+    Crea o actualiza las notas de `rows` (formato del POST de GradeSheetView).
+
+    Devuelve {"created": [pk...], "updated": [pk...], "errors": [...]}. Las
+    filas inválidas se informan en errors y no impiden guardar las demás; si
+    una misma nota viene repetida, gana la última.
+    """
+    ids = {name: set() for name in REFERENCES}
+    for row in rows:
+        if not isinstance(row, dict):
+            continue
+        for name in REFERENCES:
+            pk = _as_pk(row.get(name))
+            if pk is not None:
+                ids[name].add(pk)
+    refs = {name: qs.in_bulk(ids[name]) for name, qs in REFERENCES.items()}
+
+    errors, valid = [], {}
+    for row in rows:
+        if not isinstance(row, dict):
+            errors.append(
+                {"non_field_errors": [ROW_MESSAGES["invalid"].format(datatype=type(row).__name__)]}
+            )
+            continue
+        values, row_errors = _field_errors(row, refs)
+        if not row_errors:
+            message = _consistency_error(
+                values["enrollment"], values["subject"],
+                values["grading_period"], values["teacher_assignment"],
+            )
+            if message:
+                row_errors = {"non_field_errors": [message]}
+        if row_errors:
+            errors.append(row_errors)
+            continue
+        valid[tuple(values[name].pk for name in GRADE_KEY)] = values
+
+    if not valid:
+        return {"created": [], "updated": [], "errors": errors}
+
+    # Superconjunto de las claves enviadas (una query); se filtra en memoria
+    existing = {
+        row[:4]: row[4]
+        for row in StudentGrade.objects.filter(
+            **{f"{name}_id__in": {key[i] for key in valid} for i, name in enumerate(GRADE_KEY)}
+        ).order_by().values_list(*(f"{name}_id" for name in GRADE_KEY), "notes")
+        if row[:4] in valid
+    }
+
+    grades = [
+        StudentGrade(
+            enrollment=values["enrollment"],
+            subject=values["subject"],
+            dimension=values["dimension"],
+            grading_period=values["grading_period"],
+            score=values["score"],
+            teacher_assignment=values["teacher_assignment"],
+            recorded_by=user,
+            # Como el update parcial del serializer: sin notes se conservan las anteriores
+            notes=values.get("notes", existing.get(key, "")),
+        )
+        for key, values in valid.items()
+    ]
+    with transaction.atomic():
+        StudentGrade.objects.bulk_create(
+            grades,
+            update_conflicts=True,
+            unique_fields=list(GRADE_KEY),
+            update_fields=["score", "notes", "teacher_assignment", "updated_at"],
+        )
+        averages.mark_dirty(*{(e, s, gp) for e, s, _, gp in valid})
+        transaction.on_commit(lambda: tenant_cache.bump(StudentGrade))
+
+    created, updated = [], []
+    for key, grade in zip(valid, grades):
+        (updated if key in existing else created).append(grade.pk)
+    return {"created": created, "updated": updated, "errors": errors}
+
@@ -0,0 +1,69 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django_tenants.utils import schema_context
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from academics import views
+from accounts.models import User
+from tenants.models import Client
+
+VIEWS = {
+    "enrollments": (views.EnrollmentListCreateView, "id,status", "student"),
+    "student-grades": (views.StudentGradeListCreateView, "id,score", "student,dimension"),
+    "teacher-assignments": (views.TeacherAssignmentListCreateView, "id,schedule_day", "teacher"),
+    "students": (views.StudentListCreateView, "id,code", "person"),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Respuesta completa vs. ?fields=/?expand=: tiempo de query, CPU del "
+        "serializer y bytes del JSON para N filas de un listado de academics."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--schema", required=True)
+        parser.add_argument("--endpoint", choices=sorted(VIEWS), default="enrollments")
+        parser.add_argument("--fields", help="Por defecto depende del endpoint.")
+        parser.add_argument("--expand")
+        parser.add_argument("--rows", type=int, default=500)
+        parser.add_argument("--repeat", type=int, default=10)
+
+    def handle(self, *args, **opts):
+        if not Client.objects.filter(schema_name=opts["schema"]).exists():
+            raise CommandError(f"No existe el colegio {opts['schema']}")
+        view_class, fields, expand = VIEWS[opts["endpoint"]]
+        sparse = {"fields": opts["fields"] or fields, "expand": opts["expand"] or expand}
+
+        with schema_context(opts["schema"]):
+            for label, params in (("completo", {}), (f"sparse {sparse}", sparse)):
+                query_ms, cpu_ms, size, rows = self._measure(view_class, params, opts)
+                self.stdout.write(
+                    f"{label}: {rows} filas | query {query_ms:.1f}ms | serializer CPU "
+                    f"{cpu_ms:.1f}ms | {size / 1024:.1f}KB ({size / max(rows, 1):.0f} B/fila)"
+                )
+
+    def _measure(self, view_class, params, opts):
+        user = User(email="bench@localhost", name="bench", role="ADM", is_staff=True)
+        query, cpu = [], []
+        size = rows = 0
+        for _ in range(opts["repeat"]):
+            request = Request(APIRequestFactory().get(f"/api/{opts['endpoint']}", params))
+            request.user = user
+            view = view_class(request=request, format_kwarg=None, args=(), kwargs={})
+            queryset = view.filter_queryset(view.get_queryset())
+
+            started = time.perf_counter()
+            objects = list(queryset[: opts["rows"]])
+            query.append((time.perf_counter() - started) * 1000)
+
+            started = time.process_time()
+            data = view.get_serializer(objects, many=True).data
+            cpu.append((time.process_time() - started) * 1000)
+
+            size, rows = len(JSONRenderer().render(data)), len(objects)
+        return statistics.median(query), statistics.median(cpu), size, rows
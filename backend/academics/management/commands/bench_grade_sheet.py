@@ -0,0 +1,202 @@
+import datetime
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django_tenants.utils import schema_context
+
+from academics import averages
+from academics.gradesheet import SAVE_QUERIES, SHEET_QUERIES, build_grade_sheet, upsert_grades
+from academics.models import (
+    AcademicPeriod,
+    EducationLevel,
+    Enrollment,
+    Grade,
+    GradeAverage,
+    GradingDimension,
+    GradingPeriod,
+    Person,
+    Section,
+    Student,
+    StudentGrade,
+    Subject,
+    Teacher,
+    TeacherAssignment,
+)
+from academics.search import person_text, student_text
+from accounts.models import User
+from tenants.models import Client
+
+
+def legacy_grade_sheet(grade_id, section_id, period_id, subject_id, grading_period_id):
+    """La planilla como se armaba antes: 2 queries por estudiante."""
+    enrollments = Enrollment.objects.filter(
+        grade_id=grade_id, section_id=section_id, period_id=period_id, status="ACTIVE"
+    ).select_related("student__person").order_by("student__code")
+    dimensions = GradingDimension.objects.filter(is_active=True).order_by("name")
+
+    students = []
+    for enrollment in enrollments:
+        grades = StudentGrade.objects.filter(
+            enrollment=enrollment, subject_id=subject_id, grading_period_id=grading_period_id
+        ).select_related("dimension")
+        average = GradeAverage.objects.filter(
+            enrollment=enrollment, subject_id=subject_id, grading_period_id=grading_period_id
+        ).first()
+        students.append(
+            {
+                "enrollment_id": enrollment.id,
+                "student_code": enrollment.student.code,
+                "student_name": str(enrollment.student.person),
+                "grades": {
+                    g.dimension.name: {"id": g.id, "score": float(g.score), "notes": g.notes}
+                    for g in grades
+                },
+                "average": float(average.average) if average else None,
+            }
+        )
+    return {"dimensions": [d.name for d in dimensions], "students": students}
+
+
+def save_sheet(rows, user):
+    """upsert_grades() + el recálculo de promedios que correría al confirmar."""
+    result = upsert_grades(rows, user)
+    averages.flush()
+    return result
+
+
+class Command(BaseCommand):
+    help = (
+        "GET de la planilla de notas (GradeSheetView) con el armado por "
+        "estudiante anterior vs. build_grade_sheet(), y POST de la planilla "
+        "completa con upsert_grades(), para secciones sintéticas de distintos "
+        f"tamaños. Falla si la lectura usa más de {SHEET_QUERIES} queries o el "
+        f"guardado más de {SAVE_QUERIES}. Los datos se crean en una "
+        "transacción que se revierte al final."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--schema", required=True)
+        parser.add_argument("--size", dest="sizes", type=int, action="append")
+        parser.add_argument("--repeat", type=int, default=10)
+
+    def handle(self, *args, **opts):
+        if not Client.objects.filter(schema_name=opts["schema"]).exists():
+            raise CommandError(f"No existe el colegio {opts['schema']}")
+
+        with schema_context(opts["schema"]), transaction.atomic():
+            for size in opts["sizes"] or [40, 200, 1000]:
+                params, rows, user = self._seed(size)
+                legacy = self._measure(legacy_grade_sheet, params, opts["repeat"])
+                batched = self._measure(build_grade_sheet, params, opts["repeat"])
+                if batched["data"] != legacy["data"]:
+                    raise CommandError(f"{size} estudiantes: las planillas no coinciden")
+                if batched["queries"] > SHEET_QUERIES:
+                    raise CommandError(
+                        f"{size} estudiantes: build_grade_sheet() hizo "
+                        f"{batched['queries']} queries (máximo {SHEET_QUERIES})"
+                    )
+                self.stdout.write(
+                    f"{size} estudiantes: anterior {legacy['queries']} queries "
+                    f"p50={legacy['ms']:.1f}ms | batch {batched['queries']} queries "
+                    f"p50={batched['ms']:.1f}ms"
+                )
+
+                saved = self._measure(save_sheet, (rows, user), opts["repeat"])
+                if saved["data"]["errors"]:
+                    raise CommandError(f"{size} estudiantes: {saved['data']['errors'][:3]}")
+                if saved["queries"] > SAVE_QUERIES:
+                    raise CommandError(
+                        f"{size} estudiantes: upsert_grades() hizo "
+                        f"{saved['queries']} queries (máximo {SAVE_QUERIES})"
+                    )
+                self.stdout.write(
+                    f"  guardar {len(rows)} notas: {saved['queries']} queries "
+                    f"p50={saved['ms']:.1f}ms ({len(rows) / saved['ms'] * 1000:.0f} notas/s)"
+                )
+            transaction.set_rollback(True)
+
+    def _measure(self, builder, params, repeat):
+        samples = []
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                data = builder(*params)
+                samples.append((time.perf_counter() - started) * 1000)
+        # Los SAVEPOINT de transaction.atomic() anidado no cuentan
+        queries = [q for q in captured if "SAVEPOINT" not in q["sql"]]
+        return {"data": data, "queries": len(queries), "ms": statistics.median(samples)}
+
+    def _seed(self, size):
+        tag = f"BENCH-SHEET-{size}"
+        today = datetime.date.today()
+        level = EducationLevel.objects.create(name=tag)
+        period = AcademicPeriod.objects.create(
+            name=tag, start_date=today, end_date=today + datetime.timedelta(days=300)
+        )
+        grade = Grade.objects.create(level=level, name=tag)
+        section = Section.objects.create(grade=grade, name="A", capacity=size)
+        subject = Subject.objects.create(level=level, name=tag)
+        grading_period = GradingPeriod.objects.create(
+            academic_period=period, name="T1", start_date=today, end_date=today
+        )
+        dimensions = [
+            GradingDimension.objects.get_or_create(name=name)[0]
+            for name, _ in GradingDimension.DIMENSION_CHOICES
+        ]
+
+        user = User.objects.create_user(email=f"{tag.lower()}@localhost", name=tag, role="DOC")
+        teacher = Teacher.objects.create(
+            person=Person.objects.create(first_name="Docente", last_name=tag),
+            user=user,
+            employee_code=tag,
+        )
+        assignment = TeacherAssignment.objects.create(
+            teacher=teacher, subject=subject, grade=grade, section=section, period=period
+        )
+
+        # bulk_create no emite pre_save: search_text se arma aquí
+        persons = [Person(first_name=f"Nombre{n}", last_name=f"Apellido{n}") for n in range(size)]
+        for person in persons:
+            person.search_text = person_text(person)
+        Person.objects.bulk_create(persons)
+        students = [Student(person=p, code=f"{tag}-{n:05d}") for n, p in enumerate(persons)]
+        for student in students:
+            student.search_text = student_text(student)
+        Student.objects.bulk_create(students)
+        enrollments = Enrollment.objects.bulk_create(
+            Enrollment(student=s, period=period, grade=grade, section=section) for s in students
+        )
+        StudentGrade.objects.bulk_create(
+            StudentGrade(
+                enrollment=e,
+                subject=subject,
+                dimension=d,
+                grading_period=grading_period,
+                score=60 + (e.pk + d.pk) % 40,
+                teacher_assignment=assignment,
+                recorded_by=user,
+            )
+            for e in enrollments
+            for d in dimensions
+        )
+        GradeAverage.objects.bulk_create(
+            GradeAverage(enrollment=e, subject=subject, grading_period=grading_period, average=75)
+            for e in enrollments
+        )
+        rows = [
+            {
+                "enrollment": e.pk,
+                "subject": subject.pk,
+                "dimension": d.pk,
+                "grading_period": grading_period.pk,
+                "score": 100 - (e.pk + d.pk) % 40,
+                "teacher_assignment": assignment.pk,
+            }
+            for e in enrollments
+            for d in dimensions
+        ]
+        params = grade.pk, section.pk, period.pk, subject.pk, grading_period.pk
+        return params, rows, user
@@ -0,0 +1,107 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django_tenants.utils import schema_context
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from academics.models import Person, Student
+from academics.pagination import KeysetPagination
+from academics.search import person_text, student_text
+from academics.views import StudentListCreateView
+from accounts.models import User
+from tenants.models import Client
+
+
+class OffsetStudentListView(StudentListCreateView):
+    """Misma vista con LIMIT/OFFSET (+ COUNT), como referencia."""
+
+    pagination_class = LimitOffsetPagination
+
+
+class Command(BaseCommand):
+    help = (
+        "Latencia de GET /api/students en la página 1 y la página N con "
+        "paginación keyset vs. LIMIT/OFFSET. --seed completa el colegio con "
+        "estudiantes sintéticos hasta llegar a la cantidad pedida."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--schema", required=True)
+        parser.add_argument("--seed", type=int, default=0, help="Estudiantes mínimos (ej. 50000).")
+        parser.add_argument("--page", dest="pages", type=int, action="append")
+        parser.add_argument("--page-size", type=int, default=50)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **opts):
+        if not Client.objects.filter(schema_name=opts["schema"]).exists():
+            raise CommandError(f"No existe el colegio {opts['schema']}")
+        pages = opts["pages"] or [1, 500]
+        size = opts["page_size"]
+
+        with schema_context(opts["schema"]):
+            if opts["seed"]:
+                self._seed(opts["seed"])
+            total = Student.objects.count()
+            self.stdout.write(f"{opts['schema']}: {total} estudiantes, {size} por página")
+
+            user = User(email="bench@localhost", name="bench", is_staff=True)
+            factory = APIRequestFactory()
+            keyset_view = StudentListCreateView.as_view()
+            offset_view = OffsetStudentListView.as_view()
+            paginator = KeysetPagination()
+
+            for page in pages:
+                offset = (page - 1) * size
+                if offset >= total:
+                    self.stdout.write(f"página {page}: fuera de rango")
+                    continue
+                params = {"page_size": size}
+                if offset:
+                    # El cursor de la página N es la clave de la última fila de la N-1
+                    last = Student.objects.order_by("code").values_list("code", flat=True)[offset - 1]
+                    params["cursor"] = paginator.encode_cursor([last])
+                keyset = self._time(factory, keyset_view, user, params, opts["repeat"])
+                offset_ms = self._time(
+                    factory, offset_view, user, {"limit": size, "offset": offset}, opts["repeat"]
+                )
+                self.stdout.write(
+                    f"página {page}: keyset p50={keyset:.1f}ms | offset p50={offset_ms:.1f}ms"
+                )
+
+    def _time(self, factory, view, user, params, repeat):
+        samples = []
+        for _ in range(repeat):
+            request = factory.get("/api/students", params)
+            force_authenticate(request, user=user)
+            started = time.perf_counter()
+            response = view(request)
+            response.render()
+            samples.append((time.perf_counter() - started) * 1000)
+            if response.status_code != 200:
+                raise CommandError(f"HTTP {response.status_code}: {response.content[:200]!r}")
+        return statistics.median(samples)
+
+    def _seed(self, wanted, chunk=5000):
+        existing = Student.objects.count()
+        missing = wanted - existing
+        if missing <= 0:
+            return
+        self.stdout.write(f"creando {missing} estudiantes sintéticos...")
+        start = Student.objects.filter(code__startswith="BENCH-").count()
+        for base in range(start, start + missing, chunk):
+            numbers = range(base, min(base + chunk, start + missing))
+            with transaction.atomic():
+                # bulk_create no emite pre_save: search_text se arma aquí
+                persons = [
+                    Person(first_name=f"Nombre{n}", last_name=f"Apellido{n % 997}") for n in numbers
+                ]
+                for person in persons:
+                    person.search_text = person_text(person)
+                Person.objects.bulk_create(persons)
+                students = [Student(person=p, code=f"BENCH-{n:07d}") for p, n in zip(persons, numbers)]
+                for student in students:
+                    student.search_text = student_text(student)
+                Student.objects.bulk_create(students)
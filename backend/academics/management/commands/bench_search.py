@@ -0,0 +1,78 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from django_tenants.utils import schema_context
+
+from academics.models import Person, Student
+from academics.search import search
+from tenants.models import Client
+
+DEFAULT_TERMS = ["BENCH-00421", "apellido42", "nombre4999", "apelido"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara ?q= con icontains (OR por columnas, como antes) contra "
+        "search_text con índice trigram y el modo ranked, sobre Person y "
+        "Student. Para un colegio grande: bench_pagination --seed 50000."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--schema", required=True)
+        parser.add_argument("--q", dest="terms", action="append")
+        parser.add_argument("--limit", type=int, default=50)
+        parser.add_argument("--repeat", type=int, default=10)
+
+    def handle(self, *args, **opts):
+        if not Client.objects.filter(schema_name=opts["schema"]).exists():
+            raise CommandError(f"No existe el colegio {opts['schema']}")
+
+        with schema_context(opts["schema"]):
+            self.stdout.write(
+                f"{opts['schema']}: {Person.objects.count()} personas, {Student.objects.count()} estudiantes"
+            )
+            for term in opts["terms"] or DEFAULT_TERMS:
+                persons = Person.objects.all()
+                students = Student.objects.select_related("person")
+                paths = {
+                    "person icontains": persons.filter(
+                        Q(first_name__icontains=term)
+                        | Q(last_name__icontains=term)
+                        | Q(doc_number__icontains=term)
+                        | Q(email__icontains=term)
+                    ),
+                    "person trigram": search(persons, term),
+                    "person ranked": search(persons, term, ranked=True, limit=opts["limit"]),
+                    "student icontains": students.filter(
+                        Q(code__icontains=term)
+                        | Q(person__first_name__icontains=term)
+                        | Q(person__last_name__icontains=term)
+                    ),
+                    "student trigram": search(students, term),
+                    "student ranked": search(students, term, ranked=True, limit=opts["limit"]),
+                }
+                self.stdout.write(f"q={term!r}")
+                for label, qs in paths.items():
+                    page_ms, count_ms, total = self._time(qs, opts)
+                    count = f" | count {count_ms:.1f}ms ({total} filas)" if count_ms is not None else ""
+                    self.stdout.write(f"  {label:18} página {page_ms:.1f}ms{count}")
+
+    def _time(self, qs, opts):
+        ranked = qs.query.is_sliced
+        page, counts, total = [], [], None
+        for _ in range(opts["repeat"]):
+            started = time.perf_counter()
+            list(qs if ranked else qs[: opts["limit"]])
+            page.append((time.perf_counter() - started) * 1000)
+            if not ranked:
+                # El total recorre todas las coincidencias: ahí se nota el seq scan
+                started = time.perf_counter()
+                total = qs.count()
+                counts.append((time.perf_counter() - started) * 1000)
+        return (
+            statistics.median(page),
+            statistics.median(counts) if counts else None,
+            total,
+        )
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand, CommandError
+from django_tenants.utils import schema_context
+
+from academics.recompute import BATCH_ENROLLMENTS, recompute_averages
+from tenants.models import Client
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula los GradeAverage de un colegio con los pesos actuales "
+        "(DimensionWeight / default_weight), por lotes de matrículas y con "
+        "NumPy si está instalado. Solo escribe los promedios que cambian."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--schema", required=True)
+        parser.add_argument("--subject", dest="subjects", type=int, action="append")
+        parser.add_argument("--grade", dest="grades", type=int, action="append")
+        parser.add_argument("--batch", type=int, default=BATCH_ENROLLMENTS, help="Matrículas por lote.")
+        parser.add_argument(
+            "--annual",
+            action="store_true",
+            help="Rehace también todos los promedios anuales y generales (carga inicial).",
+        )
+
+    def handle(self, *args, **opts):
+        if not Client.objects.filter(schema_name=opts["schema"]).exists():
+            raise CommandError(f"No existe el colegio {opts['schema']}")
+
+        with schema_context(opts["schema"]):
+            stats = recompute_averages(
+                subject_ids=opts["subjects"],
+                grade_ids=opts["grades"],
+                batch=opts["batch"],
+                annual=opts["annual"],
+                progress=self._progress,
+            )
+
+        rate = stats["rows"] / stats["seconds"] if stats["seconds"] else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{stats['rows']} notas en {stats['seconds']:.1f}s ({rate:.0f} notas/s, "
+                f"{stats['engine']}): {stats['written']} promedios escritos, "
+                f"{stats['deleted']} eliminados"
+            )
+        )
+
+    def _progress(self, done, total, rows, written, deleted, elapsed):
+        rate = rows / elapsed if elapsed else 0
+        self.stdout.write(
+            f"[{done}/{total} matrículas] {rows} notas ({rate:.0f}/s), "
+            f"{written} escritos, {deleted} eliminados"
+        )
@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django_tenants.utils import get_public_schema_name, schema_context, schema_exists
+
+from academics.models import Person, Student, Teacher
+from academics.search import person_text, student_text, teacher_text
+from core.cache import tenant_cache
+from tenants.models import Client
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruye search_text de Person/Student/Teacher (tras cargas con "
+        "bulk_create o al activar la búsqueda trigram en datos existentes). "
+        "Solo escribe las filas cuyo texto cambió: entrypoint.prod.sh lo corre "
+        "en cada arranque para completar las filas anteriores al campo."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("-s", "--schema", dest="schemas", action="append")
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **opts):
+        tenants = Client.objects.exclude(schema_name=get_public_schema_name())
+        if opts["schemas"]:
+            tenants = tenants.filter(schema_name__in=opts["schemas"])
+        for tenant in tenants.order_by("id"):
+            if not schema_exists(tenant.schema_name):  # archivado (tenants/archival.py)
+                continue
+            with schema_context(tenant.schema_name):
+                counts = [
+                    self._reindex(Person.objects.all(), person_text, opts["batch_size"]),
+                    self._reindex(
+                        Student.objects.select_related("person"), student_text, opts["batch_size"]
+                    ),
+                    self._reindex(
+                        Teacher.objects.select_related("person", "user"), teacher_text, opts["batch_size"]
+                    ),
+                ]
+            self.stdout.write(
+                f"{tenant.schema_name}: {counts[0]} personas, {counts[1]} estudiantes, {counts[2]} docentes"
+            )
+
+    def _reindex(self, queryset, build, batch_size):
+        changed = []
+        total = 0
+        for obj in queryset.order_by("pk").iterator(chunk_size=batch_size):
+            text = build(obj)
+            if obj.search_text != text:
+                obj.search_text = text
+                changed.append(obj)
+            if len(changed) >= batch_size:
+                total += self._flush(queryset.model, changed)
+        return total + self._flush(queryset.model, changed)
+
+    def _flush(self, model, objs):
+        count = len(objs)
+        if objs:
+            with transaction.atomic():
+                model.objects.bulk_update(objs, ["search_text"])
+            # bulk_update no emite post_save: los ETag de ?search= cambian aquí
+            tenant_cache.bump(model)
+            objs.clear()
+        return count
@@ -1,4 +1,5 @@
 # backend/academics/models.py
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.core.exceptions import ValidationError
 from django.db import models
@@ -149,6 +150,8 @@ class Person(models.Model):
     address = models.CharField(max_length=255, blank=True)
     birth_date = models.DateField(null=True, blank=True)
     is_active = models.BooleanField(default=True)
+    # texto normalizado para ?q= (academics/search.py)
+    search_text = models.TextField(blank=True, default="", editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -156,9 +159,10 @@ class Person(models.Model):
     class Meta:
         ordering = ["last_name", "first_name"]
         indexes = [
-            models.Index(fields=["last_name", "first_name"]),
+            models.Index(fields=["last_name", "first_name", "id"]),  # keyset
             models.Index(fields=["doc_number"]),
             models.Index(fields=["email"]),
+            GinIndex(fields=["search_text"], opclasses=["gin_trgm_ops"], name="person_search_trgm"),
         ]
 
     def __str__(self):
@@ -178,6 +182,8 @@ class Student(models.Model):
     admission_date = models.DateField(null=True, blank=True)
     notes = models.TextField(blank=True)
     is_active = models.BooleanField(default=True)
+    # código + nombre normalizados para ?q= (academics/search.py)
+    search_text = models.TextField(blank=True, default="", editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -186,6 +192,7 @@ class Student(models.Model):
         ordering = ["code"]
         indexes = [
             models.Index(fields=["code"]),
+            GinIndex(fields=["search_text"], opclasses=["gin_trgm_ops"], name="student_search_trgm"),
         ]
 
     def __str__(self):
@@ -232,6 +239,7 @@ class Enrollment(models.Model):
         indexes = [
             models.Index(fields=["student", "period"]),
             models.Index(fields=["grade", "section"]),
+            models.Index(fields=["created_at", "id"]),  # keyset
         ]
 
     def __str__(self):
@@ -265,6 +273,8 @@ class Teacher(models.Model):
     hire_date = models.DateField(null=True, blank=True)
     is_active = models.BooleanField(default=True)
     notes = models.TextField(blank=True)
+    # código + nombre + email normalizados para ?q= (academics/search.py)
+    search_text = models.TextField(blank=True, default="", editable=False)
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -274,6 +284,7 @@ class Teacher(models.Model):
         indexes = [
             models.Index(fields=["employee_code"]),
             models.Index(fields=["user"]),
+            GinIndex(fields=["search_text"], opclasses=["gin_trgm_ops"], name="teacher_search_trgm"),
         ]
 
     def clean(self):
@@ -345,6 +356,7 @@ class TeacherAssignment(models.Model):
             models.Index(fields=["teacher", "period"]),
             models.Index(fields=["grade", "section", "period"]),
             models.Index(fields=["subject", "period"]),
+            models.Index(fields=["period", "grade", "section", "subject", "id"]),  # keyset
         ]
 
     def clean(self):
@@ -598,6 +610,7 @@ class StudentGrade(models.Model):
             models.Index(fields=["enrollment", "subject"]),
             models.Index(fields=["grading_period", "subject"]),
             models.Index(fields=["teacher_assignment"]),
+            models.Index(fields=["recorded_at", "id"]),  # keyset
         ]
 
     def clean(self):
@@ -693,6 +706,72 @@ class GradeAverage(models.Model):
             f"({self.grading_period.name}): {self.average}"
         )
 
+
+class SubjectAverage(models.Model):
+    """
+    Promedio anual de una materia: media de sus GradeAverage (trimestres).
+    Se mantiene desde academics/averages.py cada vez que cambia un GradeAverage.
+    """
+    enrollment = models.ForeignKey(
+        "academics.Enrollment",
+        on_delete=models.CASCADE,
+        related_name="subject_averages"
+    )
+    subject = models.ForeignKey(
+        "academics.Subject",
+        on_delete=models.PROTECT,
+        related_name="subject_averages"
+    )
+
+    average = models.DecimalField(max_digits=5, decimal_places=2)
+    periods_count = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="Trimestres con promedio incluidos"
+    )
+
+    calculated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = [("enrollment", "subject")]
+        indexes = [
+            models.Index(fields=["subject", "average"]),
+            models.Index(fields=["average", "id"]),  # keyset
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.enrollment.student.code} - {self.subject.short_name or self.subject.name}: "
+            f"{self.average}"
+        )
+
+
+class EnrollmentAverage(models.Model):
+    """
+    Promedio general de la matrícula: media de sus SubjectAverage.
+    Se mantiene junto con SubjectAverage.
+    """
+    enrollment = models.OneToOneField(
+        "academics.Enrollment",
+        on_delete=models.CASCADE,
+        related_name="overall_average"
+    )
+
+    average = models.DecimalField(max_digits=5, decimal_places=2)
+    subjects_count = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="Materias con promedio incluidas"
+    )
+
+    calculated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["average", "id"]),  # keyset
+        ]
+
+    def __str__(self):
+        return f"{self.enrollment.student.code}: {self.average}"
+
 # FIN CALIFICACIONES
 
 #ASISNECIAS
@@ -716,6 +795,7 @@ class AttendanceSession(models.Model):
     class Meta:
         ordering = ["-date", "-start_time"]
         unique_together = [("grade", "section", "subject", "date", "start_time")]
+        indexes = [models.Index(fields=["date", "start_time", "id"])]  # keyset
 
     def clean(self):
         if self.end_time and self.end_time <= self.start_time:
@@ -759,6 +839,7 @@ class AttendanceRecord(models.Model):
     class Meta:
         ordering = ["-recorded_at"]
         unique_together = [("session", "student")]
+        indexes = [models.Index(fields=["recorded_at", "id"])]  # keyset
 
     def clean(self):
         from academics.models import Enrollment
@@ -861,6 +942,7 @@ class AttendanceScanLog(models.Model):
 
     class Meta:
         ordering = ["-scanned_at"]
+        indexes = [models.Index(fields=["scanned_at", "id"])]  # keyset
 
     def __str__(self):
         return f"{self.scanned_code} - {self.scan_status}"
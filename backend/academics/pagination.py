@@ -0,0 +1,179 @@
+"""
+Paginación keyset (cursor) para los listados grandes de academics.
+
+A diferencia de LIMIT/OFFSET, la página N no recorre las N-1 anteriores: el
+cursor guarda los valores de orden de la última fila y la siguiente página es
+
+    WHERE (col1, col2, id) > (v1, v2, v3) ORDER BY col1, col2, id LIMIT n
+
+que con un índice compuesto sobre esas columnas cuesta lo mismo en la página 1
+que en la 500. Cada vista declara su orden en `keyset_ordering`: columnas
+locales, todas en la misma dirección y terminando en una combinación única
+(normalmente "id"), y el modelo tiene el índice que lo respalda.
+
+Los catálogos chicos (niveles, períodos, grados, secciones, materias,
+dimensiones, trimestres, pesos) no usan esta clase: devuelven la lista
+completa y se cachean por colegio (core/cache.py).
+
+Respuesta: {"next": url|null, "previous": url|null, "results": [...]}.
+"""
+
+import base64
+import binascii
+import datetime
+import json
+
+from django.conf import settings
+from django.db import models
+from django.db.models.lookups import GreaterThan, LessThan
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _json_default(value):
+    # isoformat completo: DjangoJSONEncoder recorta a milisegundos y el cursor
+    # dejaría de ser exacto (saltaría o repetiría filas del mismo milisegundo)
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+
+class Row(models.Func):
+    """(a, b, c) de SQL: comparación de filas completa en un solo predicado."""
+
+    template = "(%(expressions)s)"
+    arg_joiner = ", "
+    output_field = models.Field()
+
+
+class KeysetPagination(BasePagination):
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    invalid_cursor_message = "Cursor inválido"
+
+    def __init__(self):
+        self.page_size = getattr(settings, "API_PAGE_SIZE", 50)
+        self.max_page_size = getattr(settings, "API_MAX_PAGE_SIZE", 500)
+
+    # --- orden ---
+    def get_ordering(self, view):
+        ordering = tuple(getattr(view, "keyset_ordering", None) or ("-id",))
+        directions = {field.startswith("-") for field in ordering}
+        assert len(directions) == 1, (
+            f"{view.__class__.__name__}.keyset_ordering mezcla direcciones: {ordering}"
+        )
+        return ordering
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    # --- cursor ---
+    def encode_cursor(self, values, reverse=False):
+        raw = json.dumps({"v": values, "r": int(reverse)}, default=_json_default)
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, request, width):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            raw = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+            data = json.loads(raw)
+            values, reverse = data["v"], bool(data.get("r"))
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != width:
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    # --- paginación ---
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(view)
+        self.fields = [field.lstrip("-") for field in self.ordering]
+        descending = self.ordering[0].startswith("-")
+        size = self.get_page_size(request)
+
+        values, reverse = self.decode_cursor(request, len(self.fields))
+        # Hacia atrás se recorre con el orden invertido y se da vuelta la página
+        backwards = descending != reverse
+        order_by = [f"-{f}" if backwards else f for f in self.fields]
+        queryset = queryset.order_by(*order_by)
+        if values is not None:
+            lookup = LessThan if backwards else GreaterThan
+            queryset = queryset.filter(
+                lookup(Row(*map(models.F, self.fields)), Row(*map(models.Value, values)))
+            )
+
+        rows = list(queryset[: size + 1])
+        has_more = len(rows) > size
+        rows = rows[:size]
+        if reverse:
+            rows.reverse()
+            self.has_previous, self.has_next = has_more, values is not None
+        else:
+            self.has_previous, self.has_next = values is not None, has_more
+        self.page = rows
+        return rows
+
+    def _key(self, obj):
+        return [getattr(obj, field) for field in self.fields]
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        cursor = self.encode_cursor(self._key(self.page[-1]))
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        cursor = self.encode_cursor(self._key(self.page[0]), reverse=True)
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Cursor de paginación (tomado de next/previous).",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": f"Filas por página (máx. {self.max_page_size}).",
+                "schema": {"type": "integer"},
+            },
+        ]
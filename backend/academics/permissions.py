@@ -1,5 +1,5 @@
 from rest_framework import permissions
-from academics.models import TeacherAssignment
+from accounts.permsets import user_access
 
 
 class IsTeacherOfSubject(permissions.BasePermission):
@@ -24,13 +24,12 @@ class IsTeacherOfSubject(permissions.BasePermission):
         if request.user.is_superuser or request.user.is_staff:
             return True
         
-        try:
-            teacher = request.user.teacher
-        except:
+        teacher_id = user_access(request.user).teacher_id
+        if teacher_id is None:
             return False
         
         if hasattr(obj, "teacher_assignment"):
-            return obj.teacher_assignment.teacher == teacher
+            return obj.teacher_assignment.teacher_id == teacher_id
         
         return False
 
@@ -65,12 +64,9 @@ class CanManageGrades(permissions.BasePermission):
             return True
         
         if request.user.role == "DOC":
-            try:
-                teacher = request.user.teacher
-                if hasattr(obj, "teacher_assignment"):
-                    return obj.teacher_assignment.teacher == teacher
-            except:
-                pass
+            teacher_id = user_access(request.user).teacher_id
+            if teacher_id is not None and getattr(obj, "teacher_assignment", None):
+                return obj.teacher_assignment.teacher_id == teacher_id
         
         return False
 
@@ -109,10 +105,6 @@ class CanViewOwnData(permissions.BasePermission):
             return request.method in permissions.SAFE_METHODS
         
         if request.user.role == "DOC":
-            try:
-                teacher = request.user.teacher
-                return True
-            except:
-                return False
+            return user_access(request.user).teacher_id is not None
         
         return False
\ No newline at end of file
@@ -0,0 +1,229 @@
+"""
+Recálculo masivo de GradeAverage cuando cambian los pesos.
+
+Editar un DimensionWeight o el default_weight de una GradingDimension deja
+viejos todos los promedios ya guardados; academics/averages.py solo recalcula
+las claves cuyas notas cambian. recompute_averages() rehace todos los
+promedios del colegio (o los de ciertas materias/grados) por lotes de
+matrículas:
+
+    1. una query trae las notas del lote, ya en centésimos (score * 100)
+    2. las notas se vuelcan a una matriz (clave x dimensión activa) y se
+       multiplican por la matriz de pesos de cada (materia, grado) en un solo
+       paso con NumPy
+    3. solo se escriben los promedios que cambiaron, con un upsert
+       (INSERT ... ON CONFLICT) por lote, y se borran los de claves que
+       quedaron incompletas; los promedios anuales de lo que cambió se
+       rehacen al confirmar cada lote (averages.refresh_annual)
+
+La regla es la de averages.recalculate() y la aritmética es entera: el
+promedio en centésimos es round_half_up(sum(nota * peso) / sum(peso)), igual
+que el Decimal.quantize(ROUND_HALF_UP) del recálculo incremental.
+
+Sin NumPy instalado se usa un bucle en Python con el mismo resultado.
+
+Lo usan el comando recompute_averages --schema y POST
+/api/grade-averages/recompute (dentro del colegio): los modelos son solo de
+los esquemas de colegios, el /admin de public no los ve.
+"""
+
+import itertools
+import time
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F, IntegerField
+from django.db.models.functions import Cast
+
+from core.cache import tenant_cache
+
+from .averages import load_weights, mark_annual_dirty, weights_for
+from .models import Enrollment, GradeAverage, StudentGrade
+
+try:
+    import numpy
+except ImportError:  # opcional: sin NumPy se calcula con el bucle en Python
+    numpy = None
+
+BATCH_ENROLLMENTS = 500
+WRITE_BATCH = 5000
+
+
+def _cents(value):
+    return int(value * 100)
+
+
+def _average_cents(numerator, denominator):
+    # round_half_up(numerator / denominator) para valores positivos, sin floats
+    return (2 * numerator + denominator) // (2 * denominator)
+
+
+def _compute_python(rows, dimension_ids, pair_weights):
+    scores, pair_of = {}, {}
+    for enrollment_id, subject_id, grading_period_id, grade_id, dimension_id, score in rows:
+        key = (enrollment_id, subject_id, grading_period_id)
+        scores.setdefault(key, {})[dimension_id] = score
+        pair_of[key] = (subject_id, grade_id)
+
+    result = {}
+    for key, by_dimension in scores.items():
+        if not all(dimension_id in by_dimension for dimension_id in dimension_ids):
+            continue
+        weights = pair_weights[pair_of[key]]
+        denominator = sum(weights)
+        if denominator:
+            numerator = sum(
+                by_dimension[dimension_id] * weight
+                for dimension_id, weight in zip(dimension_ids, weights)
+            )
+            result[key] = _average_cents(numerator, denominator)
+    return result
+
+
+def _group(np, columns):
+    """(filas distintas, índice de cada fila en ellas); np.unique(axis=0) es varias veces más lento."""
+    order = np.lexsort(columns.T[::-1])
+    ordered = columns[order]
+    first = np.ones(len(ordered), dtype=bool)
+    first[1:] = (ordered[1:] != ordered[:-1]).any(axis=1)
+    index = np.empty(len(ordered), dtype=np.int64)
+    index[order] = np.cumsum(first) - 1
+    return ordered[first], index
+
+
+def _compute_numpy(rows, dimension_ids, pair_weights):
+    np = numpy
+    columns = np.fromiter(
+        itertools.chain.from_iterable(rows), dtype=np.int64, count=len(rows) * 6
+    ).reshape(-1, 6)
+    keys, key_index = _group(np, columns[:, :3])
+    pairs, pair_index = _group(np, columns[:, [1, 3]])
+
+    # Columna de cada nota en la matriz; las de dimensiones inactivas se descartan
+    active = np.array(dimension_ids, dtype=np.int64)
+    order = np.argsort(active)
+    position = np.searchsorted(active[order], columns[:, 4]).clip(max=len(active) - 1)
+    valid = active[order][position] == columns[:, 4]
+    column = order[position]
+
+    scores = np.zeros((len(keys), len(active)), dtype=np.int64)
+    present = np.zeros((len(keys), len(active)), dtype=bool)
+    scores[key_index[valid], column[valid]] = columns[valid, 5]
+    present[key_index[valid], column[valid]] = True
+
+    # Matriz de pesos por (materia, grado), expandida a una fila por clave
+    weight_matrix = np.array(
+        [pair_weights[(int(s), int(g))] for s, g in pairs], dtype=np.int64
+    ).reshape(len(pairs), len(active))
+    key_pair = np.empty(len(keys), dtype=np.int64)
+    key_pair[key_index] = pair_index
+    weights = weight_matrix[key_pair]
+
+    numerator = (scores * weights).sum(axis=1)
+    denominator = weights.sum(axis=1)
+    complete = present.all(axis=1) & (denominator > 0)
+    averages = _average_cents(numerator[complete], denominator[complete])
+    return dict(zip(map(tuple, keys[complete].tolist()), averages.tolist()))
+
+
+def recompute_averages(
+    subject_ids=None, grade_ids=None, batch=BATCH_ENROLLMENTS, annual=False, progress=None
+):
+    """
+    Recalcula los GradeAverage de las matrículas de `grade_ids` en las
+    materias `subject_ids` (None: todas). Devuelve un dict con filas de notas
+    leídas, promedios escritos y borrados, segundos y motor usado.
+
+    Con annual=True rehace también los promedios anuales de todo lo
+    recorrido, aunque el trimestre no haya cambiado (carga inicial).
+
+    `progress(done, total, rows, written, deleted, elapsed)` se llama después
+    de cada lote de matrículas.
+    """
+    started = time.perf_counter()
+    defaults, custom = load_weights()
+    dimension_ids = list(defaults)
+    pair_weights = _PairWeights(dimension_ids, defaults, custom)
+    compute = _compute_numpy if numpy is not None else _compute_python
+
+    enrollments = Enrollment.objects.order_by("id")
+    if grade_ids is not None:
+        enrollments = enrollments.filter(grade_id__in=grade_ids)
+    enrollment_ids = list(enrollments.values_list("id", flat=True))
+
+    stats = {"rows": 0, "written": 0, "deleted": 0}
+    for start in range(0, len(enrollment_ids), batch):
+        chunk = enrollment_ids[start:start + batch]
+        scope = {"enrollment_id__in": chunk}
+        if subject_ids is not None:
+            scope["subject_id__in"] = subject_ids
+
+        rows = list(
+            StudentGrade.objects.filter(**scope)
+            .order_by()
+            .values_list(
+                "enrollment_id", "subject_id", "grading_period_id", "enrollment__grade_id",
+                "dimension_id", Cast(F("score") * 100, IntegerField()),
+            )
+        )
+        computed = compute(rows, dimension_ids, pair_weights) if rows and dimension_ids else {}
+        stored = {
+            (e, s, gp): (pk, _cents(average))
+            for pk, e, s, gp, average in GradeAverage.objects.filter(**scope)
+            .order_by()
+            .values_list("id", "enrollment_id", "subject_id", "grading_period_id", "average")
+        }
+
+        changed = [
+            GradeAverage(
+                enrollment_id=key[0], subject_id=key[1], grading_period_id=key[2],
+                average=Decimal(cents).scaleb(-2),
+            )
+            for key, cents in computed.items()
+            if stored.get(key, (None, None))[1] != cents
+        ]
+        stale = {key: pk for key, (pk, _) in stored.items() if key not in computed}
+        with transaction.atomic():
+            GradeAverage.objects.bulk_create(
+                changed,
+                batch_size=WRITE_BATCH,
+                update_conflicts=True,
+                unique_fields=["enrollment", "subject", "grading_period"],
+                update_fields=["average", "calculated_at"],
+            )
+            if stale:
+                GradeAverage.objects.filter(pk__in=stale.values()).delete()
+            # Los pares de promedios borrados también: su anual ya no vale
+            touched = list(stale)
+            touched += computed if annual else [
+                (a.enrollment_id, a.subject_id, a.grading_period_id) for a in changed
+            ]
+            mark_annual_dirty(*{(e, s) for e, s, _ in touched})
+
+        stats["rows"] += len(rows)
+        stats["written"] += len(changed)
+        stats["deleted"] += len(stale)
+        if progress:
+            progress(
+                done=min(start + batch, len(enrollment_ids)), total=len(enrollment_ids),
+                elapsed=time.perf_counter() - started, **stats,
+            )
+
+    # bulk_create no emite post_save
+    tenant_cache.bump(GradeAverage)
+    stats["seconds"] = time.perf_counter() - started
+    stats["engine"] = "numpy" if compute is _compute_numpy else "python"
+    return stats
+
+
+class _PairWeights(dict):
+    """{(subject_id, grade_id): [peso en centésimos por dimensión activa]}, a demanda."""
+
+    def __init__(self, dimension_ids, defaults, custom):
+        super().__init__()
+        self.dimension_ids, self.defaults, self.custom = dimension_ids, defaults, custom
+
+    def __missing__(self, pair):
+        weights = weights_for(pair, self.defaults, self.custom)
+        self[pair] = [_cents(weights[dimension_id]) for dimension_id in self.dimension_ids]
+        return self[pair]
@@ -0,0 +1,101 @@
+"""
+Búsqueda ?q= de personas, estudiantes, docentes y matrículas.
+
+Cada modelo buscable guarda en `search_text` su texto normalizado (minúsculas,
+sin tildes, espacios colapsados) con un índice GIN pg_trgm:
+
+    Person   nombre, apellido, documento, email
+    Student  código + nombre de la persona
+    Teacher  código de empleado + nombre de la persona + email del usuario
+
+academics/signals.py lo mantiene al guardar y propaga los cambios de Person a
+su Student/Teacher; `manage.py reindex_search` lo reconstruye (bulk_create y
+update() no pasan por save()).
+
+Modos:
+    ?q=texto               subcadena sobre search_text (LIKE '%texto%' con el
+                           índice trigram; también ignora tildes)
+    ?q=texto&ranked=true   además tolera errores de tipeo (word similarity,
+                           operador %>) y ordena por parecido; devuelve los
+                           mejores `page_size` resultados sin paginar
+"""
+
+import unicodedata
+
+from django.conf import settings
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Q
+
+TRUE_VALUES = ("1", "true", "yes")
+
+
+def fold(*parts):
+    """Texto comparable: sin tildes, minúsculas y un espacio entre palabras."""
+    text = " ".join(str(p) for p in parts if p)
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(text.lower().split())
+
+
+def person_text(person):
+    return fold(person.first_name, person.last_name, person.doc_number, person.email)
+
+
+def student_text(student):
+    person = student.person
+    return fold(student.code, person.first_name, person.last_name)
+
+
+def teacher_text(teacher):
+    person = teacher.person
+    email = teacher.user.email if teacher.user_id else ""
+    return fold(teacher.employee_code, person.first_name, person.last_name, email)
+
+
+def search(queryset, q, field="search_text", ranked=False, limit=None):
+    term = fold(q)
+    if not term:
+        return queryset
+    if not ranked:
+        return queryset.filter(**{f"{field}__contains": term})
+    return (
+        queryset.annotate(search_rank=TrigramWordSimilarity(term, field))
+        .filter(Q(**{f"{field}__contains": term}) | Q(**{f"{field}__trigram_word_similar": term}))
+        .order_by("-search_rank", "pk")[: limit or settings.API_PAGE_SIZE]
+    )
+
+
+def ensure_extensions(using=DEFAULT_DB_ALIAS, **kwargs):
+    """pre_migrate: los índices gin_trgm_ops necesitan pg_trgm creado antes."""
+    with connections[using].cursor() as cursor:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA public")
+
+
+class SearchMixin:
+    """
+    ?q= y ?ranked= para vistas de listado. El modo ranked ya viene ordenado y
+    recortado, así que no pasa por la paginación keyset.
+    """
+
+    search_field = "search_text"
+
+    def search_ranked(self):
+        params = self.request.query_params
+        return bool(params.get("q")) and params.get("ranked", "").lower() in TRUE_VALUES
+
+    def filter_queryset(self, queryset):
+        # Después de los filtros de get_queryset(): el modo ranked recorta el queryset
+        qs = super().filter_queryset(queryset)
+        q = self.request.query_params.get("q")
+        if q:
+            limit = None
+            if self.search_ranked() and self.paginator is not None:
+                limit = self.paginator.get_page_size(self.request)
+            qs = search(qs, q, self.search_field, ranked=self.search_ranked(), limit=limit)
+        return qs
+
+    def paginate_queryset(self, queryset):
+        if self.search_ranked():
+            return None
+        return super().paginate_queryset(queryset)
@@ -15,11 +15,14 @@ from .models import (
     GradingPeriod,
     DimensionWeight,
     StudentGrade,
-    GradeAverage
+    GradeAverage,
+    SubjectAverage,
+    EnrollmentAverage,
 )
+from .fieldsets import SparseFieldsMixin
 
 
-class EducationLevelSerializer(serializers.ModelSerializer):
+class EducationLevelSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = EducationLevel
         fields = ["id", "name", "short_name", "is_active", "created_at", "updated_at"]
@@ -29,7 +32,7 @@ class EducationLevelSerializer(serializers.ModelSerializer):
 # ...
 
 
-class AcademicPeriodSerializer(serializers.ModelSerializer):
+class AcademicPeriodSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = AcademicPeriod
         fields = [
@@ -56,7 +59,7 @@ class AcademicPeriodSerializer(serializers.ModelSerializer):
         return attrs
 
 
-class GradeSerializer(serializers.ModelSerializer):
+class GradeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     level_name = serializers.CharField(source="level.name", read_only=True)
 
     class Meta:
@@ -79,7 +82,7 @@ class GradeSerializer(serializers.ModelSerializer):
         return value
 
 
-class SectionSerializer(serializers.ModelSerializer):
+class SectionSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     grade_name = serializers.CharField(source="grade.name", read_only=True)
     level_id = serializers.IntegerField(source="grade.level_id", read_only=True)
     level_name = serializers.CharField(source="grade.level.name", read_only=True)
@@ -106,7 +109,7 @@ class SectionSerializer(serializers.ModelSerializer):
         return value
 
 
-class SubjectSerializer(serializers.ModelSerializer):
+class SubjectSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     level_name = serializers.CharField(source="level.name", read_only=True)
 
     class Meta:
@@ -132,7 +135,7 @@ class SubjectSerializer(serializers.ModelSerializer):
 
 
 # Actores
-class PersonSerializer(serializers.ModelSerializer):
+class PersonSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     full_name = serializers.SerializerMethodField()
 
     class Meta:
@@ -153,6 +156,7 @@ class PersonSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["id", "created_at", "updated_at"]
+        sparse_dependencies = {"full_name": ["first_name", "last_name"]}
 
     def get_full_name(self, obj):
         return f"{obj.first_name} {obj.last_name}".strip()
@@ -165,7 +169,7 @@ class PersonSerializer(serializers.ModelSerializer):
         return attrs
 
 
-class StudentSerializer(serializers.ModelSerializer):
+class StudentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     # Datos derivados para mostrar en listas
     person_name = serializers.CharField(source="person.__str__", read_only=True)
 
@@ -193,7 +197,7 @@ class StudentSerializer(serializers.ModelSerializer):
         return value
 
 
-class EnrollmentSerializer(serializers.ModelSerializer):
+class EnrollmentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     student_code = serializers.CharField(source="student.code", read_only=True)
     student_name = serializers.CharField(
         source="student.person.__str__", read_only=True
@@ -260,7 +264,7 @@ class EnrollmentSerializer(serializers.ModelSerializer):
 # DOCENTES Y ASIGNACIONES
 # ---------------------------------------------------------------
 
-class TeacherSerializer(serializers.ModelSerializer):
+class TeacherSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     person_name = serializers.CharField(source="person.__str__", read_only=True)
     user_email = serializers.EmailField(source="user.email", read_only=True)
     user_role = serializers.CharField(source="user.role", read_only=True)
@@ -305,7 +309,7 @@ class TeacherSerializer(serializers.ModelSerializer):
         return value
 
 
-class TeacherAssignmentSerializer(serializers.ModelSerializer):
+class TeacherAssignmentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     teacher_name = serializers.CharField(source="teacher.person.__str__", read_only=True)
     teacher_code = serializers.CharField(source="teacher.employee_code", read_only=True)
     subject_name = serializers.CharField(source="subject.name", read_only=True)
@@ -419,7 +423,7 @@ class TeacherAssignmentSerializer(serializers.ModelSerializer):
 # SISTEMA DE CALIFICACIONES
 # ---------------------------------------------------------------
 
-class GradingDimensionSerializer(serializers.ModelSerializer):
+class GradingDimensionSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = GradingDimension
         fields = [
@@ -439,7 +443,7 @@ class GradingDimensionSerializer(serializers.ModelSerializer):
         return value
 
 
-class GradingPeriodSerializer(serializers.ModelSerializer):
+class GradingPeriodSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     academic_period_name = serializers.CharField(
         source="academic_period.name", read_only=True
     )
@@ -484,7 +488,7 @@ class GradingPeriodSerializer(serializers.ModelSerializer):
         return attrs
 
 
-class DimensionWeightSerializer(serializers.ModelSerializer):
+class DimensionWeightSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     subject_name = serializers.CharField(source="subject.name", read_only=True)
     grade_name = serializers.CharField(source="grade.name", read_only=True)
     dimension_name = serializers.CharField(source="dimension.get_name_display", read_only=True)
@@ -532,7 +536,7 @@ class DimensionWeightSerializer(serializers.ModelSerializer):
         return attrs
 
 
-class StudentGradeSerializer(serializers.ModelSerializer):
+class StudentGradeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     student_code = serializers.CharField(source="enrollment.student.code", read_only=True)
     student_name = serializers.CharField(
         source="enrollment.student.person.__str__", read_only=True
@@ -619,7 +623,7 @@ class StudentGradeSerializer(serializers.ModelSerializer):
         return attrs
 
 
-class GradeAverageSerializer(serializers.ModelSerializer):
+class GradeAverageSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     student_code = serializers.CharField(source="enrollment.student.code", read_only=True)
     student_name = serializers.CharField(
         source="enrollment.student.person.__str__", read_only=True
@@ -645,6 +649,49 @@ class GradeAverageSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["id", "average", "calculated_at"]
 
+
+class SubjectAverageSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    student_code = serializers.CharField(source="enrollment.student.code", read_only=True)
+    student_name = serializers.CharField(
+        source="enrollment.student.person.__str__", read_only=True
+    )
+    subject_name = serializers.CharField(source="subject.name", read_only=True)
+
+    class Meta:
+        model = SubjectAverage
+        fields = [
+            "id",
+            "enrollment",
+            "student_code",
+            "student_name",
+            "subject",
+            "subject_name",
+            "average",
+            "periods_count",
+            "calculated_at",
+        ]
+        read_only_fields = fields
+
+
+class EnrollmentAverageSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    student_code = serializers.CharField(source="enrollment.student.code", read_only=True)
+    student_name = serializers.CharField(
+        source="enrollment.student.person.__str__", read_only=True
+    )
+
+    class Meta:
+        model = EnrollmentAverage
+        fields = [
+            "id",
+            "enrollment",
+            "student_code",
+            "student_name",
+            "average",
+            "subjects_count",
+            "calculated_at",
+        ]
+        read_only_fields = fields
+
 # FIN CALIFICACIONES
 
  
@@ -659,7 +706,7 @@ from academics.models import (
 )
 
 
-class AttendanceSessionSerializer(serializers.ModelSerializer):
+class AttendanceSessionSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     total_students = serializers.ReadOnlyField()
     subject_name = serializers.CharField(source="subject.name", read_only=True)
     grade_name = serializers.CharField(source="grade.name", read_only=True)
@@ -678,7 +725,7 @@ class AttendanceSessionSerializer(serializers.ModelSerializer):
         read_only_fields = ["created_by", "created_at", "updated_at"]
 
 
-class AttendanceRecordSerializer(serializers.ModelSerializer):
+class AttendanceRecordSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     student_code = serializers.CharField(source="student.code", read_only=True)
     student_name = serializers.CharField(source="student.person.__str__", read_only=True)
     session_date = serializers.DateField(source="session.date", read_only=True)
@@ -693,7 +740,7 @@ class AttendanceRecordSerializer(serializers.ModelSerializer):
         read_only_fields = ["recorded_by", "recorded_at"]
 
 
-class StudentQRCodeSerializer(serializers.ModelSerializer):
+class StudentQRCodeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     student_name = serializers.CharField(source="student.person.__str__", read_only=True)
     qr_image_url = serializers.SerializerMethodField()
 
@@ -705,6 +752,7 @@ class StudentQRCodeSerializer(serializers.ModelSerializer):
             "scan_count", "last_scanned", "created_at",
         ]
         read_only_fields = ["code", "scan_count", "last_scanned", "created_at"]
+        sparse_dependencies = {"qr_image_url": ["qr_image"]}
 
     def get_qr_image_url(self, obj):
         if obj.qr_image and hasattr(obj.qr_image, "url"):
@@ -713,7 +761,7 @@ class StudentQRCodeSerializer(serializers.ModelSerializer):
         return None
 
 
-class AttendanceScanLogSerializer(serializers.ModelSerializer):
+class AttendanceScanLogSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     student = serializers.CharField(source="student_qr.student.code", read_only=True)
     session_date = serializers.DateField(source="session.date", read_only=True)
 
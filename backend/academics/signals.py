@@ -0,0 +1,80 @@
+from django.conf import settings
+from django.db import connection
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django_tenants.utils import get_public_schema_name, schema_context, schema_exists
+
+from core.cache import tenant_cache
+
+from . import averages
+from .models import GradeAverage, Person, Student, StudentGrade, Teacher
+from .search import person_text, student_text, teacher_text
+
+
+@receiver(pre_save, sender=Person)
+def person_search_text(sender, instance, **kwargs):
+    instance.search_text = person_text(instance)
+
+
+@receiver(pre_save, sender=Student)
+def student_search_text(sender, instance, **kwargs):
+    instance.search_text = student_text(instance)
+
+
+@receiver(pre_save, sender=Teacher)
+def teacher_search_text(sender, instance, **kwargs):
+    instance.search_text = teacher_text(instance)
+
+
+@receiver(post_save, sender=Person)
+def propagate_person_search_text(sender, instance, created, raw=False, **kwargs):
+    # El nombre también está en el texto del Student/Teacher de esta persona
+    if created or raw:
+        return
+    for student in Student.objects.filter(person=instance):
+        student.person = instance
+        Student.objects.filter(pk=student.pk).update(search_text=student_text(student))
+    for teacher in Teacher.objects.filter(person=instance).select_related("user"):
+        teacher.person = instance
+        Teacher.objects.filter(pk=teacher.pk).update(search_text=teacher_text(teacher))
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def propagate_user_search_text(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    # El email del usuario está en el texto de su Teacher, que vive en el esquema del colegio
+    if created or raw or (update_fields is not None and "email" not in update_fields):
+        return  # p. ej. el last_login de cada login
+    public = get_public_schema_name()
+    schemas = {connection.schema_name}
+    if instance.tenant_id:
+        schemas.add(instance.tenant.schema_name)
+    for schema in sorted(schemas - {public}):
+        if not schema_exists(schema):  # archivado
+            continue
+        with schema_context(schema):
+            changed = 0
+            for teacher in Teacher.objects.filter(user=instance).select_related("person"):
+                teacher.user = instance
+                changed += Teacher.objects.filter(pk=teacher.pk).exclude(
+                    search_text=teacher_text(teacher)
+                ).update(search_text=teacher_text(teacher))
+            if changed:  # update() no emite post_save: las vistas cacheadas no se enteran
+                tenant_cache.bump(Teacher)
+
+
+@receiver(post_save, sender=StudentGrade)
+@receiver(post_delete, sender=StudentGrade)
+def grade_average_dirty(sender, instance, raw=False, **kwargs):
+    if raw:  # loaddata: los promedios vienen en el fixture
+        return
+    averages.mark_dirty(
+        (instance.enrollment_id, instance.subject_id, instance.grading_period_id)
+    )
+
+
+@receiver(post_save, sender=GradeAverage)
+@receiver(post_delete, sender=GradeAverage)
+def annual_average_dirty(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    averages.mark_annual_dirty((instance.enrollment_id, instance.subject_id))
@@ -0,0 +1,61 @@
+from django.contrib.auth import get_user_model
+from django_tenants.test.cases import TenantTestCase
+
+from academics.gradesheet import SHEET_QUERIES, build_grade_sheet
+from academics.management.commands.bench_grade_sheet import Command as BenchGradeSheet
+from academics.management.commands.bench_grade_sheet import legacy_grade_sheet
+from academics.models import Person, Teacher
+
+
+class GradeSheetQueriesTests(TenantTestCase):
+    """La planilla se arma con SHEET_QUERIES queries, sin importar el tamaño de la sección."""
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.legal_name = "Colegio de prueba"
+        tenant.code = "test"
+        tenant.official_email = "test@example.com"
+
+    def _sheet(self, size):
+        params, _, _ = BenchGradeSheet()._seed(size)
+        with self.assertNumQueries(SHEET_QUERIES):
+            sheet = build_grade_sheet(*params)
+        return params, sheet
+
+    def test_constant_queries(self):
+        for size in (1, 25):
+            with self.subTest(size=size):
+                _, sheet = self._sheet(size)
+                self.assertEqual(len(sheet["students"]), size)
+
+    def test_same_sheet_as_per_student_queries(self):
+        params, sheet = self._sheet(10)
+        self.assertEqual(sheet, legacy_grade_sheet(*params))
+
+
+class TeacherSearchTextTests(TenantTestCase):
+    """El email del User forma parte del search_text de su Teacher."""
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.legal_name = "Colegio de prueba"
+        tenant.code = "test"
+        tenant.official_email = "test@example.com"
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("antes@example.com")
+        person = Person.objects.create(first_name="Ana", last_name="Pérez")
+        self.teacher = Teacher.objects.create(person=person, user=self.user, employee_code="D-1")
+
+    def test_email_change_refreshes_teacher(self):
+        self.user.email = "despues@example.com"
+        self.user.save()
+        self.teacher.refresh_from_db()
+        self.assertIn("despues@example.com", self.teacher.search_text)
+        self.assertNotIn("antes@example.com", self.teacher.search_text)
+
+    def test_other_updates_skip_teacher(self):
+        Teacher.objects.filter(pk=self.teacher.pk).update(search_text="")
+        self.user.save(update_fields=["last_login"])
+        self.teacher.refresh_from_db()
+        self.assertEqual(self.teacher.search_text, "")
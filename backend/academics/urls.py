@@ -1,6 +1,7 @@
 # backend/academics/urls.py
 from django.urls import path
 from .views import (
+    CatalogSnapshotView,
     EducationLevelListCreateView,
     EducationLevelDetailView,
     AcademicPeriodListCreateView,
@@ -21,6 +22,8 @@ from .views import (
 
 
 urlpatterns = [
+    # Todos los catálogos en una respuesta (con versión para 304)
+    path("catalog/snapshot", CatalogSnapshotView.as_view(), name="catalog_snapshot"),
     # Education Levels
     path("levels", EducationLevelListCreateView.as_view(), name="level_list_create"),
     path("levels/<int:pk>", EducationLevelDetailView.as_view(), name="level_detail"),
@@ -75,6 +78,9 @@ from .views import (
     StudentGradeDetailView,
     GradeAverageListView,
     GradeAverageDetailView,
+    GradeAverageRecomputeView,
+    SubjectAverageListView,
+    EnrollmentAverageListView,
     GradeSheetView,
 )
 
@@ -98,6 +104,9 @@ urlpatterns += [
     # Promedios
     path("grade-averages", GradeAverageListView.as_view(), name="grade_average_list"),
     path("grade-averages/<int:pk>", GradeAverageDetailView.as_view(), name="grade_average_detail"),
+    path("grade-averages/recompute", GradeAverageRecomputeView.as_view(), name="grade_average_recompute"),
+    path("subject-averages", SubjectAverageListView.as_view(), name="subject_average_list"),
+    path("enrollment-averages", EnrollmentAverageListView.as_view(), name="enrollment_average_list"),
     
     # Planilla de calificaciones
     path("grade-sheet", GradeSheetView.as_view(), name="grade_sheet"),
@@ -1,6 +1,5 @@
 # backend/academics/views.py
 from rest_framework import generics, permissions
-from django.db import models
 from .models import (
     EducationLevel,
     AcademicPeriod,
@@ -27,6 +26,18 @@ from .permissions import (
     IsTenantAdmin,
     CanViewOwnData,
 )
+from core.cache import cache_tenant_view
+from core.conditional import ConditionalGetMixin, not_modified, set_validators
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from rest_framework.views import APIView
+from .catalog import snapshot_content
+from .gradesheet import build_grade_sheet, upsert_grades
+from .pagination import KeysetPagination
+from .recompute import recompute_averages
+from .fieldsets import SparseQuerysetMixin
+from .search import SearchMixin
+from tenants.quotas import enforce_quota, current_tenant
 
 
 class IsStaffUser(permissions.BasePermission):
@@ -40,6 +51,26 @@ class IsStaffUser(permissions.BasePermission):
         return bool(request.user.is_staff)  # escritura solo staff
 
 
+class CatalogSnapshotView(APIView):
+    """
+    GET /api/catalog/snapshot
+    Todos los catálogos chicos en una respuesta (academics/catalog.py).
+    """
+
+    permission_classes = [IsStaffUser]
+
+    def get(self, request):
+        version, content = snapshot_content()
+        etag = f'"{version}"'
+        if request.query_params.get("version") == version:
+            return HttpResponseNotModified(headers={"ETag": etag})
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
+        response = HttpResponse(content, content_type="application/json")
+        return set_validators(response, etag)
+
+
 class EducationLevelListCreateView(generics.ListCreateAPIView):
     """
     GET  /api/levels
@@ -50,8 +81,12 @@ class EducationLevelListCreateView(generics.ListCreateAPIView):
     serializer_class = EducationLevelSerializer
     permission_classes = [IsStaffUser]
 
+    @cache_tenant_view(models=[EducationLevel])
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
 
-class EducationLevelDetailView(generics.RetrieveUpdateDestroyAPIView):
+class EducationLevelDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     GET    /api/levels/<id>
     PATCH  /api/levels/<id>
@@ -68,8 +103,12 @@ class AcademicPeriodListCreateView(generics.ListCreateAPIView):
     serializer_class = AcademicPeriodSerializer
     permission_classes = [IsStaffUser]
 
+    @cache_tenant_view(models=[AcademicPeriod])
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
 
-class AcademicPeriodDetailView(generics.RetrieveUpdateDestroyAPIView):
+
+class AcademicPeriodDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = AcademicPeriod.objects.all()
     serializer_class = AcademicPeriodSerializer
     permission_classes = [IsStaffUser]
@@ -80,6 +119,10 @@ class GradeListCreateView(generics.ListCreateAPIView):
     serializer_class = GradeSerializer
     permission_classes = [IsStaffUser]
 
+    @cache_tenant_view(models=[Grade, EducationLevel])
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
     def get_queryset(self):
         qs = super().get_queryset()
         level_id = self.request.query_params.get("level")
@@ -88,10 +131,11 @@ class GradeListCreateView(generics.ListCreateAPIView):
         return qs
 
 
-class GradeDetailView(generics.RetrieveUpdateDestroyAPIView):
+class GradeDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Grade.objects.select_related("level").all()
     serializer_class = GradeSerializer
     permission_classes = [IsStaffUser]
+    etag_models = (EducationLevel,)
 
 
 class SectionListCreateView(generics.ListCreateAPIView):
@@ -99,6 +143,10 @@ class SectionListCreateView(generics.ListCreateAPIView):
     serializer_class = SectionSerializer
     permission_classes = [IsStaffUser]
 
+    @cache_tenant_view(models=[Section, Grade, EducationLevel])
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
     # Filtros opcionales: ?grade=<id>  y/o  ?level=<id>
     def get_queryset(self):
         qs = super().get_queryset()
@@ -111,10 +159,11 @@ class SectionListCreateView(generics.ListCreateAPIView):
         return qs
 
 
-class SectionDetailView(generics.RetrieveUpdateDestroyAPIView):
+class SectionDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Section.objects.select_related("grade", "grade__level").all()
     serializer_class = SectionSerializer
     permission_classes = [IsStaffUser]
+    etag_models = (Grade, EducationLevel)
 
 
 class SubjectListCreateView(generics.ListCreateAPIView):
@@ -122,6 +171,10 @@ class SubjectListCreateView(generics.ListCreateAPIView):
     serializer_class = SubjectSerializer
     permission_classes = [IsStaffUser]
 
+    @cache_tenant_view(models=[Subject, EducationLevel])
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
     # Filtros: ?level=<id>  y ?q=<texto>
     def get_queryset(self):
         qs = super().get_queryset()
@@ -134,71 +187,71 @@ class SubjectListCreateView(generics.ListCreateAPIView):
         return qs
 
 
-class SubjectDetailView(generics.RetrieveUpdateDestroyAPIView):
+class SubjectDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Subject.objects.select_related("level").all()
     serializer_class = SubjectSerializer
     permission_classes = [IsStaffUser]
+    etag_models = (EducationLevel,)
 
 
 # --- Persons ---
-class PersonListCreateView(generics.ListCreateAPIView):
+class PersonListCreateView(
+    ConditionalGetMixin, SearchMixin, SparseQuerysetMixin, generics.ListCreateAPIView
+):
     queryset = Person.objects.all()
     serializer_class = PersonSerializer
     permission_classes = [IsStaffUser]
+    pagination_class = KeysetPagination
+    keyset_ordering = ("last_name", "first_name", "id")
 
-    # Filtros básicos: ?q=  (busca en nombre/apellido/doc/email)
-    def get_queryset(self):
-        qs = super().get_queryset()
-        q = self.request.query_params.get("q")
-        if q:
-            q = q.strip()
-            qs = qs.filter(
-                models.Q(first_name__icontains=q)
-                | models.Q(last_name__icontains=q)
-                | models.Q(doc_number__icontains=q)
-                | models.Q(email__icontains=q)
-            )
-        return qs
+    # ?q= busca en nombre/apellido/doc/email (SearchMixin, ?ranked=true ordena por parecido)
 
 
-class PersonDetailView(generics.RetrieveUpdateDestroyAPIView):
+class PersonDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Person.objects.all()
     serializer_class = PersonSerializer
     permission_classes = [IsStaffUser]
 
 
 # --- Students ---
-class StudentListCreateView(generics.ListCreateAPIView):
+class StudentListCreateView(
+    ConditionalGetMixin, SearchMixin, SparseQuerysetMixin, generics.ListCreateAPIView
+):
     queryset = Student.objects.select_related("person").all()
     serializer_class = StudentSerializer
     permission_classes = [IsStaffUser]
+    etag_models = (Person,)
+    pagination_class = KeysetPagination
+    keyset_ordering = ("code",)
 
-    # Filtro: ?q= (por code o por nombre de persona)
-    def get_queryset(self):
-        qs = super().get_queryset()
-        q = self.request.query_params.get("q")
-        if q:
-            q = q.strip()
-            qs = qs.filter(
-                models.Q(code__icontains=q)
-                | models.Q(person__first_name__icontains=q)
-                | models.Q(person__last_name__icontains=q)
-            )
-        return qs
+    # ?q= por code o por nombre de persona (SearchMixin)
+
+    def perform_create(self, serializer):
+        # Cuota del plan: lectura O(1) del contador, bloqueado hasta el alta
+        with transaction.atomic():
+            enforce_quota(current_tenant(), "students")
+            serializer.save()
 
 
-class StudentDetailView(generics.RetrieveUpdateDestroyAPIView):
+class StudentDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Student.objects.select_related("person").all()
     serializer_class = StudentSerializer
     permission_classes = [IsStaffUser]
+    etag_models = (Person,)
 
 
-class EnrollmentListCreateView(generics.ListCreateAPIView):
+class EnrollmentListCreateView(
+    ConditionalGetMixin, SearchMixin, SparseQuerysetMixin, generics.ListCreateAPIView
+):
     queryset = Enrollment.objects.select_related(
         "student", "student__person", "period", "grade", "section"
     ).all()
     serializer_class = EnrollmentSerializer
     permission_classes = [IsStaffUser]
+    etag_models = (Student, Person, AcademicPeriod, Grade, Section)
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-created_at", "-id")
+    search_field = "student__search_text"
 
     # Filtros: ?student=<id>  ?period=<id>  ?grade=<id>  ?section=<id>  ?status=<str>  ?q=<texto>
     def get_queryset(self):
@@ -214,23 +267,16 @@ class EnrollmentListCreateView(generics.ListCreateAPIView):
             qs = qs.filter(section_id=p["section"])
         if p.get("status"):
             qs = qs.filter(status=p["status"])
-        q = p.get("q")
-        if q:
-            q = q.strip()
-            qs = qs.filter(
-                models.Q(student__code__icontains=q)
-                | models.Q(student__person__first_name__icontains=q)
-                | models.Q(student__person__last_name__icontains=q)
-            )
         return qs
 
 
-class EnrollmentDetailView(generics.RetrieveUpdateDestroyAPIView):
+class EnrollmentDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Enrollment.objects.select_related(
         "student", "student__person", "period", "grade", "section"
     ).all()
     serializer_class = EnrollmentSerializer
     permission_classes = [IsStaffUser]
+    etag_models = (Student, Person, AcademicPeriod, Grade, Section)
 
 
 # DOCENTES Y ASIGNACIONES
@@ -239,44 +285,46 @@ from academics.models import Teacher, TeacherAssignment
 from academics.serializers import TeacherSerializer, TeacherAssignmentSerializer
 
 
-class TeacherListCreateView(generics.ListCreateAPIView):
+class TeacherListCreateView(
+    ConditionalGetMixin, SearchMixin, SparseQuerysetMixin, generics.ListCreateAPIView
+):
     queryset = Teacher.objects.select_related("person", "user").all()
     serializer_class = TeacherSerializer
     permission_classes = [IsStaffUser]
+    etag_models = (Person,)
+    pagination_class = KeysetPagination
+    keyset_ordering = ("employee_code",)
 
+    # ?q= por código, nombre o email (SearchMixin)
     def get_queryset(self):
         qs = super().get_queryset()
-        q = self.request.query_params.get("q")
         is_active = self.request.query_params.get("is_active")
         
-        if q:
-            q = q.strip()
-            qs = qs.filter(
-                models.Q(employee_code__icontains=q)
-                | models.Q(person__first_name__icontains=q)
-                | models.Q(person__last_name__icontains=q)
-                | models.Q(user__email__icontains=q)
-            )
-        
         if is_active is not None:
             qs = qs.filter(is_active=is_active.lower() == "true")
         
         return qs
 
 
-class TeacherDetailView(generics.RetrieveUpdateDestroyAPIView):
+class TeacherDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Teacher.objects.select_related("person", "user").all()
     serializer_class = TeacherSerializer
     permission_classes = [IsStaffUser]
+    etag_models = (Person,)
 
 
-class TeacherAssignmentListCreateView(generics.ListCreateAPIView):
+class TeacherAssignmentListCreateView(
+    ConditionalGetMixin, SparseQuerysetMixin, generics.ListCreateAPIView
+):
     queryset = TeacherAssignment.objects.select_related(
         "teacher", "teacher__person", "subject", "grade", 
         "grade__level", "section", "period"
     ).all()
     serializer_class = TeacherAssignmentSerializer
     permission_classes = [IsStaffUser]
+    etag_models = (Teacher, Person, Subject, Grade, Section, AcademicPeriod, EducationLevel)
+    pagination_class = KeysetPagination
+    keyset_ordering = ("period_id", "grade_id", "section_id", "subject_id", "id")
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -300,13 +348,14 @@ class TeacherAssignmentListCreateView(generics.ListCreateAPIView):
         return qs
 
 
-class TeacherAssignmentDetailView(generics.RetrieveUpdateDestroyAPIView):
+class TeacherAssignmentDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = TeacherAssignment.objects.select_related(
         "teacher", "teacher__person", "subject", "grade",
         "grade__level", "section", "period"
     ).all()
     serializer_class = TeacherAssignmentSerializer
     permission_classes = [IsStaffUser]
+    etag_models = (Teacher, Person, Subject, Grade, Section, AcademicPeriod, EducationLevel)
 
 # FIN DOCENTES
 
@@ -319,6 +368,8 @@ from academics.models import (
     DimensionWeight,
     StudentGrade,
     GradeAverage,
+    SubjectAverage,
+    EnrollmentAverage,
 )
 from academics.serializers import (
     GradingDimensionSerializer,
@@ -326,28 +377,30 @@ from academics.serializers import (
     DimensionWeightSerializer,
     StudentGradeSerializer,
     GradeAverageSerializer,
+    SubjectAverageSerializer,
+    EnrollmentAverageSerializer,
 )
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Avg, Count
 
 
-class GradingDimensionListCreateView(generics.ListCreateAPIView):
+class GradingDimensionListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
     queryset = GradingDimension.objects.all()
     serializer_class = GradingDimensionSerializer
     permission_classes = [IsStaffUser]
 
 
-class GradingDimensionDetailView(generics.RetrieveUpdateDestroyAPIView):
+class GradingDimensionDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = GradingDimension.objects.all()
     serializer_class = GradingDimensionSerializer
     permission_classes = [IsStaffUser]
 
 
-class GradingPeriodListCreateView(generics.ListCreateAPIView):
+class GradingPeriodListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
     queryset = GradingPeriod.objects.select_related("academic_period").all()
     serializer_class = GradingPeriodSerializer
     permission_classes = [IsStaffUser]
+    etag_models = (AcademicPeriod,)
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -362,18 +415,20 @@ class GradingPeriodListCreateView(generics.ListCreateAPIView):
         return qs
 
 
-class GradingPeriodDetailView(generics.RetrieveUpdateDestroyAPIView):
+class GradingPeriodDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = GradingPeriod.objects.select_related("academic_period").all()
     serializer_class = GradingPeriodSerializer
     permission_classes = [IsStaffUser]
+    etag_models = (AcademicPeriod,)
 
 
-class DimensionWeightListCreateView(generics.ListCreateAPIView):
+class DimensionWeightListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
     queryset = DimensionWeight.objects.select_related(
         "subject", "grade", "dimension"
     ).all()
     serializer_class = DimensionWeightSerializer
     permission_classes = [IsStaffUser]
+    etag_models = (Subject, Grade, GradingDimension)
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -389,15 +444,18 @@ class DimensionWeightListCreateView(generics.ListCreateAPIView):
         return qs
 
 
-class DimensionWeightDetailView(generics.RetrieveUpdateDestroyAPIView):
+class DimensionWeightDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = DimensionWeight.objects.select_related(
         "subject", "grade", "dimension"
     ).all()
     serializer_class = DimensionWeightSerializer
     permission_classes = [IsStaffUser]
+    etag_models = (Subject, Grade, GradingDimension)
 
 
-class StudentGradeListCreateView(generics.ListCreateAPIView):
+class StudentGradeListCreateView(
+    ConditionalGetMixin, SparseQuerysetMixin, generics.ListCreateAPIView
+):
     queryset = StudentGrade.objects.select_related(
         "enrollment__student__person",
         "subject",
@@ -408,6 +466,12 @@ class StudentGradeListCreateView(generics.ListCreateAPIView):
     ).all()
     serializer_class = StudentGradeSerializer
     permission_classes = [CanManageGrades]  
+    etag_models = (
+        Enrollment, Student, Person, Subject,
+        GradingDimension, GradingPeriod, TeacherAssignment, Teacher,
+    )
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-recorded_at", "-id")
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -459,57 +523,11 @@ class StudentGradeListCreateView(generics.ListCreateAPIView):
                 from rest_framework.exceptions import PermissionDenied
                 raise PermissionDenied("Debes tener un perfil de docente")
         
+        # El promedio se recalcula al confirmar (academics/averages.py)
         serializer.save(recorded_by=self.request.user)
-        self._recalculate_average(serializer.instance)
-
-    def _recalculate_average(self, grade_instance):
-        """Recalcula el promedio de la materia para el estudiante en el trimestre"""
-        enrollment = grade_instance.enrollment
-        subject = grade_instance.subject
-        grading_period = grade_instance.grading_period
-        
-        # Obtener todas las notas de las 4 dimensiones
-        grades = StudentGrade.objects.filter(
-            enrollment=enrollment,
-            subject=subject,
-            grading_period=grading_period
-        ).select_related("dimension")
-        
-        if grades.count() != 4:
-            return  # Esperar a tener las 4 dimensiones
-        
-        # Obtener pesos personalizados o usar default
-        weights = {}
-        custom_weights = DimensionWeight.objects.filter(
-            subject=subject,
-            grade=enrollment.grade
-        ).select_related("dimension")
-        
-        for cw in custom_weights:
-            weights[cw.dimension.name] = float(cw.weight)
-        
-        # Si no hay pesos personalizados, usar default
-        if not weights:
-            dimensions = GradingDimension.objects.filter(is_active=True)
-            for dim in dimensions:
-                weights[dim.name] = float(dim.default_weight)
-        
-        # Calcular promedio ponderado
-        total = 0
-        for grade in grades:
-            weight = weights.get(grade.dimension.name, 25.0)
-            total += float(grade.score) * (weight / 100)
-        
-        # Guardar o actualizar promedio
-        GradeAverage.objects.update_or_create(
-            enrollment=enrollment,
-            subject=subject,
-            grading_period=grading_period,
-            defaults={"average": round(total, 2)}
-        )
 
 
-class StudentGradeDetailView(generics.RetrieveUpdateDestroyAPIView):
+class StudentGradeDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = StudentGrade.objects.select_related(
         "enrollment__student__person",
         "subject",
@@ -520,6 +538,10 @@ class StudentGradeDetailView(generics.RetrieveUpdateDestroyAPIView):
     ).all()
     serializer_class = StudentGradeSerializer
     permission_classes = [CanManageGrades] 
+    etag_models = (
+        Enrollment, Student, Person, Subject,
+        GradingDimension, GradingPeriod, TeacherAssignment, Teacher,
+    )
 
     def get_queryset(self):
 
@@ -548,53 +570,11 @@ class StudentGradeDetailView(generics.RetrieveUpdateDestroyAPIView):
             except:
                 from rest_framework.exceptions import PermissionDenied
                 raise PermissionDenied("Debes tener un perfil de docente")
+        # El promedio se recalcula al confirmar (academics/averages.py)
         serializer.save()
-        # Recalcular promedio después de actualizar nota
-        self._recalculate_average(serializer.instance)
-
-    def _recalculate_average(self, grade_instance):
-        """Mismo método que en Create"""
-        enrollment = grade_instance.enrollment
-        subject = grade_instance.subject
-        grading_period = grade_instance.grading_period
-        
-        grades = StudentGrade.objects.filter(
-            enrollment=enrollment,
-            subject=subject,
-            grading_period=grading_period
-        ).select_related("dimension")
-        
-        if grades.count() != 4:
-            return
-        
-        weights = {}
-        custom_weights = DimensionWeight.objects.filter(
-            subject=subject,
-            grade=enrollment.grade
-        ).select_related("dimension")
-        
-        for cw in custom_weights:
-            weights[cw.dimension.name] = float(cw.weight)
-        
-        if not weights:
-            dimensions = GradingDimension.objects.filter(is_active=True)
-            for dim in dimensions:
-                weights[dim.name] = float(dim.default_weight)
-        
-        total = 0
-        for grade in grades:
-            weight = weights.get(grade.dimension.name, 25.0)
-            total += float(grade.score) * (weight / 100)
-        
-        GradeAverage.objects.update_or_create(
-            enrollment=enrollment,
-            subject=subject,
-            grading_period=grading_period,
-            defaults={"average": round(total, 2)}
-        )
 
 
-class GradeAverageListView(generics.ListAPIView):
+class GradeAverageListView(ConditionalGetMixin, SparseQuerysetMixin, generics.ListAPIView):
     queryset = GradeAverage.objects.select_related(
         "enrollment__student__person",
         "subject",
@@ -602,6 +582,9 @@ class GradeAverageListView(generics.ListAPIView):
     ).all()
     serializer_class = GradeAverageSerializer
     permission_classes = [IsStaffUser]
+    etag_models = (Enrollment, Student, Person, Subject, GradingPeriod)
+    pagination_class = KeysetPagination
+    keyset_ordering = ("enrollment_id", "subject_id", "grading_period_id")
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -625,7 +608,7 @@ class GradeAverageListView(generics.ListAPIView):
         return qs
 
 
-class GradeAverageDetailView(generics.RetrieveAPIView):
+class GradeAverageDetailView(ConditionalGetMixin, generics.RetrieveAPIView):
     queryset = GradeAverage.objects.select_related(
         "enrollment__student__person",
         "subject",
@@ -633,6 +616,99 @@ class GradeAverageDetailView(generics.RetrieveAPIView):
     ).all()
     serializer_class = GradeAverageSerializer
     permission_classes = [IsStaffUser]
+    etag_models = (Enrollment, Student, Person, Subject, GradingPeriod)
+
+
+class SubjectAverageListView(ConditionalGetMixin, SparseQuerysetMixin, generics.ListAPIView):
+    """
+    Promedios anuales por materia (materializados, academics/averages.py).
+    Ordenados de mayor a menor: con ?subject=&section= es el ranking de la materia.
+    """
+    queryset = SubjectAverage.objects.select_related(
+        "enrollment__student__person",
+        "subject",
+    ).all()
+    serializer_class = SubjectAverageSerializer
+    permission_classes = [IsStaffUser]
+    etag_models = (Enrollment, Student, Person, Subject)
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-average", "-id")
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        p = self.request.query_params
+        
+        if p.get("enrollment"):
+            qs = qs.filter(enrollment_id=p["enrollment"])
+        if p.get("student"):
+            qs = qs.filter(enrollment__student_id=p["student"])
+        if p.get("subject"):
+            qs = qs.filter(subject_id=p["subject"])
+        if p.get("period"):
+            qs = qs.filter(enrollment__period_id=p["period"])
+        if p.get("grade"):
+            qs = qs.filter(enrollment__grade_id=p["grade"])
+        if p.get("section"):
+            qs = qs.filter(enrollment__section_id=p["section"])
+        
+        return qs
+
+
+class EnrollmentAverageListView(ConditionalGetMixin, SparseQuerysetMixin, generics.ListAPIView):
+    """
+    Promedio general por matrícula (materializado, academics/averages.py).
+    Ordenado de mayor a menor: con ?grade=&section= es el ranking del curso.
+    """
+    queryset = EnrollmentAverage.objects.select_related(
+        "enrollment__student__person",
+    ).all()
+    serializer_class = EnrollmentAverageSerializer
+    permission_classes = [IsStaffUser]
+    etag_models = (Enrollment, Student, Person)
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-average", "-id")
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        p = self.request.query_params
+        
+        if p.get("enrollment"):
+            qs = qs.filter(enrollment_id=p["enrollment"])
+        if p.get("student"):
+            qs = qs.filter(enrollment__student_id=p["student"])
+        if p.get("period"):
+            qs = qs.filter(enrollment__period_id=p["period"])
+        if p.get("grade"):
+            qs = qs.filter(enrollment__grade_id=p["grade"])
+        if p.get("section"):
+            qs = qs.filter(enrollment__section_id=p["section"])
+        
+        return qs
+
+
+class GradeAverageRecomputeView(APIView):
+    """
+    POST /api/grade-averages/recompute
+    Rehace los promedios del colegio con los pesos actuales (academics/recompute.py),
+    p. ej. después de cambiar DimensionWeight o default_weight.
+    Body opcional: {"subjects": [id, ...], "grades": [id, ...]}
+    """
+
+    permission_classes = [IsTenantAdmin]
+
+    def post(self, request):
+        scope = {}
+        for key, arg in (("subjects", "subject_ids"), ("grades", "grade_ids")):
+            ids = request.data.get(key)
+            if ids is None:
+                continue
+            if not isinstance(ids, list) or not all(isinstance(i, int) for i in ids):
+                return Response({"error": f"{key} debe ser una lista de ids"}, status=400)
+            scope[arg] = ids
+
+        stats = recompute_averages(**scope)
+        stats["rows_per_second"] = round(stats["rows"] / stats["seconds"]) if stats["seconds"] else 0
+        return Response(stats)
 
 
 # Vista especial: Planilla de calificaciones
@@ -683,58 +759,12 @@ class GradeSheetView(generics.GenericAPIView):
                     status=403
                 )
         
-        # Obtener matrículas activas
-        enrollments = Enrollment.objects.filter(
-            grade_id=p["grade"],
-            section_id=p["section"],
-            period_id=p["period"],
-            status="ACTIVE"
-        ).select_related("student__person").order_by("student__code")
-        
-        # Obtener dimensiones activas
-        dimensions = GradingDimension.objects.filter(is_active=True).order_by("name")
-        
-        # Construir planilla
-        sheet_data = []
-        for enrollment in enrollments:
-            student_data = {
-                "enrollment_id": enrollment.id,
-                "student_code": enrollment.student.code,
-                "student_name": str(enrollment.student.person),
-                "grades": {}
-            }
-            
-            # Obtener notas existentes
-            grades = StudentGrade.objects.filter(
-                enrollment=enrollment,
-                subject_id=p["subject"],
-                grading_period_id=p["grading_period"]
-            ).select_related("dimension")
-            
-            for grade in grades:
-                student_data["grades"][grade.dimension.name] = {
-                    "id": grade.id,
-                    "score": float(grade.score),
-                    "notes": grade.notes
-                }
-            
-            # Obtener promedio si existe
-            try:
-                avg = GradeAverage.objects.get(
-                    enrollment=enrollment,
-                    subject_id=p["subject"],
-                    grading_period_id=p["grading_period"]
-                )
-                student_data["average"] = float(avg.average)
-            except GradeAverage.DoesNotExist:
-                student_data["average"] = None
-            
-            sheet_data.append(student_data)
-        
-        return Response({
-            "dimensions": [dim.name for dim in dimensions],
-            "students": sheet_data
-        })
+        # Planilla en un número fijo de queries (academics/gradesheet.py)
+        return Response(
+            build_grade_sheet(
+                p["grade"], p["section"], p["period"], p["subject"], p["grading_period"]
+            )
+        )
     
     def post(self, request):
         """
@@ -755,13 +785,16 @@ class GradeSheetView(generics.GenericAPIView):
         }
         """
         grades_data = request.data.get("grades", [])
-        grades_data = request.data.get("grades", [])
+        if not isinstance(grades_data, list):
+            return Response({"error": "grades debe ser una lista"}, status=400)
         
         # ✅ AGREGAR: Validar que el docente pueda registrar estas notas
         user = request.user
         if user.role == "DOC":
             teacher_assignments = set()
             for grade_data in grades_data:
+                if not isinstance(grade_data, dict):  # upsert_grades() la informa en errors
+                    continue
                 ta_id = grade_data.get("teacher_assignment")
                 if ta_id:
                     teacher_assignments.add(ta_id)
@@ -787,93 +820,35 @@ class GradeSheetView(generics.GenericAPIView):
         if not grades_data:
             return Response({"error": "No se enviaron notas"}, status=400)
         
-        created = []
-        updated = []
-        errors = []
-        
-        for grade_data in grades_data:
-            serializer = StudentGradeSerializer(data=grade_data, context={"request": request})
-            
-            if serializer.is_valid():
-                # Verificar si ya existe
-                existing = StudentGrade.objects.filter(
-                    enrollment_id=grade_data["enrollment"],
-                    subject_id=grade_data["subject"],
-                    dimension_id=grade_data["dimension"],
-                    grading_period_id=grade_data["grading_period"]
-                ).first()
-                
-                if existing:
-                    serializer = StudentGradeSerializer(
-                        existing,
-                        data=grade_data,
-                        partial=True,
-                        context={"request": request}
-                    )
-                    if serializer.is_valid():
-                        serializer.save()
-                        updated.append(serializer.data)
-                    else:
-                        errors.append(serializer.errors)
-                else:
-                    serializer.save(recorded_by=request.user)
-                    created.append(serializer.data)
-                    
-                    # Recalcular promedio
-                    self._recalculate_average(serializer.instance)
-            else:
-                errors.append(serializer.errors)
+        # Validación en memoria + INSERT ... ON CONFLICT (academics/gradesheet.py)
+        result = upsert_grades(grades_data, request.user)
+        
+        written = StudentGrade.objects.filter(
+            pk__in=result["created"] + result["updated"]
+        ).select_related(
+            "enrollment__student__person",
+            "subject",
+            "dimension",
+            "grading_period",
+            "teacher_assignment__teacher__person",
+        ).in_bulk()
+        context = {"request": request}
+        created = StudentGradeSerializer(
+            [written[pk] for pk in result["created"]], many=True, context=context
+        ).data
+        updated = StudentGradeSerializer(
+            [written[pk] for pk in result["updated"]], many=True, context=context
+        ).data
         
         return Response({
             "created": len(created),
             "updated": len(updated),
-            "errors": errors,
+            "errors": result["errors"],
             "details": {
                 "created": created,
                 "updated": updated
             }
         })
-    
-    def _recalculate_average(self, grade_instance):
-        """Recalcula promedio (mismo método que en StudentGradeListCreateView)"""
-        enrollment = grade_instance.enrollment
-        subject = grade_instance.subject
-        grading_period = grade_instance.grading_period
-        
-        grades = StudentGrade.objects.filter(
-            enrollment=enrollment,
-            subject=subject,
-            grading_period=grading_period
-        ).select_related("dimension")
-        
-        if grades.count() != 4:
-            return
-        
-        weights = {}
-        custom_weights = DimensionWeight.objects.filter(
-            subject=subject,
-            grade=enrollment.grade
-        ).select_related("dimension")
-        
-        for cw in custom_weights:
-            weights[cw.dimension.name] = float(cw.weight)
-        
-        if not weights:
-            dimensions = GradingDimension.objects.filter(is_active=True)
-            for dim in dimensions:
-                weights[dim.name] = float(dim.default_weight)
-        
-        total = 0
-        for grade in grades:
-            weight = weights.get(grade.dimension.name, 25.0)
-            total += float(grade.score) * (weight / 100)
-        
-        GradeAverage.objects.update_or_create(
-            enrollment=enrollment,
-            subject=subject,
-            grading_period=grading_period,
-            defaults={"average": round(total, 2)}
-        )
 
 # FIN CALIFICACIONES
 
@@ -899,12 +874,15 @@ from academics.serializers import (
 from .views import IsStaffUser  # reutiliza permiso existente
 
 
-class AttendanceSessionViewSet(viewsets.ModelViewSet):
+class AttendanceSessionViewSet(ConditionalGetMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     queryset = AttendanceSession.objects.all().select_related(
         "grade", "section", "subject", "period", "created_by"
     )
     serializer_class = AttendanceSessionSerializer
     permission_classes = [IsStaffUser]
+    etag_models = (Subject, Grade, Section, Enrollment)
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-date", "-start_time", "-id")
 
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
@@ -917,21 +895,27 @@ class AttendanceSessionViewSet(viewsets.ModelViewSet):
         return Response({"message": "Sesión cerrada"})
 
 
-class AttendanceRecordViewSet(viewsets.ModelViewSet):
+class AttendanceRecordViewSet(ConditionalGetMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     queryset = AttendanceRecord.objects.select_related(
         "student__person", "session__subject"
     )
     serializer_class = AttendanceRecordSerializer
     permission_classes = [IsStaffUser]
+    etag_models = (Student, Person, AttendanceSession)
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-recorded_at", "-id")
 
     def perform_create(self, serializer):
         serializer.save(recorded_by=self.request.user)
 
 
-class StudentQRCodeViewSet(viewsets.ModelViewSet):
+class StudentQRCodeViewSet(ConditionalGetMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     queryset = StudentQRCode.objects.select_related("student__person")
     serializer_class = StudentQRCodeSerializer
     permission_classes = [IsStaffUser]
+    etag_models = (Student, Person)
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-id",)
 
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
@@ -1016,12 +1000,17 @@ class QRAttendanceScanView(generics.CreateAPIView):
         return Response({"success": True, "status": status_value})
 
 
-class AttendanceScanLogViewSet(viewsets.ReadOnlyModelViewSet):
+class AttendanceScanLogViewSet(
+    ConditionalGetMixin, SparseQuerysetMixin, viewsets.ReadOnlyModelViewSet
+):
     queryset = AttendanceScanLog.objects.select_related(
         "student_qr__student", "session"
     )
     serializer_class = AttendanceScanLogSerializer
     permission_classes = [IsStaffUser]
+    etag_models = (StudentQRCode, Student, AttendanceSession)
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-scanned_at", "-id")
 
     @action(detail=False, methods=["get"])
     def stats(self, request):
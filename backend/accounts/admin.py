@@ -1,18 +1,18 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
-from .models import User
+from .models import RevokedToken, User
 
 
 @admin.register(User)
 class UserAdmin(DjangoUserAdmin):
     model = User
-    list_display = ("id", "email", "role", "is_staff", "is_active")
+    list_display = ("id", "email", "role", "tenant", "is_staff", "is_active")
     list_filter = ("role", "is_staff", "is_active")
     ordering = ("id",)
 
     # Campos que se muestran/editar en el admin
     fieldsets = (
-        (None, {"fields": ("email", "password", "role")}),
+        (None, {"fields": ("email", "password", "role", "tenant")}),
         (
             "Permisos",
             {
@@ -45,3 +45,9 @@ class UserAdmin(DjangoUserAdmin):
     )
 
     search_fields = ("email",)
+
+
+@admin.register(RevokedToken)
+class RevokedTokenAdmin(admin.ModelAdmin):
+    list_display = ("jti", "user", "revoked_at", "expires_at")
+    search_fields = ("jti", "user__email")
@@ -0,0 +1,31 @@
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .revocation import revocation_list
+from .tokens import user_from_claims
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication sin SELECT de accounts.User por request: el usuario se
+    arma con los claims del token (accounts/tokens.py). Si el sello "pv" está
+    desactualizado o el token no trae claims (emitido antes de este cambio),
+    se cae al comportamiento normal de simplejwt. Los tokens revocados en el
+    logout se rechazan (accounts/revocation.py).
+    """
+
+    def get_validated_token(self, raw_token):
+        token = super().get_validated_token(raw_token)
+        # Filtro Bloom en memoria: solo un positivo consulta RevokedToken
+        if revocation_list.is_revoked(token.get(api_settings.JTI_CLAIM)):
+            raise InvalidToken("El token fue revocado")
+        return token
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is not None:
+            user = user_from_claims(validated_token.payload, user_id)
+            if user is not None:
+                return user
+        return super().get_user(validated_token)
@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class ConfigurablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2 con iteraciones tomadas de settings.PASSWORD_PBKDF2_ITERATIONS.
+    Mismo algoritmo que el de Django: los hashes existentes siguen siendo
+    válidos y, si el costo cambia, se rehashean solos en el siguiente login
+    (must_update compara las iteraciones guardadas con las configuradas).
+    """
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS or PBKDF2PasswordHasher.iterations
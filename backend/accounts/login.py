@@ -0,0 +1,107 @@
+"""
+Login con verificación de password fuera del hilo/loop que atiende requests.
+
+PBKDF2 (hashlib) suelta el GIL, así que un ThreadPoolExecutor acotado usa
+varios núcleos sin bloquear el event loop de ASGI: los health checks y el
+resto de requests siguen respondiendo durante una avalancha de logins. Si ya
+hay LOGIN_MAX_PENDING verificaciones en cola se responde "ocupado" en vez de
+encolar sin límite.
+
+LoginAttempts lleva en memoria (por proceso) los intentos fallidos por IP en
+una ventana deslizante. La IP es REMOTE_ADDR salvo que haya
+LOGIN_TRUSTED_PROXIES: el cliente elige las entradas de la izquierda de
+X-Forwarded-For, así que solo valen las que agregaron nuestros proxies.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password, verify_password
+
+
+class LoginAttempts:
+    def __init__(self, max_failures, window):
+        self.max_failures = max_failures
+        self.window = window
+        self._failures = {}  # ip -> deque de timestamps
+        self._lock = threading.Lock()
+
+    def _recent(self, ip, now):
+        failures = self._failures.get(ip)
+        if failures is None:
+            return None
+        while failures and failures[0] <= now - self.window:
+            failures.popleft()
+        if not failures:
+            del self._failures[ip]
+            return None
+        return failures
+
+    def blocked_for(self, ip):
+        """Segundos que le faltan a la IP para poder reintentar (0 = permitido)."""
+        now = time.monotonic()
+        with self._lock:
+            failures = self._recent(ip, now)
+            if failures is None or len(failures) < self.max_failures:
+                return 0
+            return int(failures[0] + self.window - now) + 1
+
+    def fail(self, ip):
+        with self._lock:
+            self._failures.setdefault(ip, deque()).append(time.monotonic())
+
+    def reset(self, ip):
+        with self._lock:
+            self._failures.pop(ip, None)
+
+    def __len__(self):
+        return len(self._failures)
+
+
+login_attempts = LoginAttempts(
+    max_failures=getattr(settings, "LOGIN_MAX_FAILURES", 10),
+    window=getattr(settings, "LOGIN_FAILURE_WINDOW", 300),
+)
+
+_workers = getattr(settings, "LOGIN_HASH_WORKERS", None) or os.cpu_count() or 1
+_executor = ThreadPoolExecutor(max_workers=_workers, thread_name_prefix="login-hash")
+_pending = threading.BoundedSemaphore(getattr(settings, "LOGIN_MAX_PENDING", 64))
+
+
+class LoginBusy(Exception):
+    pass
+
+
+_trusted_proxies = getattr(settings, "LOGIN_TRUSTED_PROXIES", 0)
+
+
+def client_ip(request):
+    if _trusted_proxies:
+        forwarded = [
+            ip.strip() for ip in request.META.get("HTTP_X_FORWARDED_FOR", "").split(",") if ip.strip()
+        ]
+        if forwarded:
+            # Cada proxy agrega a la derecha la IP que lo contactó
+            return forwarded[-min(_trusted_proxies, len(forwarded))]
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def _verify(password, encoded):
+    """(correcto, hash nuevo si hay que rehashear al costo configurado)."""
+    is_correct, must_update = verify_password(password, encoded)
+    return is_correct, make_password(password) if is_correct and must_update else None
+
+
+async def averify_password(password, encoded):
+    if not _pending.acquire(blocking=False):
+        raise LoginBusy()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, _verify, password, encoded)
+    finally:
+        _pending.release()
@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from accounts.authentication import StatelessJWTAuthentication
+from accounts.models import User
+from accounts.serializers import ClaimsTokenObtainPairSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara JWTAuthentication (SELECT de User por request) con "
+        "StatelessJWTAuthentication (usuario desde los claims)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--email", required=True)
+        parser.add_argument("--iterations", type=int, default=2000)
+
+    def handle(self, *args, **opts):
+        user = User.objects.filter(email=opts["email"]).first()
+        if user is None:
+            raise CommandError(f"No existe el usuario {opts['email']}")
+
+        token = str(ClaimsTokenObtainPairSerializer.get_token(user).access_token)
+        request = RequestFactory().get("/api/levels", HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        for label, auth in (
+            ("JWTAuthentication", JWTAuthentication()),
+            ("StatelessJWTAuthentication", StatelessJWTAuthentication()),
+        ):
+            auth.authenticate(request)  # calienta cache de versión / conexión
+            with CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                for _ in range(opts["iterations"]):
+                    authed, _ = auth.authenticate(request)
+                elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"{label}: {elapsed / opts['iterations'] * 1e6:.1f}µs/auth | "
+                f"queries/auth={len(ctx.captured_queries) / opts['iterations']:.2f} | "
+                f"role={authed.role} staff={authed.is_staff}"
+            )
@@ -0,0 +1,96 @@
+import asyncio
+import json
+import os
+import time
+
+from asgiref.testing import ApplicationCommunicator
+from django.core.management.base import BaseCommand
+
+
+def _scope(method, path, ip):
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "headers": [(b"host", b"localhost"), (b"content-type", b"application/json")],
+        "client": (ip, 40000),
+        "server": ("localhost", 80),
+    }
+
+
+async def _call(app, method, path, body=b"", ip="127.0.0.1"):
+    communicator = ApplicationCommunicator(app, _scope(method, path, ip))
+    started = time.perf_counter()
+    await communicator.send_input({"type": "http.request", "body": body})
+    start = await communicator.receive_output(60)
+    await communicator.receive_output(60)  # cuerpo
+    return start["status"], (time.perf_counter() - started) * 1000
+
+
+def _p(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+
+class Command(BaseCommand):
+    help = (
+        "Escenario de carga de login bajo ASGI: N logins concurrentes contra "
+        "/api/auth/login/async mientras se sondea /api/health. Reporta logins/s "
+        "por núcleo y la latencia del health check durante la avalancha."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--email", required=True)
+        parser.add_argument("--password", required=True)
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=32)
+
+    def handle(self, *args, **opts):
+        from config.asgi import LOGIN_ASYNC_PATH, application
+
+        body = json.dumps({"email": opts["email"], "password": opts["password"]}).encode()
+        result = asyncio.run(self._storm(application, LOGIN_ASYNC_PATH, body, opts))
+
+        cores = os.cpu_count() or 1
+        statuses = {}
+        for status in result["statuses"]:
+            statuses[status] = statuses.get(status, 0) + 1
+        rate = len(result["statuses"]) / result["elapsed"]
+        self.stdout.write(
+            f"login: {len(result['statuses'])} en {result['elapsed']:.2f}s = {rate:.1f} logins/s "
+            f"({rate / cores:.1f}/núcleo, {cores} núcleos) | p50={_p(result['login_ms'], 0.5):.0f}ms "
+            f"p95={_p(result['login_ms'], 0.95):.0f}ms | status={statuses}"
+        )
+        self.stdout.write(
+            f"health durante la carga: {len(result['health_ms'])} sondeos | "
+            f"p50={_p(result['health_ms'], 0.5):.1f}ms p95={_p(result['health_ms'], 0.95):.1f}ms"
+        )
+
+    async def _storm(self, app, path, body, opts):
+        semaphore = asyncio.Semaphore(opts["concurrency"])
+        login_ms, statuses, health_ms = [], [], []
+        done = asyncio.Event()
+
+        async def login(i):
+            async with semaphore:
+                status, ms = await _call(app, "POST", path, body, ip=f"10.0.{i // 250}.{i % 250}")
+                statuses.append(status)
+                login_ms.append(ms)
+
+        async def probe():
+            while not done.is_set():
+                _, ms = await _call(app, "GET", "/api/health")
+                health_ms.append(ms)
+                await asyncio.sleep(0.05)
+
+        prober = asyncio.create_task(probe())
+        started = time.perf_counter()
+        await asyncio.gather(*(login(i) for i in range(opts["requests"])))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await prober
+        return {"elapsed": elapsed, "statuses": statuses, "login_ms": login_ms, "health_ms": health_ms}
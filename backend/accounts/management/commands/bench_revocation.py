@@ -0,0 +1,60 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import RevokedToken
+from accounts.revocation import BloomFilter, revocation_list
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark del filtro Bloom de revocación: tasa de falsos positivos "
+        "medida vs. teórica y costo por request frente a un EXISTS en la base."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--revoked", type=int, default=100_000, help="jti revocados simulados.")
+        parser.add_argument("--probes", type=int, default=200_000, help="jti válidos a consultar.")
+        parser.add_argument("--capacity", type=int, default=100_000)
+        parser.add_argument("--error-rate", type=float, default=0.001)
+        parser.add_argument("--db-probes", type=int, default=500)
+
+    def handle(self, *args, **opts):
+        # --- Falsos positivos (en memoria, sin base) ---
+        bloom = BloomFilter(opts["capacity"], opts["error_rate"])
+        for _ in range(opts["revoked"]):
+            bloom.add(uuid.uuid4().hex)
+        probes = [uuid.uuid4().hex for _ in range(opts["probes"])]
+
+        started = time.perf_counter()
+        false_positives = sum(1 for jti in probes if jti in bloom)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"bloom: {bloom.size / 8 / 1024:.0f}KB, {bloom.hashes} hashes, {opts['revoked']} revocados | "
+            f"FP medido={false_positives / len(probes):.5f} teórico={bloom.expected_error_rate():.5f} | "
+            f"{elapsed / len(probes) * 1e9:.0f}ns/consulta"
+        )
+
+        # --- Por request: revocation_list (filtro real) vs EXISTS ---
+        sample = probes[: opts["db_probes"]]
+        revocation_list.rebuild()
+        revocation_list.reset_stats()
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            for jti in sample:
+                revocation_list.is_revoked(jti)
+            bloom_us = (time.perf_counter() - started) / len(sample) * 1e6
+        bloom_queries = len(ctx.captured_queries)
+
+        started = time.perf_counter()
+        for jti in sample:
+            RevokedToken.objects.filter(jti=jti).exists()
+        db_us = (time.perf_counter() - started) / len(sample) * 1e6
+
+        self.stdout.write(
+            f"por request: filtro={bloom_us:.1f}µs ({bloom_queries} queries en {len(sample)} checks) | "
+            f"EXISTS={db_us:.1f}µs (1 query/check) | {revocation_list.stats()}"
+        )
@@ -0,0 +1,57 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.bulk_import import ImportFormatError, import_users, parse_rows
+from tenants.models import Client
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa usuarios desde CSV (email,name,role,password) o JSON con hash "
+        "de passwords en paralelo y bulk_create por bloques."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=["csv", "json"], help="Por defecto según la extensión.")
+        parser.add_argument("--tenant", help="schema_name del colegio al que pertenecen.")
+        parser.add_argument("--role", default="EST", help="Rol si la fila no lo trae.")
+        parser.add_argument("--workers", type=int, help="Procesos de hashing (por defecto USER_IMPORT_WORKERS).")
+        parser.add_argument("--chunk-size", type=int, default=500)
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **opts):
+        path = Path(opts["path"])
+        fmt = opts["format"] or ("json" if path.suffix.lower() == ".json" else "csv")
+        tenant = None
+        if opts["tenant"]:
+            tenant = Client.objects.filter(schema_name=opts["tenant"]).first()
+            if tenant is None:
+                raise CommandError(f"No existe el colegio {opts['tenant']}")
+
+        try:
+            rows = parse_rows(path.read_bytes(), fmt)
+        except (ImportFormatError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        report = import_users(
+            rows,
+            tenant=tenant,
+            default_role=opts["role"].upper(),
+            workers=opts["workers"],
+            chunk_size=opts["chunk_size"],
+            dry_run=opts["dry_run"],
+        )
+
+        for error in report["errors"]:
+            self.stdout.write(
+                self.style.WARNING(f"fila {error['row']} ({error['email']}): {'; '.join(error['errors'])}")
+            )
+        timings = " ".join(f"{k}={v}" for k, v in report["timings"].items())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{report['created']}/{report['rows']} creados, {len(report['errors'])} con errores "
+                f"| {timings} | {report.get('rows_per_s') or 0} filas/s"
+            )
+        )
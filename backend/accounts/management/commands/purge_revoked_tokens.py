@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from accounts.models import RevokedToken
+
+
+class Command(BaseCommand):
+    help = "Elimina las revocaciones de tokens ya vencidos (un JWT vencido se rechaza igual). Pensado para cron."
+
+    def handle(self, *args, **opts):
+        deleted, _ = RevokedToken.objects.filter(expires_at__lte=timezone.now()).delete()
+        self.stdout.write(f"{deleted} revocaciones vencidas eliminadas")
@@ -51,6 +51,16 @@ class User(AbstractUser):
         ("PAD", "Padre"),
     ]
     role = models.CharField(max_length=8, choices=ROLE_CHOICES, default="ADMIN")
+    # Colegio al que pertenece la cuenta (null = usuario de plataforma)
+    tenant = models.ForeignKey(
+        "tenants.Client",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="users",
+    )
+    # Se incrementa cuando cambian rol/flags/permisos: invalida los claims del JWT
+    auth_version = models.PositiveIntegerField(default=0)
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS: list[str] = []  # sin campos extra obligatorios
@@ -61,5 +71,19 @@ class User(AbstractUser):
         return f"{self.email} ({self.role})"
 
 
+class RevokedToken(models.Model):
+    """
+    JWT revocados antes de expirar (logout). Se consultan a través del filtro
+    Bloom de accounts/revocation.py; las filas vencidas se purgan con
+    manage.py purge_revoked_tokens.
+    """
 
+    jti = models.CharField(max_length=64, unique=True)
+    user = models.ForeignKey(
+        User, null=True, blank=True, on_delete=models.CASCADE, related_name="revoked_tokens"
+    )
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
+    def __str__(self) -> str:
+        return f"{self.jti} (vence {self.expires_at:%Y-%m-%d %H:%M})"
@@ -0,0 +1,97 @@
+"""
+Permisos efectivos precalculados por usuario y colegio.
+
+user_access() devuelve un UserAccess con:
+    perms       frozenset de "app_label.codename" (user_permissions + grupos
+                tenant_<ROLE>), lo mismo que ModelBackend.get_all_permissions()
+    teacher_id  Teacher del usuario en el esquema actual (o None)
+
+Se guarda en el cache con clave por esquema (core/cache.py) que incluye
+User.auth_version y la versión del modelo Teacher: update_role_permissions y
+manage_user_permissions cambian m2m de grupos/usuarios, accounts/signals.py
+incrementa auth_version y la clave vieja deja de usarse. Con el usuario de
+StatelessJWTAuthentication, consultar permisos no toca la base.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import Permission
+from django.db import connection
+from django.db.models import Q
+from django_tenants.utils import get_public_schema_name
+
+from core.cache import tenant_cache
+
+
+@dataclass(frozen=True)
+class UserAccess:
+    perms: frozenset
+    teacher_id: Optional[int] = None
+
+
+NO_ACCESS = UserAccess(perms=frozenset())
+
+
+def _teacher_model():
+    from academics.models import Teacher
+
+    return Teacher
+
+
+def _in_tenant_schema():
+    return connection.schema_name != get_public_schema_name()
+
+
+def _compute(user):
+    perms = frozenset(
+        f"{app_label}.{codename}"
+        for app_label, codename in Permission.objects.filter(
+            Q(user=user) | Q(group__user=user)
+        )
+        .values_list("content_type__app_label", "codename")
+        .distinct()
+    )
+    teacher_id = None
+    if _in_tenant_schema():
+        teacher_id = (
+            _teacher_model().objects.filter(user_id=user.pk).values_list("id", flat=True).first()
+        )
+    return UserAccess(perms=perms, teacher_id=teacher_id)
+
+
+def user_access(user):
+    if user is None or not user.is_authenticated or not user.is_active:
+        return NO_ACCESS
+    access = getattr(user, "_access", None)
+    if access is not None:
+        return access
+
+    versions = tenant_cache.version(_teacher_model()) if _in_tenant_schema() else (0,)
+    key = f"access:{user.pk}:{user.auth_version}:{versions[0]}"
+    access = tenant_cache.get(key)
+    if access is None:
+        access = _compute(user)
+        tenant_cache.set(key, access)
+    user._access = access  # memo de la request
+    return access
+
+
+class CachedPermissionBackend(ModelBackend):
+    """ModelBackend cuyas consultas de permisos salen de user_access()."""
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if obj is not None:
+            return set()
+        return set(user_access(user_obj).perms)
+
+    def get_user_permissions(self, user_obj, obj=None):
+        # Sin distinguir origen: con el conjunto efectivo basta para has_perm()
+        return self.get_all_permissions(user_obj, obj)
+
+    def get_group_permissions(self, user_obj, obj=None):
+        return self.get_all_permissions(user_obj, obj)
+
+    def has_perm(self, user_obj, perm, obj=None):
+        return obj is None and perm in user_access(user_obj).perms
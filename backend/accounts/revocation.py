@@ -0,0 +1,163 @@
+"""
+Revocación de JWT sin una query por request.
+
+Los jti revocados se guardan en RevokedToken (public) y cada proceso mantiene
+una copia en un filtro Bloom:
+
+- is_revoked(jti): si el filtro dice "no está" (el caso normal) la respuesta
+  es definitiva y no se toca la base. Solo ante un positivo, que puede ser
+  falso, se confirma con un EXISTS por jti.
+- Cada REVOCATION_REFRESH_SECONDS se cargan las filas con revoked_at dentro
+  de los últimos REVOCATION_REFRESH_OVERLAP segundos antes de la lectura
+  anterior, así un logout en otro worker se respeta en segundos. No se usa
+  "id > último visto": una transacción que tomó un id menor y confirma
+  después de que se leyó uno mayor quedaría fuera para siempre. Los jti ya
+  agregados dentro de la ventana no se vuelven a contar.
+- Si las filas superan la capacidad el filtro se reconstruye al doble; las
+  vencidas se purgan con manage.py purge_revoked_tokens y salen del filtro en
+  la siguiente reconstrucción.
+"""
+
+import hashlib
+import math
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import RevokedToken
+
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate=0.001):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.size = max(8, int(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def expected_error_rate(self):
+        """Tasa de falsos positivos teórica con los elementos actuales."""
+        return (1 - math.exp(-self.hashes * self.count / self.size)) ** self.hashes
+
+
+class RevocationList:
+    def __init__(self):
+        self.capacity = getattr(settings, "REVOCATION_BLOOM_CAPACITY", 100_000)
+        self.error_rate = getattr(settings, "REVOCATION_BLOOM_ERROR_RATE", 0.001)
+        self.refresh_every = getattr(settings, "REVOCATION_REFRESH_SECONDS", 5)
+        self.overlap = timedelta(seconds=getattr(settings, "REVOCATION_REFRESH_OVERLAP", 60))
+        self._filter = None
+        self._since = None  # revoked_at desde el que relee refresh()
+        self._window = {}  # jti -> revoked_at ya agregados con revoked_at >= _since
+        self._next_refresh = 0.0
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.checks = 0
+        self.positives = 0
+        self.false_positives = 0
+        self.refreshes = 0
+        self.rebuilds = 0
+
+    def stats(self):
+        bloom = self._filter
+        return {
+            "checks": self.checks,
+            "positives": self.positives,
+            "false_positives": self.false_positives,
+            "refreshes": self.refreshes,
+            "rebuilds": self.rebuilds,
+            "entries": bloom.count if bloom else 0,
+            "capacity": bloom.capacity if bloom else self.capacity,
+            "bits": bloom.size if bloom else 0,
+            "hashes": bloom.hashes if bloom else 0,
+            "expected_error_rate": round(bloom.expected_error_rate(), 6) if bloom else None,
+        }
+
+    # --- mantenimiento del filtro ---
+    def rebuild(self):
+        started = timezone.now()
+        rows = list(
+            RevokedToken.objects.filter(expires_at__gt=started)
+            .order_by("id")
+            .values_list("jti", "revoked_at")
+        )
+        capacity = self.capacity
+        while len(rows) > capacity * 0.8:
+            capacity *= 2
+        bloom = BloomFilter(capacity, self.error_rate)
+        for jti, _ in rows:
+            bloom.add(jti)
+        with self._lock:
+            self._filter = bloom
+            self._since = started - self.overlap
+            self._window = {jti: at for jti, at in rows if at >= self._since}
+            self._next_refresh = time.monotonic() + self.refresh_every
+            self.rebuilds += 1
+
+    def refresh(self):
+        """Agrega al filtro las revocaciones recientes (una query por revoked_at)."""
+        if self._filter is None:
+            return self.rebuild()
+        started = timezone.now()
+        rows = list(
+            RevokedToken.objects.filter(revoked_at__gte=self._since).values_list("jti", "revoked_at")
+        )
+        with self._lock:
+            for jti, revoked_at in rows:
+                if jti not in self._window:
+                    self._filter.add(jti)
+                    self._window[jti] = revoked_at
+            self._since = started - self.overlap
+            self._window = {jti: at for jti, at in self._window.items() if at >= self._since}
+            self._next_refresh = time.monotonic() + self.refresh_every
+            self.refreshes += 1
+        if self._filter.count > self._filter.capacity:
+            self.rebuild()
+
+    def _maybe_refresh(self):
+        if self._filter is None or time.monotonic() >= self._next_refresh:
+            self.refresh()
+
+    # --- API ---
+    def is_revoked(self, jti):
+        if not jti:
+            return False
+        self._maybe_refresh()
+        self.checks += 1
+        if jti not in self._filter:
+            return False
+        self.positives += 1
+        revoked = RevokedToken.objects.filter(jti=jti).exists()
+        if not revoked:
+            self.false_positives += 1
+        return revoked
+
+    def revoke(self, jti, expires_at, user_id=None):
+        RevokedToken.objects.get_or_create(
+            jti=jti, defaults={"expires_at": expires_at, "user_id": user_id}
+        )
+        self.refresh()  # visible ya en este proceso, sin esperar al intervalo
+
+
+revocation_list = RevocationList()
@@ -1,5 +1,14 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
 from .models import User
+from .revocation import revocation_list
+from .tokens import user_claims
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -14,8 +23,43 @@ class UserSerializer(serializers.ModelSerializer):
             name=validated_data["name"],
             email=validated_data["email"],
             role=validated_data["role"],
+            tenant=validated_data.get("tenant"),
         )
         if password is not None:
             user.set_password(password)
         user.save()
         return user
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Embebe rol/flags/colegio y el sello auth_version en el token."""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        for claim, value in user_claims(user).items():
+            token[claim] = value
+        return token
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Al refrescar se vuelven a leer los claims del usuario: el access nuevo
+    lleva el sello vigente aunque el refresh sea anterior al cambio.
+    """
+
+    def validate(self, attrs):
+        refresh = RefreshToken(attrs["refresh"])
+        if revocation_list.is_revoked(refresh.get(api_settings.JTI_CLAIM)):
+            raise InvalidToken("El token fue revocado")
+        data = super().validate(attrs)
+        refresh = RefreshToken(data.get("refresh", attrs["refresh"]), verify=False)
+        user = User.objects.filter(
+            **{api_settings.USER_ID_FIELD: refresh[api_settings.USER_ID_CLAIM]}
+        ).first()
+        if user is not None:
+            access = refresh.access_token
+            for claim, value in user_claims(user).items():
+                access[claim] = value
+            data["access"] = str(access)
+        return data
@@ -0,0 +1,79 @@
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from academics.models import Teacher
+from core.cache import tenant_cache
+
+from .models import User
+from .tokens import CLAIM_FIELDS, _version_key, bump_auth_version
+
+# Vincular/desvincular un Teacher cambia el teacher_id de accounts/permsets.py
+tenant_cache.watch(Teacher)
+
+# Cambios que dejan obsoletos los claims ya emitidos
+TRACKED_FIELDS = ("is_active", *CLAIM_FIELDS)
+
+
+def _snapshot(instance):
+    # __dict__ y no getattr: no forzar la carga de campos diferidos
+    return {f: instance.__dict__.get(f) for f in TRACKED_FIELDS}
+
+
+@receiver(post_init, sender=User)
+def remember_auth_fields(sender, instance, **kwargs):
+    instance._auth_snapshot = _snapshot(instance)
+
+
+@receiver(post_save, sender=User)
+def bump_on_auth_change(sender, instance, created, **kwargs):
+    current = _snapshot(instance)
+    if not created and any(
+        current[f] != old for f, old in instance._auth_snapshot.items() if f in instance.__dict__
+    ):
+        bump_auth_version(instance.pk)
+    instance._auth_snapshot = current
+
+
+@receiver(post_delete, sender=User)
+def forget_auth_version(sender, instance, **kwargs):
+    cache.delete(_version_key(instance.pk))
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def bump_on_user_m2m(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear" and reverse:
+        # Desde el grupo/permiso: tras el clear ya no sabemos a quién afectó
+        instance._cleared_users = list(
+            sender.objects.filter(**_reverse_filter(instance)).values_list("user_id", flat=True)
+        )
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        bump_auth_version(instance.pk)
+    elif action == "post_clear":
+        bump_auth_version(*getattr(instance, "_cleared_users", []))
+    else:
+        bump_auth_version(*(pk_set or []))
+
+
+def _reverse_filter(instance):
+    field = "group" if isinstance(instance, Group) else "permission"
+    return {f"{field}_id": instance.pk}
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def bump_on_group_permissions(sender, instance, action, reverse, pk_set, **kwargs):
+    """update_role_permissions: cambia los permisos de todos los usuarios del rol."""
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    groups = [instance.pk] if not reverse else list(pk_set or [])
+    if reverse and action == "post_clear":
+        return  # Permission.group_set.clear(): no ocurre en la app
+    user_ids = User.groups.through.objects.filter(group_id__in=groups).values_list(
+        "user_id", flat=True
+    )
+    bump_auth_version(*set(user_ids))
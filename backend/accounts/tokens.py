@@ -0,0 +1,84 @@
+"""
+Claims de autorización dentro del JWT y su sello de versión.
+
+user_claims() embebe en el token lo que las vistas y permisos leen de
+request.user (email, nombre, rol, flags, colegio) más "pv", el auth_version
+del usuario al emitirlo. user_from_claims() reconstruye el User sin consultar
+la base mientras "pv" siga vigente; la versión vigente se lee del cache
+(una clave global por usuario, los usuarios no son por colegio) y solo ante un
+miss se consulta la columna. La clave vence a los AUTH_VERSION_CACHE_TTL
+segundos: aunque un bump no llegue al cache de otro proceso, un token viejo
+deja de valer en ese plazo.
+
+bump_auth_version() se llama desde accounts/signals.py cuando cambia algo que
+afecta a los claims o a los permisos.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+
+from .models import User
+
+# Campos del modelo que viajan en el token (orden = orden de los claims)
+CLAIM_FIELDS = ("email", "name", "role", "is_staff", "is_superuser", "tenant_id")
+VERSION_CLAIM = "pv"
+
+
+def _version_key(user_id):
+    return f"auth:v:{user_id}"
+
+
+def user_claims(user):
+    claims = {field: getattr(user, field) for field in CLAIM_FIELDS}
+    claims[VERSION_CLAIM] = user.auth_version
+    return claims
+
+
+def current_version(user_id):
+    version = cache.get(_version_key(user_id))
+    if version is None:
+        version = (
+            User.objects.filter(pk=user_id, is_active=True)
+            .values_list("auth_version", flat=True)
+            .first()
+        )
+        if version is None:
+            return None  # borrado o desactivado: el token no sirve
+        cache.set(
+            _version_key(user_id), version, timeout=getattr(settings, "AUTH_VERSION_CACHE_TTL", 60)
+        )
+    return version
+
+
+def bump_auth_version(*user_ids):
+    if not user_ids:
+        return
+    User.objects.filter(pk__in=user_ids).update(auth_version=F("auth_version") + 1)
+    # El próximo current_version() relee la columna ya incrementada
+    cache.delete_many([_version_key(pk) for pk in user_ids])
+
+
+_LOADED_FIELDS = [
+    f.attname
+    for f in User._meta.concrete_fields
+    if f.attname in ("id", "is_active", "auth_version", *CLAIM_FIELDS)
+]
+
+
+def user_from_claims(payload, user_id):
+    """
+    User construido desde el token, o None si el sello no está vigente. Es una
+    instancia con campos diferidos: las FKs a request.user funcionan y leer un
+    campo no incluido (p. ej. password) lo carga bajo demanda; save() solo
+    escribe los campos cargados.
+    """
+    version = payload.get(VERSION_CLAIM)
+    if version is None or any(field not in payload for field in CLAIM_FIELDS):
+        return None
+    if version != current_version(user_id):
+        return None
+
+    values = {"id": user_id, "is_active": True, "auth_version": version}
+    values.update({field: payload[field] for field in CLAIM_FIELDS})
+    return User.from_db("default", _LOADED_FIELDS, [values[f] for f in _LOADED_FIELDS])
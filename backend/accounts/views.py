@@ -11,7 +11,21 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.contrib.auth.models import Group, Permission
 from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
 from .models import User
+from tenants.quotas import enforce_quota, request_tenant
+from .tokens import user_claims, user_from_claims
+from .bulk_import import ImportFormatError, import_users, parse_rows
+from .login import LoginBusy, averify_password, client_ip, login_attempts
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+import json
+import uuid
+from django.utils import timezone
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import UntypedToken
+from .revocation import revocation_list
 
 import datetime
 
@@ -22,44 +36,111 @@ class SignUpView(APIView):
     def post(self, request):
         serializer = UserSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        tenant = request_tenant(request)
+        with transaction.atomic():  # enforce_quota() bloquea el contador hasta el alta
+            enforce_quota(tenant, "users")
+            serializer.save(tenant=tenant)
 
-        payload = {
-            "id": serializer.data["id"],
-            "exp": datetime.datetime.utcnow() + datetime.timedelta(minutes=60),
-        }
-
-        token = jwt.encode(payload, "secret", algorithm="HS256")
+        token = _login_token(serializer.instance)
         response = Response()
         response.set_cookie(key="jwt", value=token, httponly=True)
         response.data = serializer.data
         return response
 
 
+def _login_token(user):
+    payload = {
+        "id": user.id,
+        "exp": datetime.datetime.utcnow() + datetime.timedelta(minutes=60),
+        "jti": uuid.uuid4().hex,  # para poder revocarlo en el logout
+        **user_claims(user),
+    }
+    return jwt.encode(payload, "secret", algorithm="HS256")
+
+
 class LoginView(APIView):
     def post(self, request):
         email = request.data["email"]
         password = request.data["password"]
 
+        ip = client_ip(request)
+        wait = login_attempts.blocked_for(ip)
+        if wait:
+            return Response(
+                {"detail": f"Demasiados intentos fallidos, reintenta en {wait}s"},
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers={"Retry-After": str(wait)},
+            )
+
         user = User.objects.filter(email=email).first()
 
         if user is None:
+            login_attempts.fail(ip)
             raise AuthenticationFailed("User not found!")
         if not user.check_password(password):
+            login_attempts.fail(ip)
             raise AuthenticationFailed("Incorrect password!")
+        login_attempts.reset(ip)
 
-        payload = {
-            "id": user.id,
-            "exp": datetime.datetime.utcnow() + datetime.timedelta(minutes=60),
-        }
-
-        token = jwt.encode(payload, "secret", algorithm="HS256")
+        token = _login_token(user)
         response = Response()
         response.set_cookie(key="jwt", value=token, httponly=True)
         response.data = {"jwt": token}
         return response
 
 
+@csrf_exempt
+async def async_login(request):
+    """
+    Login para ASGI: la verificación PBKDF2 corre en un executor acotado
+    (accounts/login.py) y el event loop sigue atendiendo otras requests.
+    POST /api/auth/login/async  {"email": ..., "password": ...}
+    Rehashea al costo configurado (PASSWORD_PBKDF2_ITERATIONS) si cambió.
+    """
+    if request.method != "POST":
+        return JsonResponse({"detail": "Método no permitido"}, status=405)
+
+    ip = client_ip(request)
+    wait = login_attempts.blocked_for(ip)
+    if wait:
+        return JsonResponse(
+            {"detail": f"Demasiados intentos fallidos, reintenta en {wait}s"},
+            status=429,
+            headers={"Retry-After": str(wait)},
+        )
+
+    try:
+        data = json.loads(request.body or b"{}")
+        email, password = data["email"], data["password"]
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse({"detail": "email y password son obligatorios"}, status=400)
+
+    user = await User.objects.filter(email=email).afirst()
+    if user is None:
+        login_attempts.fail(ip)
+        return JsonResponse({"detail": "User not found!"}, status=401)
+
+    try:
+        is_correct, new_hash = await averify_password(password, user.password)
+    except LoginBusy:
+        return JsonResponse(
+            {"detail": "Servidor ocupado, reintenta"}, status=503, headers={"Retry-After": "1"}
+        )
+    if not is_correct:
+        login_attempts.fail(ip)
+        return JsonResponse({"detail": "Incorrect password!"}, status=401)
+    login_attempts.reset(ip)
+
+    if new_hash:
+        user.password = new_hash
+        await user.asave(update_fields=["password"])
+
+    token = _login_token(user)
+    response = JsonResponse({"jwt": token})
+    response.set_cookie(key="jwt", value=token, httponly=True)
+    return response
+
+
 class UserView(APIView):
     def get(self, request):
         token = request.COOKIES.get("jwt")
@@ -71,14 +152,55 @@ class UserView(APIView):
             payload = jwt.decode(token, "secret", algorithms=["HS256"])
         except jwt.ExpiredSignatureError:
             raise AuthenticationFailed("Unauthenticated!")
+        if revocation_list.is_revoked(payload.get("jti")):
+            raise AuthenticationFailed("Unauthenticated!")
 
-        user = User.objects.filter(id=payload["id"]).first()
+        # Con el sello vigente los claims bastan; si no, se lee de la base
+        user = user_from_claims(payload, payload["id"])
+        if user is None:
+            user = User.objects.filter(id=payload["id"]).first()
         serializer = UserSerializer(user)
         return Response(serializer.data)
 
 
+def _revoke(jti, exp, user_id):
+    if jti and exp:
+        expires_at = datetime.datetime.fromtimestamp(exp, tz=datetime.timezone.utc)
+        if expires_at > timezone.now():
+            revocation_list.revoke(jti, expires_at, user_id)
+
+
 class LogoutView(APIView):
+    """
+    Borra la cookie y revoca los tokens presentados para que no sigan siendo
+    válidos hasta su expiración: cookie "jwt", Bearer del header y
+    "refresh" del body (si vienen).
+    """
+
     def post(self, request):
+        cookie = request.COOKIES.get("jwt")
+        if cookie:
+            try:
+                payload = jwt.decode(cookie, "secret", algorithms=["HS256"])
+                _revoke(payload.get("jti"), payload.get("exp"), payload.get("id"))
+            except jwt.InvalidTokenError:
+                pass
+
+        header = request.META.get("HTTP_AUTHORIZATION", "").split()
+        raw_tokens = [header[1]] if len(header) == 2 else []
+        if request.data.get("refresh"):
+            raw_tokens.append(request.data["refresh"])
+        for raw in raw_tokens:
+            try:
+                token = UntypedToken(raw)
+            except TokenError:
+                continue
+            _revoke(
+                token.get(api_settings.JTI_CLAIM),
+                token.get("exp"),
+                token.get(api_settings.USER_ID_CLAIM),
+            )
+
         response = Response()
         response.delete_cookie("jwt")
         response.data = {"message": "success"}
@@ -221,4 +343,34 @@ def update_role_permissions(request, role):
             "assigned_permissions": list(permissions.values('id', 'codename', 'name'))
         })
     except Exception as e:
-        return Response({"error": str(e)}, status=400)
\ No newline at end of file
+        return Response({"error": str(e)}, status=400)
+
+
+@api_view(['POST'])
+@permission_classes([IsTenantAdminPermission])
+def bulk_import_users(request):
+    """
+    Alta masiva de usuarios del colegio.
+    POST /api/users/import
+    - multipart con "file" (.csv o .json), o JSON {"users": [{email, name, role, password}]}
+    - ?role=EST rol por defecto, ?dry_run=1 solo valida
+    """
+    upload = request.FILES.get("file")
+    try:
+        if upload is not None:
+            fmt = "json" if upload.name.lower().endswith(".json") else "csv"
+            rows = parse_rows(upload.read(), fmt)
+        else:
+            rows = request.data.get("users", [])
+            if not isinstance(rows, list):
+                raise ImportFormatError("Se esperaba una lista de usuarios")
+    except (ImportFormatError, ValueError) as e:
+        return Response({"error": str(e)}, status=400)
+
+    report = import_users(
+        rows,
+        tenant=request_tenant(request),
+        default_role=request.query_params.get("role", "EST").upper(),
+        dry_run=request.query_params.get("dry_run") in ("1", "true"),
+    )
+    return Response(report, status=status.HTTP_201_CREATED if report["created"] else 200)
@@ -5,6 +5,27 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
+
+Login async: MIDDLEWARE incluye middlewares solo-sync (WhiteNoise, los de
+tenant), y con ellos Django ejecutaría la vista async en un hilo. Por eso
+LOGIN_ASYNC_PATH se atiende con un handler propio cuyo stack es async de
+punta a punta; el resto de rutas usa la aplicación normal.
+
+Ese stack es, en este orden, RequestMetricsMiddleware (aparece en
+/api/metrics como login_async), SecurityMiddleware (HSTS, redirección a
+SSL, cabeceras de seguridad), CorsMiddleware y accounts.views.async_login.
+Se saltan a propósito el resto de MIDDLEWARE, porque el login no los
+necesita:
+
+- el middleware de tenant: los usuarios viven en public;
+- WhiteNoise: no sirve estáticos;
+- sesiones, CSRF, auth y mensajes: la vista es csrf_exempt, responde un JWT
+  y no usa request.user ni la sesión;
+- Common y XFrameOptions: no hay redirecciones por barra final (la ruta se
+  compara sin ella) ni HTML que enmarcar.
+
+Si se agrega un middleware de seguridad a MIDDLEWARE, hay que evaluar
+sumarlo aquí.
 """
 
 import os
@@ -13,4 +34,43 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from corsheaders.middleware import CorsMiddleware  # noqa: E402
+from django.core.handlers.asgi import ASGIHandler  # noqa: E402
+from django.core.handlers.exception import convert_exception_to_response  # noqa: E402
+from django.middleware.security import SecurityMiddleware  # noqa: E402
+from django.urls import resolve  # noqa: E402
+
+from accounts.views import async_login  # noqa: E402
+from core.middleware import RequestMetricsMiddleware  # noqa: E402
+
+LOGIN_ASYNC_PATH = "/api/auth/login/async"
+# De adentro hacia afuera, como los construye BaseHandler.load_middleware()
+LOGIN_MIDDLEWARE = (CorsMiddleware, SecurityMiddleware, RequestMetricsMiddleware)
+
+
+async def _login_view(request):
+    # Sin resolución de URLs: el nombre de la ruta es para las métricas
+    request.resolver_match = resolve(LOGIN_ASYNC_PATH)
+    return await async_login(request)
+
+
+class AsyncLoginHandler(ASGIHandler):
+    def load_middleware(self, is_async=False):
+        self._view_middleware = []
+        self._template_response_middleware = []
+        self._exception_middleware = []
+        handler = convert_exception_to_response(_login_view)
+        for middleware in LOGIN_MIDDLEWARE:
+            handler = convert_exception_to_response(middleware(handler))
+        self._middleware_chain = handler
+
+
+login_application = AsyncLoginHandler()
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "http" and scope["path"].rstrip("/") == LOGIN_ASYNC_PATH:
+        return await login_application(scope, receive, send)
+    return await django_application(scope, receive, send)
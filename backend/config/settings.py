@@ -5,6 +5,7 @@ Arquitectura SaaS multi-tenant con Django Tenants + DRF + JWT.
 
 from pathlib import Path
 import environ
+from django.core.exceptions import ImproperlyConfigured
 
 # ---------- django-environ ----------
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -31,6 +32,7 @@ SHARED_APPS = [
     "django.contrib.admin",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",  # búsqueda trigram (academics/search.py)
     # terceros
     "corsheaders",
     "rest_framework",
@@ -52,8 +54,16 @@ TENANT_APPS = [
 INSTALLED_APPS = SHARED_APPS + TENANT_APPS
 
 # ========== Middleware ==========
+# Resolución de tenant: "fixed" (dev, un colegio por defecto) o "host" (prod, por dominio)
+TENANT_ROUTING = env("TENANT_ROUTING", default="fixed")
+TENANT_MIDDLEWARES = {
+    "fixed": "tenants.middleware_fixed.FixedTenantDevMiddleware",
+    "host": "tenants.middleware_host.HostTenantMiddleware",
+}
+
 MIDDLEWARE = [
-    "tenants.middleware_fixed.FixedTenantDevMiddleware",
+    TENANT_MIDDLEWARES[TENANT_ROUTING],
+    "core.middleware.RequestMetricsMiddleware",  # latencia/queries por tenant
     # "django_tenants.middleware.main.TenantMainMiddleware",  # primero
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",  # estáticos en contenedor
@@ -70,6 +80,10 @@ ROOT_URLCONF = "config.urls"
 WSGI_APPLICATION = "config.wsgi.application"
 ASGI_APPLICATION = "config.asgi.application"
 
+# Métricas por request (core/metrics.py, expuestas en /api/metrics)
+REQUEST_METRICS_ENABLED = env.bool("REQUEST_METRICS_ENABLED", default=True)
+REQUEST_METRICS_WINDOW = env.int("REQUEST_METRICS_WINDOW", default=1000)
+
 # ========== Base de datos (Postgres + tenants) ==========
 DATABASES = {
     "default": {
@@ -81,6 +95,14 @@ DATABASES = {
         "PORT": env("POSTGRES_PORT"),  # 5432
     }
 }
+# Pool de conexiones reutilizadas entre tenants (tenants/postgresql_backend)
+if env.bool("DB_POOL", default=False):
+    DATABASES["default"]["ENGINE"] = "tenants.postgresql_backend"
+    DATABASES["default"]["POOL"] = {
+        "MAX_SIZE": env.int("DB_POOL_MAX_SIZE", default=10),  # por proceso
+        "TIMEOUT": env.float("DB_POOL_TIMEOUT", default=5.0),  # espera máx. por una libre
+        "MAX_AGE": env.int("DB_POOL_MAX_AGE", default=1800),  # recicla conexiones viejas
+    }
 DATABASE_ROUTERS = ("django_tenants.routers.TenantSyncRouter",)
 TENANT_MODEL = "tenants.Client"
 TENANT_DOMAIN_MODEL = "tenants.Domain"
@@ -89,9 +111,62 @@ PUBLIC_SCHEMA_URLCONF = "config.public_urls"
 TENANT_NOT_FOUND_EXCEPTION = (
     False  # ⬅️ NUEVO: fallback a public_urls cuando no hay tenant
 )
+# Cada cuánto revisa un worker si otro proceso cambió Client/Domain (tenants/cache.py)
+TENANT_CACHE_SYNC_SECONDS = env.int("TENANT_CACHE_SYNC_SECONDS", default=2)
+# Alta de colegios clonando un esquema plantilla ya migrado (tenants/provisioning.py)
+TENANT_CLONE_PROVISIONING = env.bool("TENANT_CLONE_PROVISIONING", default=True)
+TENANT_TEMPLATE_SCHEMA = env("TENANT_TEMPLATE_SCHEMA", default="tenant_template")
+# Procesos para manage.py migrate_tenants
+TENANT_MIGRATION_WORKERS = env.int("TENANT_MIGRATION_WORKERS", default=4)
+# Analítica entre colegios (tenants/analytics.py): hilos/conexiones simultáneas y TTL
+ANALYTICS_MAX_WORKERS = env.int("ANALYTICS_MAX_WORKERS", default=8)
+ANALYTICS_CACHE_TTL = env.int("ANALYTICS_CACHE_TTL", default=300)
+ANALYTICS_CACHE_MAX_ENTRIES = env.int("ANALYTICS_CACHE_MAX_ENTRIES", default=128)
+# Archivo en frío de colegios inactivos (manage.py archive_tenant / restore_tenant)
+TENANT_ARCHIVE_DIR = env("TENANT_ARCHIVE_DIR", default=str(BASE_DIR / "archives"))
+
+# ========== Caché (core/cache.py antepone el esquema a cada clave) ==========
+# locmem: por proceso (dev). file: compartido entre workers de gunicorn, así
+# los contadores de versión invalidan en todos los procesos (prod).
+# Con MAX_ENTRIES se expulsa 1/CULL_FREQUENCY de las entradas; las versiones
+# de core/cache.py toleran la expulsión (invalida, no revive) pero conviene
+# que el límite deje entrar las respuestas de todos los colegios.
+CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+}
+CACHE_BACKEND = env("CACHE_BACKEND", default="locmem")
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKENDS[CACHE_BACKEND],
+        "LOCATION": env(
+            "CACHE_LOCATION",
+            default=str(BASE_DIR / "cache") if CACHE_BACKEND == "file" else "sgac",
+        ),
+        "TIMEOUT": env.int("CACHE_TIMEOUT", default=300),
+        "OPTIONS": {
+            "MAX_ENTRIES": env.int("CACHE_MAX_ENTRIES", default=20000),
+            "CULL_FREQUENCY": env.int("CACHE_CULL_FREQUENCY", default=4),
+        },
+    }
+}
+# Con locmem y varios workers, un cambio de rol/desactivación (accounts/tokens.py)
+# o una versión de core/cache.py solo se vería en el proceso que lo hizo
+if CACHE_BACKEND == "locmem" and env.int("GUNICORN_WORKERS", default=1) > 1:
+    raise ImproperlyConfigured(
+        "CACHE_BACKEND=locmem es por proceso: con GUNICORN_WORKERS > 1 usa CACHE_BACKEND=file"
+    )
+# Vigencia del auth_version cacheado (accounts/tokens.py): tope por si el cache
+# de un proceso no vio el bump_auth_version() hecho en otro
+AUTH_VERSION_CACHE_TTL = env.int("AUTH_VERSION_CACHE_TTL", default=60)
+
+# Procesos para hashear passwords en la importación masiva (accounts/bulk_import.py)
+USER_IMPORT_WORKERS = env.int("USER_IMPORT_WORKERS", default=0) or None  # None = núcleos
 
 # Usuario personalizado
 AUTH_USER_MODEL = "accounts.User"
+# has_perm()/get_all_permissions() desde el conjunto precalculado (accounts/permsets.py)
+AUTHENTICATION_BACKENDS = ["accounts.permsets.CachedPermissionBackend"]
 
 # ========== Templates ==========
 TEMPLATES = [
@@ -113,15 +188,48 @@ TEMPLATES = [
 # ========== DRF / JWT / OpenAPI ==========
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # Usuario desde los claims del token, sin SELECT por request (accounts/tokens.py)
+        "accounts.authentication.StatelessJWTAuthentication",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
+# Paginación keyset de los listados de academics (academics/pagination.py)
+API_PAGE_SIZE = env.int("API_PAGE_SIZE", default=50)
+API_MAX_PAGE_SIZE = env.int("API_MAX_PAGE_SIZE", default=500)
+SIMPLE_JWT = {
+    "TOKEN_OBTAIN_SERIALIZER": "accounts.serializers.ClaimsTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "accounts.serializers.ClaimsTokenRefreshSerializer",
+}
 SPECTACULAR_SETTINGS = {
     "TITLE": "SGAC SaaS API",
     "VERSION": "0.1",
 }
 
+# Passwords: PBKDF2 con costo configurable; cambiarlo rehashea en el siguiente login
+PASSWORD_PBKDF2_ITERATIONS = env.int("PASSWORD_PBKDF2_ITERATIONS", default=0) or None
+PASSWORD_HASHERS = [
+    "accounts.hashers.ConfigurablePBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+# Login (accounts/login.py): hilos de verificación, cola máxima e intentos por IP
+LOGIN_HASH_WORKERS = env.int("LOGIN_HASH_WORKERS", default=0) or None  # None = núcleos
+LOGIN_MAX_PENDING = env.int("LOGIN_MAX_PENDING", default=64)
+LOGIN_MAX_FAILURES = env.int("LOGIN_MAX_FAILURES", default=10)
+LOGIN_FAILURE_WINDOW = env.int("LOGIN_FAILURE_WINDOW", default=300)
+# Proxies propios delante de Django (nginx, balanceador): la IP del cliente es
+# la entrada N de X-Forwarded-For contando desde la derecha; 0 = REMOTE_ADDR
+LOGIN_TRUSTED_PROXIES = env.int("LOGIN_TRUSTED_PROXIES", default=0)
+
+# Revocación de JWT (accounts/revocation.py): filtro Bloom por proceso
+REVOCATION_BLOOM_CAPACITY = env.int("REVOCATION_BLOOM_CAPACITY", default=100_000)
+REVOCATION_BLOOM_ERROR_RATE = env.float("REVOCATION_BLOOM_ERROR_RATE", default=0.001)
+REVOCATION_REFRESH_SECONDS = env.int("REVOCATION_REFRESH_SECONDS", default=5)
+# Relectura hacia atrás por revoked_at: cubre transacciones que confirman tarde
+REVOCATION_REFRESH_OVERLAP = env.int("REVOCATION_REFRESH_OVERLAP", default=60)
+
 # Validadores
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -0,0 +1,132 @@
+"""
+Caché por colegio sobre el cache de Django (settings.CACHES).
+
+Todas las claves pasan por tenant_key(), que antepone connection.schema_name:
+dos colegios nunca comparten una entrada aunque pidan la misma URL.
+
+Invalidación por versiones: cada modelo tiene una versión por esquema
+("<schema>:v:<app_label.model>") que forma parte de la clave de las vistas
+cacheadas. Un save/delete del modelo la cambia y todas las entradas que
+dependían de ella quedan huérfanas (expiran por TTL) sin tener que listarlas.
+
+La versión es el instante del último cambio en nanosegundos, no un contador
+que arranca en 1: si el cache expulsa la clave (MAX_ENTRIES), la siguiente
+lectura guarda un valor nuevo en vez de volver a 0 o 1, así que una entrada
+vieja nunca revive; a lo sumo se invalida todo el modelo. Como es un
+instante, sirve también de Last-Modified (core/conditional.py).
+Las escrituras masivas (update(), bulk_create) no emiten señales: quien las
+haga debe llamar a tenant_cache.bump(Model).
+"""
+
+import time
+from functools import wraps
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from rest_framework.response import Response
+
+
+def tenant_key(*parts):
+    return ":".join([connection.schema_name, *map(str, parts)])
+
+
+def _label(model):
+    return model._meta.label_lower
+
+
+class TenantCache:
+    def __init__(self, backend=cache):
+        self.backend = backend
+        self._watched = set()
+
+    # --- acceso con clave por tenant ---
+    def get(self, key, default=None):
+        return self.backend.get(tenant_key(key), default)
+
+    def set(self, key, value, timeout=None):
+        kwargs = {} if timeout is None else {"timeout": timeout}
+        self.backend.set(tenant_key(key), value, **kwargs)
+
+    def delete(self, key):
+        self.backend.delete(tenant_key(key))
+
+    def get_or_set(self, key, default, timeout=None):
+        kwargs = {} if timeout is None else {"timeout": timeout}
+        return self.backend.get_or_set(tenant_key(key), default, **kwargs)
+
+    # --- versiones por modelo ---
+    def version(self, *models):
+        """Tupla de versiones actuales (una lectura para todos los modelos)."""
+        keys = [tenant_key("v", _label(m)) for m in models]
+        found = self.backend.get_many(keys)
+        for key in keys:
+            if key not in found:  # nunca escrita o expulsada: versión nueva
+                self.backend.add(key, time.time_ns(), timeout=None)
+                found[key] = self.backend.get(key, 0)
+        return tuple(found[k] for k in keys)
+
+    def bump(self, *models):
+        # Sin timeout: la versión solo debe cambiar con las escrituras
+        now = time.time_ns()
+        self.backend.set_many({tenant_key("v", _label(m)): now for m in models}, timeout=None)
+
+    def watch(self, *models):
+        """Conecta save/delete (y m2m) de los modelos a bump()."""
+        for model in models:
+            if model in self._watched:
+                continue
+            self._watched.add(model)
+            uid = f"tenant_cache:{_label(model)}"
+            post_save.connect(self._on_change, sender=model, dispatch_uid=uid, weak=False)
+            post_delete.connect(self._on_change, sender=model, dispatch_uid=uid, weak=False)
+            for field in model._meta.local_many_to_many:
+                m2m_changed.connect(
+                    self._on_change, sender=field.remote_field.through,
+                    dispatch_uid=f"{uid}:{field.name}", weak=False,
+                )
+
+    def _on_change(self, sender, instance=None, **kwargs):
+        model = type(instance) if instance is not None else sender
+        self.bump(model._meta.concrete_model)
+
+
+tenant_cache = TenantCache()
+
+
+def cache_tenant_view(models, timeout=None):
+    """
+    Cachea la respuesta (response.data) de un GET de DRF por tenant + ruta +
+    query string + versiones de `models`. Decora get()/list(): DRF ya aplicó
+    autenticación y permisos antes, así que solo sirve para vistas cuya
+    respuesta no depende del usuario. La clave sirve también de ETag: un
+    If-None-Match vigente recibe 304 sin leer el cache (core/conditional.py).
+    """
+    from .conditional import make_etag, not_modified, set_validators  # evita import circular
+
+    tenant_cache.watch(*models)
+
+    def decorator(method):
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            query = request.GET.urlencode()
+            versions = ".".join(map(str, tenant_cache.version(*models)))
+            key = f"view:{request.path}:{query}:{versions}"
+            etag = make_etag(tenant_key(key))
+            response = not_modified(request, etag)
+            if response is not None:
+                return response
+
+            data = tenant_cache.get(key)
+            if data is not None:
+                return set_validators(Response(data, headers={"X-Cache": "HIT"}), etag)
+
+            response = method(view, request, *args, **kwargs)
+            if response.status_code == 200:
+                tenant_cache.set(key, response.data, timeout)
+                response["X-Cache"] = "MISS"
+            return set_validators(response, etag)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,87 @@
+"""
+GET condicional (ETag / Last-Modified) para vistas DRF.
+
+Los clientes (React, app móvil) sondean los listados todo el tiempo. Con
+estos validadores, si nada cambió se responde 304 sin serializar ni enviar el
+cuerpo:
+
+- ConditionalGetMixin (list/retrieve): el ETag sale, sin ninguna query, de
+  las versiones por colegio (core/cache.py) del modelo del queryset y de
+  `etag_models` (modelos cuyos datos aparecen en la respuesta vía
+  relaciones), de la URL completa y del usuario. Last-Modified es la versión
+  más reciente: cualquier save/delete la cambia, también los borrados, que un
+  MAX(updated_at) no detectaría.
+- cache_tenant_view (core/cache.py) usa las versiones de sus modelos para los
+  catálogos cacheados.
+
+Las respuestas llevan Cache-Control: private, no-cache para que el navegador
+revalide siempre y ningún proxy comparta entradas entre usuarios.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+from .cache import tenant_cache, tenant_key
+
+
+def make_etag(*parts):
+    digest = hashlib.blake2b(":".join(map(str, parts)).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def not_modified(request, etag, last_modified=None):
+    """HttpResponseNotModified si el cliente ya tiene esta versión, si no None."""
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    return get_conditional_response(request, etag=etag, last_modified=timestamp)
+
+
+def set_validators(response, etag, last_modified=None):
+    if response.status_code != 200:
+        return response
+    response["ETag"] = etag
+    if last_modified:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ["Authorization", "Cookie"])
+    return response
+
+
+class ConditionalGetMixin:
+    etag_models = ()
+
+    @classmethod
+    def version_models(cls):
+        """Modelo del queryset + etag_models, sin repetidos."""
+        queryset = getattr(cls, "queryset", None)
+        models = (queryset.model,) if queryset is not None else ()
+        return tuple(dict.fromkeys(models + tuple(cls.etag_models)))
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Las señales se conectan al importar: todas las escrituras suben versión
+        tenant_cache.watch(*cls.version_models())
+
+    def get_validators(self):
+        versions = tenant_cache.version(*self.version_models())
+        last_modified = datetime.fromtimestamp(max(versions) / 1e9, tz=timezone.utc)
+        user = self.request.user
+        etag = make_etag(
+            tenant_key(self.request.get_full_path()), getattr(user, "pk", ""), *versions
+        )
+        return etag, last_modified
+
+    def _conditional(self, handler, request, *args, **kwargs):
+        etag, last_modified = self.get_validators()
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+        return set_validators(handler(request, *args, **kwargs), etag, last_modified)
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional(super().retrieve, request, *args, **kwargs)
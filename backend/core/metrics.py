@@ -0,0 +1,85 @@
+"""
+Agregador en memoria de métricas por request, etiquetadas por tenant.
+
+Para cada (schema, url_name) guarda contadores acumulados y una ventana
+rodante de las últimas N latencias (deque de tamaño fijo: append O(1)).
+Los percentiles se calculan solo al leer (endpoint /api/metrics), así el
+costo en el camino de la request es un par de sumas y un append.
+"""
+
+import threading
+from collections import deque
+
+from django.conf import settings
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    idx = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+class _Series:
+    __slots__ = ("count", "errors", "queries", "db_ms", "total_ms", "window")
+
+    def __init__(self, window):
+        self.count = 0
+        self.errors = 0
+        self.queries = 0
+        self.db_ms = 0.0
+        self.total_ms = 0.0
+        self.window = deque(maxlen=window)
+
+
+class RequestMetrics:
+    def __init__(self, window=None):
+        self.window = window or getattr(settings, "REQUEST_METRICS_WINDOW", 1000)
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def record(self, schema, route, status, elapsed_ms, queries, db_ms):
+        key = (schema, route)
+        series = self._series.get(key)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(key, _Series(self.window))
+        series.count += 1
+        series.errors += status >= 500
+        series.queries += queries
+        series.db_ms += db_ms
+        series.total_ms += elapsed_ms
+        series.window.append(elapsed_ms)
+
+    def snapshot(self, schema=None):
+        rows = []
+        for (series_schema, route), series in list(self._series.items()):
+            if schema and series_schema != schema:
+                continue
+            latencies = sorted(series.window)
+            count = series.count or 1
+            rows.append({
+                "schema": series_schema,
+                "route": route,
+                "count": series.count,
+                "errors": series.errors,
+                "avg_ms": round(series.total_ms / count, 3),
+                "p50_ms": _round(_percentile(latencies, 50)),
+                "p95_ms": _round(_percentile(latencies, 95)),
+                "p99_ms": _round(_percentile(latencies, 99)),
+                "avg_queries": round(series.queries / count, 2),
+                "avg_db_ms": round(series.db_ms / count, 3),
+            })
+        rows.sort(key=lambda r: (r["schema"], -r["count"]))
+        return rows
+
+    def reset(self):
+        with self._lock:
+            self._series = {}
+
+
+def _round(value):
+    return None if value is None else round(value, 3)
+
+
+request_metrics = RequestMetrics()
@@ -0,0 +1,92 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connection
+
+from .metrics import request_metrics
+
+
+class _QueryCounter:
+    """execute_wrapper: cuenta queries y tiempo de BD de la request actual."""
+
+    __slots__ = ("queries", "db_ms")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_ms = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_ms += (time.perf_counter() - started) * 1000
+
+
+def _start_counting(counter):
+    connection.execute_wrappers.append(counter)
+    return connection.schema_name
+
+
+def _stop_counting(counter):
+    connection.execute_wrappers.remove(counter)
+
+
+class RequestMetricsMiddleware:
+    """
+    Mide cada request (tiempo total, nº de queries, tiempo en BD) y lo agrega
+    por connection.schema_name + nombre de la URL en core.metrics.
+    Debe ir justo después del middleware de tenant para ver el schema activo.
+
+    También sirve en cadenas async (config/asgi.py): ahí las queries corren en
+    el hilo de sync_to_async de la request (thread_sensitive, uno por request)
+    y el contador se instala en la conexión de ese hilo.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, "REQUEST_METRICS_ENABLED", True)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        counter = _QueryCounter()
+        schema = connection.schema_name
+        started = time.perf_counter()
+        with connection.execute_wrapper(counter):
+            response = self.get_response(request)
+        self._record(request, response, schema, started, counter)
+        return response
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        counter = _QueryCounter()
+        schema = await sync_to_async(_start_counting)(counter)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(_stop_counting)(counter)
+        self._record(request, response, schema, started, counter)
+        return response
+
+    def _record(self, request, response, schema, started, counter):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        match = request.resolver_match
+        route = (match.url_name or match.route) if match else "unresolved"
+        request_metrics.record(
+            schema, route, response.status_code, elapsed_ms, counter.queries, counter.db_ms
+        )
@@ -1,8 +1,10 @@
 # backend/core/urls.py
 from django.urls import path
-from .views import health, tenant_health
+from .views import health, tenant_health, metrics, db_pool
 
 urlpatterns = [
     path("health", health, name="public-health"),
     path("tenant/health", tenant_health, name="tenant-health"),
+    path("metrics", metrics, name="metrics"),
+    path("db-pool", db_pool, name="db-pool"),
 ]
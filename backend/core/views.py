@@ -1,9 +1,14 @@
 # backend/core/views.py
 from django.db import connection
+from django_tenants.utils import get_public_schema_name
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 
+from tenants.postgresql_backend.pool import pool_stats
+
+from .metrics import request_metrics
+
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def health(request):
@@ -30,3 +35,30 @@ def tenant_health(request):
         "user": getattr(user, "email", None),
         "is_staff": getattr(user, "is_staff", False),
     })
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def metrics(request):
+    """
+    Métricas por tenant y ruta del proceso actual (para scraping).
+    p50/p95/p99 sobre las últimas REQUEST_METRICS_WINDOW requests.
+    Todos los colegios solo para superusuarios en public (filtro opcional
+    ?schema=<schema_name>); el staff de un colegio ve solo su esquema.
+    """
+    if request.user.is_superuser and connection.schema_name == get_public_schema_name():
+        schema = request.query_params.get("schema")
+    else:
+        schema = connection.schema_name
+    return Response({
+        "window": request_metrics.window,
+        "series": request_metrics.snapshot(schema=schema),
+    })
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def db_pool(request):
+    """
+    Estado del pool de conexiones del proceso actual (DB_POOL=1).
+    Vacío si el pool está desactivado o aún no se abrió ninguna conexión.
+    """
+    return Response({"pools": pool_stats()})
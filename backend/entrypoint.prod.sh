@@ -3,6 +3,8 @@ set -euo pipefail
 
 POSTGRES_HOST="${POSTGRES_HOST:-db}"
 POSTGRES_PORT="${POSTGRES_PORT:-5432}"
+# settings.py lo lee para rechazar un cache por proceso con varios workers
+export GUNICORN_WORKERS="${GUNICORN_WORKERS:-3}"
 
 echo "Esperando a PostgreSQL en ${POSTGRES_HOST}:${POSTGRES_PORT}..."
 for i in $(seq 1 "${DB_MAX_RETRIES:-30}"); do
@@ -29,10 +31,25 @@ python manage.py migrate_schemas --shared --noinput
 
 # Si ya tienes tenants creados y quieres correr migraciones por tenant:
 if [ "${TENANT_MIGRATIONS:-1}" = "1" ]; then
-  echo "Aplicando migraciones de tenants (django-tenants: --tenant)..."
-  python manage.py migrate_schemas --tenant --noinput
+  echo "Aplicando migraciones de tenants en paralelo (reanudable)..."
+  python manage.py migrate_tenants --workers "${TENANT_MIGRATION_WORKERS:-4}"
 fi
 
+# search_text (academics/search.py) de las filas creadas antes del campo o
+# por bulk_create; solo reescribe las que cambiaron (REINDEX_SEARCH=0 lo salta)
+if [ "${REINDEX_SEARCH:-1}" = "1" ]; then
+  echo "Completando search_text de personas, estudiantes y docentes..."
+  python manage.py reindex_search
+fi
+
+# Usuarios anteriores a User.tenant y contadores de cuota (tenants/quotas.py)
+echo "Asignando colegio a usuarios sin colegio y recalculando cuotas..."
+python manage.py reconcile_tenant_usage
+
+# Plantilla para el alta de colegios por clonado (tenants/provisioning.py)
+echo "Preparando esquema plantilla de tenants..."
+python manage.py prepare_tenant_template
+
 # collectstatic en prod (puedes desactivar con COLLECT_STATIC=0)
 if [ "${COLLECT_STATIC:-1}" = "1" ]; then
   echo "Ejecutando collectstatic..."
@@ -1,5 +1,12 @@
 from django.contrib import admin
-from .models import Plan, Client, Domain
+from .models import (
+    Plan,
+    Client,
+    Domain,
+    TenantArchive,
+    TenantMigrationState,
+    TenantUsage,
+)
 
 
 @admin.register(Plan)
@@ -37,3 +44,23 @@ class ClientAdmin(admin.ModelAdmin):
 class DomainAdmin(admin.ModelAdmin):
     list_display = ("id", "domain", "tenant", "is_primary")
     search_fields = ("domain",)
+
+
+@admin.register(TenantUsage)
+class TenantUsageAdmin(admin.ModelAdmin):
+    list_display = ("tenant", "users", "students", "reconciled_at")
+    search_fields = ("tenant__schema_name",)
+
+
+@admin.register(TenantMigrationState)
+class TenantMigrationStateAdmin(admin.ModelAdmin):
+    list_display = ("schema_name", "status", "duration_ms", "target", "updated_at")
+    search_fields = ("schema_name",)
+    list_filter = ("status",)
+
+
+@admin.register(TenantArchive)
+class TenantArchiveAdmin(admin.ModelAdmin):
+    list_display = ("tenant", "archived_at", "restored_at", "tables", "rows", "size_bytes")
+    search_fields = ("tenant__schema_name", "path")
+    readonly_fields = ("sha256",)
@@ -0,0 +1,206 @@
+"""
+Analítica de plataforma: agregados por colegio ejecutados en paralelo.
+
+Cada agregado registrado recibe parámetros y devuelve un dict de contadores
+calculados dentro del esquema de un tenant. run_aggregate() reparte los
+esquemas entre un pool de hilos acotado: cada hilo recorre los suyos con
+schema_context sobre una sola conexión (SET search_path, sin reconectar) y
+la cierra al terminar. Los contadores se suman y el resultado se guarda con
+un TTL en un cache de a lo sumo ANALYTICS_CACHE_MAX_ENTRIES entradas.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.db import connection
+from django_tenants.utils import get_public_schema_name, schema_context
+
+from .models import Client
+
+
+@dataclass
+class Aggregate:
+    name: str
+    func: Callable
+    params: tuple = ()
+    finalize: Optional[Callable] = None
+    description: str = ""
+
+
+AGGREGATES = {}
+
+
+class InvalidParams(ValueError):
+    """Parámetros inválidos: se rechazan antes de recorrer los colegios."""
+
+    def __init__(self, errors):
+        super().__init__(errors)
+        self.errors = errors
+
+
+def _parse_date(value):
+    return date.fromisoformat(value).isoformat()
+
+
+# parámetro -> normalizador (ValueError si el valor no sirve)
+PARAM_PARSERS = {
+    "date": _parse_date,
+}
+
+
+def clean_params(aggregate, params):
+    """Valida y normaliza `params` para `aggregate`; InvalidParams con los errores."""
+    cleaned, errors = {}, {}
+    for key, value in (params or {}).items():
+        if key not in aggregate.params:
+            errors[key] = "Parámetro no soportado por este agregado"
+        elif value:
+            try:
+                cleaned[key] = PARAM_PARSERS.get(key, str)(value)
+            except ValueError:
+                errors[key] = f"Valor inválido: {value!r}"
+    if errors:
+        raise InvalidParams(errors)
+    return cleaned
+
+
+def register(name, params=(), finalize=None):
+    def decorator(func):
+        AGGREGATES[name] = Aggregate(
+            name=name,
+            func=func,
+            params=tuple(params),
+            finalize=finalize,
+            description=(func.__doc__ or "").strip(),
+        )
+        return func
+
+    return decorator
+
+
+# --- Agregados disponibles ---
+def _attendance_rate(totals):
+    total = totals.get("total", 0)
+    totals["rate"] = round(totals.get("present", 0) / total, 4) if total else None
+    return totals
+
+
+@register("active_enrollments")
+def active_enrollments():
+    """Matrículas con estado ACTIVE."""
+    from academics.models import Enrollment
+
+    return {"active": Enrollment.objects.filter(status="ACTIVE").count()}
+
+
+@register("attendance_rate", params=("date",), finalize=_attendance_rate)
+def attendance_rate(date=None):
+    """Asistencia del día (?date=YYYY-MM-DD, por defecto hoy): presentes + retrasos / total."""
+    from django.db.models import Count, Q
+    from academics.models import AttendanceRecord
+
+    day = date or _today()
+    row = AttendanceRecord.objects.filter(session__date=day).aggregate(
+        total=Count("id"),
+        present=Count("id", filter=Q(status__in=["PRESENTE", "RETRASO"])),
+    )
+    return {"total": row["total"], "present": row["present"]}
+
+
+def _today():
+    return date.today().isoformat()
+
+
+# --- Ejecución ---
+_cache = {}  # clave -> (vence, resultado), en orden de inserción
+_cache_lock = threading.Lock()
+
+
+def _cache_put(key, expires, result):
+    max_entries = getattr(settings, "ANALYTICS_CACHE_MAX_ENTRIES", 128)
+    now = time.monotonic()
+    with _cache_lock:
+        for stale in [k for k, (until, _) in _cache.items() if until <= now]:
+            del _cache[stale]
+        _cache.pop(key, None)
+        _cache[key] = (expires, result)
+        while len(_cache) > max_entries:
+            del _cache[next(iter(_cache))]  # el más viejo
+
+
+def _run_on_schema(aggregate, schema_name, params):
+    started = time.perf_counter()
+    try:
+        with schema_context(schema_name):
+            value, error = aggregate.func(**params), None
+    except Exception as exc:
+        value, error = None, str(exc)
+    return {
+        "schema": schema_name,
+        "value": value,
+        "error": error,
+        "ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+def _run_on_schemas(aggregate, schemas, params):
+    try:
+        return [_run_on_schema(aggregate, schema, params) for schema in schemas]
+    finally:
+        connection.close()  # conexión propia del hilo, una vez por lote
+
+
+def run_aggregate(name, params=None, use_cache=True):
+    aggregate = AGGREGATES[name]
+    params = clean_params(aggregate, params)
+    cache_key = (name, tuple(sorted(params.items())))
+    ttl = getattr(settings, "ANALYTICS_CACHE_TTL", 300)
+
+    now = time.monotonic()
+    if use_cache:
+        hit = _cache.get(cache_key)
+        if hit and hit[0] > now:
+            return {**hit[1], "cached": True}
+
+    schemas = list(
+        Client.objects.filter(is_active=True)
+        .exclude(schema_name=get_public_schema_name())
+        .values_list("schema_name", flat=True)
+    )
+    workers = max(1, min(getattr(settings, "ANALYTICS_MAX_WORKERS", 8), len(schemas) or 1))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        batches = pool.map(
+            lambda batch: _run_on_schemas(aggregate, batch, params),
+            [schemas[i::workers] for i in range(workers)],
+        )
+        order = {schema: n for n, schema in enumerate(schemas)}
+        per_tenant = sorted(
+            (row for batch in batches for row in batch), key=lambda row: order[row["schema"]]
+        )
+
+    totals = {}
+    for row in per_tenant:
+        for key, value in (row["value"] or {}).items():
+            totals[key] = totals.get(key, 0) + value
+    if aggregate.finalize:
+        totals = aggregate.finalize(totals)
+
+    result = {
+        "aggregate": name,
+        "params": params,
+        "tenants": len(schemas),
+        "errors": sum(1 for row in per_tenant if row["error"]),
+        "totals": totals,
+        "per_tenant": per_tenant,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        "workers": workers,
+    }
+    _cache_put(cache_key, now + ttl, result)
+    return {**result, "cached": False}
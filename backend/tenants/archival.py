@@ -0,0 +1,329 @@
+"""
+Archivo en frío de esquemas de colegios inactivos.
+
+archive_tenant() vuelca cada tabla del esquema con COPY ... TO STDOUT a un
+.tar.gz autodescriptivo:
+
+    manifest.json        versión de formato, colegio, migraciones aplicadas
+                         (el conjunto exacto y la hoja de cada app en el
+                         grafo), y por tabla: columnas, filas y bytes
+    data/<tabla>.copy    datos en formato texto de COPY (una fila por línea)
+
+Todo el volcado corre en una transacción que primero toma LOCK TABLE ... IN
+SHARE MODE sobre todas las tablas del esquema: las escrituras en curso
+terminan antes de empezar, las nuevas esperan, y todos los COPY ven el mismo
+estado (las FK entre tablas quedan consistentes). El DROP SCHEMA se hace en
+esa misma transacción, después de releer el archivo y comprobar el número de
+filas de cada tabla, así que nada escrito después del volcado se pierde. Con
+force=True (colegio activo) el esquema se conserva siempre.
+
+restore_tenant() recrea la estructura (clonando la plantilla si las
+migraciones coinciden, o migrando hasta las hojas archivadas si no), carga
+los datos con COPY ... FROM STDIN en una transacción, verifica los conteos
+contra el manifest y reajusta las secuencias.
+
+No depende de pg_dump (la imagen de producción no lo incluye).
+"""
+
+import hashlib
+import json
+import tarfile
+import tempfile
+import time
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.migrations.loader import MigrationLoader
+from django.utils import timezone
+from django_tenants.utils import schema_context, schema_exists
+
+from .cache import tenant_cache
+from .models import TenantArchive
+from .provisioning import TEMPLATE_SCHEMA, TemplateNotReady, check_template_schema, clone_template
+
+FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+
+class ArchiveError(Exception):
+    pass
+
+
+def _tables(cursor, schema_name):
+    cursor.execute(
+        """
+        SELECT c.table_name, array_agg(c.column_name::text ORDER BY c.ordinal_position)
+        FROM information_schema.columns c
+        JOIN information_schema.tables t
+          ON t.table_schema = c.table_schema AND t.table_name = c.table_name
+        WHERE c.table_schema = %s AND t.table_type = 'BASE TABLE'
+        GROUP BY c.table_name
+        ORDER BY c.table_name
+        """,
+        [schema_name],
+    )
+    return cursor.fetchall()
+
+
+def _applied_migrations(cursor, schema_name):
+    cursor.execute(f'SELECT app, name FROM "{schema_name}".django_migrations')
+    return sorted(cursor.fetchall())
+
+
+def _leaf_migrations(applied):
+    """
+    [app, name] de la última migración aplicada de cada app según el grafo de
+    migraciones (no el orden de los nombres: squash, merge y numeraciones sin
+    ceros a la izquierda lo rompen). Puede haber más de una por app.
+    """
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    applied = {tuple(key) for key in applied}
+    # Sin conexión el grafo usa las migraciones squash en vez de las que reemplazan
+    for key, migration in loader.replacements.items():
+        if all(tuple(replaced) in applied for replaced in migration.replaces):
+            applied.add(key)
+    graph = loader.graph
+    return [
+        list(key)
+        for key in sorted(applied)
+        if key in graph.nodes
+        and not any(
+            child in applied and child[0] == key[0] for child in graph.node_map[key].children
+        )
+    ]
+
+
+def _columns_sql(columns):
+    return ", ".join(f'"{c}"' for c in columns)
+
+
+def _count_lines(fileobj):
+    count = 0
+    for chunk in iter(lambda: fileobj.read(1 << 20), b""):
+        count += chunk.count(b"\n")
+    return count
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _noop(**kwargs):
+    pass
+
+
+def archive_tenant(tenant, directory=None, drop=True, force=False, progress=_noop):
+    """Vuelca el esquema del colegio a un .tar.gz y (por defecto) lo elimina."""
+    schema_name = tenant.schema_name
+    if tenant.is_active and not force:
+        raise ArchiveError(f"{schema_name} está activo; desactívalo o usa force=True")
+    if not schema_exists(schema_name):
+        raise ArchiveError(f"El esquema {schema_name} no existe")
+    if connection.in_atomic_block:
+        raise ArchiveError("archive_tenant() maneja su propia transacción")
+    # Un colegio activo sigue recibiendo escrituras: el operador confirma el DROP
+    drop = drop and not force
+
+    directory = Path(directory or settings.TENANT_ARCHIVE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{schema_name}-{timezone.now():%Y%m%d%H%M%S}.tar.gz"
+
+    connection.set_schema_to_public()
+    started = time.perf_counter()
+    manifest = {
+        "format": FORMAT_VERSION,
+        "schema_name": schema_name,
+        "tenant": {"id": tenant.pk, "code": tenant.code, "legal_name": tenant.legal_name},
+        "created_at": timezone.now().isoformat(),
+        "tables": [],
+    }
+
+    with transaction.atomic():
+        with connection.cursor() as cursor, tarfile.open(path, "w:gz") as tar:
+            tables = _tables(cursor, schema_name)
+            # Antes de leer datos: las escrituras en curso confirman primero y
+            # las nuevas esperan al COMMIT (o al DROP)
+            cursor.execute(
+                "LOCK TABLE "
+                + ", ".join(f'"{schema_name}"."{table}"' for table, _ in tables)
+                + " IN SHARE MODE"
+            )
+            manifest["migrations"] = _applied_migrations(cursor, schema_name)
+            manifest["leaves"] = _leaf_migrations(manifest["migrations"])
+            for idx, (table, columns) in enumerate(tables, start=1):
+                with tempfile.TemporaryFile() as buf:
+                    cursor.copy_expert(
+                        f'COPY "{schema_name}"."{table}" ({_columns_sql(columns)}) TO STDOUT',
+                        buf,
+                    )
+                    size = buf.tell()
+                    buf.seek(0)
+                    rows = _count_lines(buf)
+                    buf.seek(0)
+                    info = tarfile.TarInfo(f"data/{table}.copy")
+                    info.size = size
+                    tar.addfile(info, buf)
+                manifest["tables"].append(
+                    {"name": table, "columns": columns, "rows": rows, "bytes": size}
+                )
+                progress(
+                    step="dump", index=idx, total=len(tables), table=table, rows=rows,
+                    bytes=size, elapsed=time.perf_counter() - started,
+                )
+
+            payload = json.dumps(manifest, indent=2).encode()
+            info = tarfile.TarInfo(MANIFEST_NAME)
+            info.size = len(payload)
+            with tempfile.TemporaryFile() as buf:
+                buf.write(payload)
+                buf.seek(0)
+                tar.addfile(info, buf)
+
+        verify_archive(path)
+        archive = TenantArchive.objects.create(
+            tenant=tenant,
+            path=str(path),
+            size_bytes=path.stat().st_size,
+            tables=len(manifest["tables"]),
+            rows=sum(t["rows"] for t in manifest["tables"]),
+            sha256=_sha256(path),
+        )
+
+        if drop:
+            with connection.cursor() as cursor:
+                cursor.execute(f'DROP SCHEMA "{schema_name}" CASCADE')
+            transaction.on_commit(tenant_cache.clear)
+    return archive
+
+
+def read_manifest(tar):
+    return json.load(tar.extractfile(MANIFEST_NAME))
+
+
+def verify_archive(path):
+    """Relee el archivo y compara filas por tabla contra el manifest."""
+    with tarfile.open(path, "r:gz") as tar:
+        manifest = read_manifest(tar)
+        for table in manifest["tables"]:
+            rows = _count_lines(tar.extractfile(f"data/{table['name']}.copy"))
+            if rows != table["rows"]:
+                raise ArchiveError(
+                    f"{table['name']}: {rows} filas en el archivo, {table['rows']} esperadas"
+                )
+    return manifest
+
+
+def _migrate_to(schema_name, leaves):
+    """Crea el esquema y lo migra hasta las hojas archivadas de cada app."""
+    graph = MigrationLoader(None, ignore_no_migrations=True).graph
+    missing = [f"{app}.{name}" for app, name in leaves if (app, name) not in graph.nodes]
+    if missing:
+        raise ArchiveError(f"Migraciones del archivo que ya no existen: {', '.join(missing)}")
+    with connection.cursor() as cursor:
+        cursor.execute(f'CREATE SCHEMA "{schema_name}"')
+    for app_label, name in leaves:
+        call_command(
+            "migrate_schemas", app_label, name, tenant=True,
+            schema_name=schema_name, interactive=False, verbosity=0,
+        )
+    connection.set_schema_to_public()
+
+
+def _tenant_models():
+    labels = [app.split(".")[-1] for app in settings.TENANT_APPS]
+    return [m for label in labels for m in apps.get_app_config(label).get_models()]
+
+
+def restore_tenant(tenant, path=None, progress=_noop):
+    """Recrea el esquema del colegio desde su último archivo (o `path`)."""
+    schema_name = tenant.schema_name
+    if schema_exists(schema_name):
+        raise ArchiveError(f"El esquema {schema_name} ya existe")
+
+    archive = None
+    if path is None:
+        archive = tenant.archives.filter(restored_at__isnull=True).first()
+        if archive is None:
+            raise ArchiveError(f"{schema_name} no tiene archivos pendientes de restaurar")
+        path = archive.path
+        if _sha256(path) != archive.sha256:
+            raise ArchiveError(f"{path}: checksum distinto al registrado")
+
+    try:
+        check_template_schema()
+    except TemplateNotReady as exc:
+        raise ArchiveError(str(exc.detail))
+    started = time.perf_counter()
+
+    with tarfile.open(path, "r:gz") as tar:
+        manifest = read_manifest(tar)
+        if manifest["format"] != FORMAT_VERSION:
+            raise ArchiveError(f"Formato de archivo {manifest['format']} no soportado")
+        if manifest["schema_name"] != schema_name:
+            raise ArchiveError(f"El archivo pertenece a {manifest['schema_name']}")
+
+        archived = [tuple(m) for m in manifest["migrations"]]
+        with connection.cursor() as cursor:
+            same_state = archived == _applied_migrations(cursor, TEMPLATE_SCHEMA)
+        try:
+            if not same_state:
+                # Código más nuevo que el archivo: estructura al estado archivado,
+                # luego se migra hacia adelante con los datos ya cargados
+                # Archivos anteriores a "leaves": se calculan con el grafo actual
+                leaves = manifest.get("leaves") or _leaf_migrations(archived)
+                _migrate_to(schema_name, [tuple(leaf) for leaf in leaves])
+            with transaction.atomic():
+                if same_state:
+                    clone_template(schema_name, clone_mode="NODATA")
+                with connection.cursor() as cursor:
+                    tables = manifest["tables"]
+                    cursor.execute(
+                        "TRUNCATE " + ", ".join(f'"{schema_name}"."{t["name"]}"' for t in tables)
+                    )
+                    cursor.execute("SET CONSTRAINTS ALL DEFERRED")
+                    for idx, table in enumerate(tables, start=1):
+                        cursor.copy_expert(
+                            f'COPY "{schema_name}"."{table["name"]}" '
+                            f'({_columns_sql(table["columns"])}) FROM STDIN',
+                            tar.extractfile(f"data/{table['name']}.copy"),
+                        )
+                        cursor.execute(f'SELECT count(*) FROM "{schema_name}"."{table["name"]}"')
+                        rows = cursor.fetchone()[0]
+                        if rows != table["rows"]:
+                            raise ArchiveError(
+                                f"{table['name']}: {rows} filas restauradas, {table['rows']} esperadas"
+                            )
+                        progress(
+                            step="restore", index=idx, total=len(tables), table=table["name"],
+                            rows=rows, bytes=table["bytes"], elapsed=time.perf_counter() - started,
+                        )
+
+                with schema_context(schema_name):
+                    with connection.cursor() as cursor:
+                        for sql in connection.ops.sequence_reset_sql(no_style(), _tenant_models()):
+                            cursor.execute(sql)
+        except Exception:
+            if not same_state:
+                with connection.cursor() as cursor:
+                    cursor.execute(f'DROP SCHEMA IF EXISTS "{schema_name}" CASCADE')
+            raise
+
+    if not same_state:
+        call_command(
+            "migrate_schemas", tenant=True, schema_name=schema_name,
+            interactive=False, verbosity=0,
+        )
+
+    if archive is not None:
+        archive.restored_at = timezone.now()
+        archive.save(update_fields=["restored_at"])
+    tenant_cache.clear()
+    return manifest
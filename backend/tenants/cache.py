@@ -0,0 +1,206 @@
+"""
+Caché de resolución de tenants (local al proceso).
+
+El middleware consulta aquí el Client por schema_name, por host o el tenant
+por defecto. Solo la primera petición de cada clave toca el esquema public;
+las siguientes se resuelven desde memoria. Las señales de Client/Domain
+(tenants/signals.py) vacían la caché en cuanto cambia algún registro.
+
+Por host se usa DomainMap: un diccionario dominio -> tenant precalculado con
+una sola query, de modo que incluso los hosts desconocidos se resuelven sin ir
+a la base de datos.
+
+Cada worker de gunicorn tiene su propia copia. Para que un cambio hecho en
+otro proceso (o en un manage.py) se vea, clear() publica también una versión
+en el cache compartido de Django (SHARED_VERSION_KEY) y cada proceso la
+compara antes de servir desde memoria, a lo sumo una vez cada
+TENANT_CACHE_SYNC_SECONDS: si cambió (o se expulsó), vacía su copia. Un
+cambio tarda como máximo ese intervalo en llegar a todos los workers.
+"""
+
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django_tenants.utils import get_tenant_model, get_tenant_domain_model
+
+
+class DomainMap:
+    """Diccionario dominio -> tenant (solo tenants activos), recargado en bloque."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._map = None
+        self.reloads = 0
+        self.last_reload_ms = None
+
+    def lookup(self, host):
+        domains = self._map
+        if domains is None:
+            domains = self.reload()
+        return domains.get(host)
+
+    def reload(self):
+        generation = self._generation
+        started = time.perf_counter()
+        domains = _load_domain_map()
+        elapsed = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self.reloads += 1
+            self.last_reload_ms = round(elapsed, 3)
+            if generation == self._generation:
+                self._map = domains
+        return domains
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._map = None
+
+    @property
+    def loaded(self):
+        return self._map is not None
+
+    def __len__(self):
+        return len(self._map or ())
+
+
+SHARED_VERSION_KEY = "tenants:resolution:v"
+
+
+class TenantResolutionCache:
+    def __init__(self, sync_every=None):
+        if sync_every is None:
+            sync_every = getattr(settings, "TENANT_CACHE_SYNC_SECONDS", 2)
+        self.sync_every = sync_every
+        self._next_sync = 0.0
+        self._shared_version = None
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._by_schema = {}
+        self._misc = {}
+        self.domains = DomainMap()
+        self.hits = 0
+        self.misses = 0
+
+    # --- lectura ---
+    def has_tenants(self):
+        self._sync()
+        return self._lookup(self._misc, "has_tenants", _load_has_tenants)
+
+    def get_default(self):
+        self._sync()
+        return self._lookup(self._misc, "default", _load_default_tenant)
+
+    def get_by_schema(self, schema_name):
+        self._sync()
+        return self._lookup(
+            self._by_schema, schema_name, lambda: _load_by_schema(schema_name)
+        )
+
+    def get_by_host(self, host):
+        self._sync()
+        if not self.domains.loaded:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return self.domains.lookup(_normalize_host(host))
+
+    # --- invalidación ---
+    def clear(self):
+        """Vacía esta copia y avisa a los demás procesos."""
+        version = time.time_ns()
+        cache.set(SHARED_VERSION_KEY, version, timeout=None)
+        self._shared_version = version
+        self._clear_local()
+
+    def _sync(self):
+        now = time.monotonic()
+        if now < self._next_sync:
+            return
+        self._next_sync = now + self.sync_every
+        version = cache.get(SHARED_VERSION_KEY)
+        if version != self._shared_version:
+            self._shared_version = version
+            self._clear_local()
+
+    def _clear_local(self):
+        with self._lock:
+            self._generation += 1
+            self._by_schema = {}
+            self._misc = {}
+        self.domains.invalidate()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else None,
+            "schemas": len(self._by_schema),
+            "hosts": len(self.domains),
+            "domain_reloads": self.domains.reloads,
+            "domain_reload_ms": self.domains.last_reload_ms,
+            "generation": self._generation,
+        }
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, bucket, key, loader):
+        # Los valores None también se guardan (tenant inexistente = respuesta válida)
+        try:
+            value = bucket[key]
+        except KeyError:
+            pass
+        else:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        generation = self._generation
+        value = loader()
+        with self._lock:
+            # Si hubo una invalidación mientras cargábamos, no guardes un valor viejo
+            if generation == self._generation:
+                bucket[key] = value
+        return value
+
+
+def _normalize_host(host):
+    return (host or "").split(":")[0].strip().lower()
+
+
+def _load_has_tenants():
+    return get_tenant_model().objects.exists()
+
+
+def _load_default_tenant():
+    Tenant = get_tenant_model()
+    schema = getattr(settings, "DEFAULT_TENANT_SCHEMA", None)
+    if schema:
+        try:
+            return Tenant.objects.get(schema_name=schema)
+        except Tenant.DoesNotExist:
+            return None
+    return Tenant.objects.filter(is_active=True).order_by("id").first()
+
+
+def _load_by_schema(schema_name):
+    Tenant = get_tenant_model()
+    try:
+        return Tenant.objects.get(schema_name=schema_name)
+    except Tenant.DoesNotExist:
+        return None
+
+
+def _load_domain_map():
+    Domain = get_tenant_domain_model()
+    qs = Domain.objects.select_related("tenant").filter(tenant__is_active=True)
+    return {_normalize_host(d.domain): d.tenant for d in qs}
+
+
+tenant_cache = TenantResolutionCache()
@@ -0,0 +1,57 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tenants.archival import ArchiveError, archive_tenant
+from tenants.models import Client
+
+
+class Command(BaseCommand):
+    help = (
+        "Archiva el esquema de un colegio inactivo en un .tar.gz (COPY por tabla + "
+        "manifest), verifica los conteos y elimina el esquema."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("schema_name")
+        parser.add_argument("--dir", dest="directory", help="Por defecto TENANT_ARCHIVE_DIR.")
+        parser.add_argument(
+            "--keep-schema",
+            action="store_true",
+            help="Genera y verifica el archivo sin hacer DROP SCHEMA.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Permite archivar colegios activos; implica --keep-schema.",
+        )
+
+    def handle(self, *args, **opts):
+        tenant = Client.objects.filter(schema_name=opts["schema_name"]).first()
+        if tenant is None:
+            raise CommandError(f"No existe el colegio {opts['schema_name']}")
+
+        started = time.perf_counter()
+        try:
+            archive = archive_tenant(
+                tenant,
+                directory=opts["directory"],
+                drop=not opts["keep_schema"],
+                force=opts["force"],
+                progress=self._progress,
+            )
+        except ArchiveError as exc:
+            raise CommandError(str(exc))
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{archive.path}: {archive.tables} tablas, {archive.rows} filas, "
+                f"{archive.size_bytes / 1e6:.2f}MB comprimido en {elapsed:.1f}s "
+                f"({archive.rows / elapsed:.0f} filas/s)"
+            )
+        )
+
+    def _progress(self, index, total, table, rows, bytes, elapsed, **kwargs):
+        rate = bytes / 1e6 / elapsed if elapsed else 0
+        self.stdout.write(f"[{index}/{total}] {table}: {rows} filas, {bytes / 1e3:.0f}KB ({rate:.1f}MB/s)")
@@ -0,0 +1,75 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client as TestClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tenants.postgresql_backend.pool import get_pool
+
+DEFAULT_PATHS = ["/api/tenant/health", "/api/levels", "/api/periods", "/api/grades", "/api/subjects"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark req/s de endpoints de catálogo con conexión nueva por request "
+        "vs. pool (requiere DB_POOL=1)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--email", required=True, help="Usuario staff para el JWT.")
+        parser.add_argument("--path", dest="paths", action="append")
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--threads", type=int, default=4)
+        parser.add_argument("--host", default=(settings.ALLOWED_HOSTS or ["localhost"])[0])
+
+    def handle(self, *args, **opts):
+        pool_options = settings.DATABASES["default"].get("POOL")
+        if not pool_options:
+            raise CommandError("El pool está desactivado; ejecuta con DB_POOL=1.")
+        user = get_user_model().objects.filter(email=opts["email"]).first()
+        if user is None:
+            raise CommandError(f"No existe el usuario {opts['email']}")
+
+        token = str(AccessToken.for_user(user))
+        paths = opts["paths"] or DEFAULT_PATHS
+        pool = get_pool(connection.alias, pool_options)
+        connection.close()
+
+        max_age = pool.max_age
+        try:
+            # max_age=0: cada checkout descarta y abre otra conexión (= sin pool)
+            pool.max_age = 0
+            self._run("sin pool", pool, token, paths, opts)
+        finally:
+            pool.max_age = max_age
+        self._run("pool", pool, token, paths, opts)
+
+    def _run(self, label, pool, token, paths, opts):
+        pool.close_idle()
+        pool.reset_stats()
+        host = "localhost" if opts["host"] == "*" else opts["host"]
+        per_thread = max(1, opts["requests"] // opts["threads"])
+
+        def worker(_):
+            client = TestClient(HTTP_AUTHORIZATION=f"Bearer {token}", HTTP_HOST=host)
+            statuses = []
+            for i in range(per_thread):
+                statuses.append(client.get(paths[i % len(paths)]).status_code)
+            return statuses
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=opts["threads"]) as executor:
+            statuses = [s for chunk in executor.map(worker, range(opts["threads"])) for s in chunk]
+        elapsed = time.perf_counter() - started
+
+        errors = sum(1 for s in statuses if s >= 400)
+        stats = pool.stats()
+        self.stdout.write(
+            f"{label}: {len(statuses)} requests en {elapsed:.2f}s = {len(statuses) / elapsed:.0f} req/s "
+            f"| errores={errors} | conexiones abiertas={stats['created']} "
+            f"reutilizadas={stats['reused']} esperas={stats['waits']}"
+        )
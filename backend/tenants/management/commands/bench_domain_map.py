@@ -0,0 +1,62 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tenants.cache import DomainMap, tenant_cache
+
+
+class Command(BaseCommand):
+    help = "Benchmark de recarga y lookup del mapa dominio -> tenant (HostTenantMiddleware)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reloads", type=int, default=20)
+        parser.add_argument("--lookups", type=int, default=200_000)
+        parser.add_argument(
+            "--synthetic",
+            type=int,
+            default=0,
+            help="Añade N dominios ficticios en memoria para medir el lookup a escala.",
+        )
+
+    def handle(self, *args, **opts):
+        domain_map = DomainMap()
+
+        # --- Recarga (una query por recarga) ---
+        timings = []
+        with CaptureQueriesContext(connection) as ctx:
+            for _ in range(opts["reloads"]):
+                domain_map.invalidate()
+                started = time.perf_counter()
+                domain_map.reload()
+                timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        self.stdout.write(
+            f"reload: {len(domain_map)} dominios | "
+            f"p50={timings[len(timings) // 2]:.3f}ms max={timings[-1]:.3f}ms | "
+            f"queries/reload={len(ctx.captured_queries) / opts['reloads']:.1f}"
+        )
+
+        # --- Lookup ---
+        hosts = list(domain_map._map)
+        if opts["synthetic"]:
+            fake_tenant = next(iter(domain_map._map.values()), None)
+            for i in range(opts["synthetic"]):
+                host = f"colegio{i}.bench.local"
+                domain_map._map[host] = fake_tenant
+                hosts.append(host)
+        hosts.append("desconocido.bench.local")  # miss: también es O(1)
+        sample = [random.choice(hosts) for _ in range(opts["lookups"])]
+
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            for host in sample:
+                domain_map.lookup(host)
+            elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"lookup: {len(hosts)} hosts | {opts['lookups']} lookups en {elapsed * 1000:.1f}ms "
+            f"({elapsed / opts['lookups'] * 1e9:.0f}ns/lookup) | queries={len(ctx.captured_queries)}"
+        )
+        self.stdout.write(f"tenant_cache: {tenant_cache.stats()}")
@@ -0,0 +1,65 @@
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django_tenants.utils import schema_context
+
+from tenants.provisioning import clone_template, prepare_template_schema, seed_tenant_catalogs
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara el alta de esquemas clonando la plantilla vs migrate_schemas. "
+        "Crea esquemas bench_* temporales y los elimina al terminar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--counts", type=int, nargs="+", default=[1, 10, 100])
+        parser.add_argument(
+            "--skip-migrate",
+            action="store_true",
+            help="Solo mide el clonado (migrate_schemas con 100 esquemas tarda mucho).",
+        )
+
+    def handle(self, *args, **opts):
+        prepare_template_schema()
+        for count in opts["counts"]:
+            clone_s = self._run(count, "bench_clone", self._clone)
+            line = f"{count:>4} esquemas | clone: {clone_s:8.2f}s ({clone_s / count * 1000:.0f}ms c/u)"
+            if not opts["skip_migrate"]:
+                migrate_s = self._run(count, "bench_migrate", self._migrate)
+                line += (
+                    f" | migrate_schemas: {migrate_s:8.2f}s ({migrate_s / count * 1000:.0f}ms c/u)"
+                    f" | x{migrate_s / clone_s:.1f}"
+                )
+            self.stdout.write(line)
+
+    def _run(self, count, prefix, create):
+        names = [f"{prefix}_{i}" for i in range(count)]
+        try:
+            started = time.perf_counter()
+            for name in names:
+                create(name)
+            return time.perf_counter() - started
+        finally:
+            connection.set_schema_to_public()
+            with connection.cursor() as cursor:
+                for name in names:
+                    cursor.execute(f'DROP SCHEMA IF EXISTS "{name}" CASCADE')
+
+    def _clone(self, schema_name):
+        with transaction.atomic():
+            clone_template(schema_name)
+            with schema_context(schema_name):
+                seed_tenant_catalogs()
+
+    def _migrate(self, schema_name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'CREATE SCHEMA "{schema_name}"')
+        call_command(
+            "migrate_schemas", tenant=True, schema_name=schema_name,
+            interactive=False, verbosity=0,
+        )
+        with schema_context(schema_name):
+            seed_tenant_catalogs()
@@ -0,0 +1,150 @@
+import hashlib
+import multiprocessing
+import time
+import traceback
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.db.migrations.loader import MigrationLoader
+from django_tenants.utils import get_public_schema_name, get_tenant_model
+
+from tenants.models import TenantArchive, TenantMigrationState
+
+
+def _migrate_schema(schema_name):
+    """Corre en un proceso del pool: migra un esquema y devuelve (schema, error, ms)."""
+    started = time.perf_counter()
+    error = ""
+    try:
+        call_command(
+            "migrate_schemas",
+            tenant=True,
+            schema_name=schema_name,
+            interactive=False,
+            verbosity=0,
+        )
+    except Exception:
+        error = traceback.format_exc()
+    finally:
+        connections.close_all()
+    return schema_name, error, int((time.perf_counter() - started) * 1000)
+
+
+class Command(BaseCommand):
+    help = (
+        "Migra los esquemas de los colegios en paralelo. Omite los que ya están "
+        "al día, registra el progreso en TenantMigrationState y permite reanudar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=getattr(settings, "TENANT_MIGRATION_WORKERS", 4),
+        )
+        parser.add_argument("-s", "--schema", dest="schemas", action="append")
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignora el progreso guardado y revisa todos los esquemas.",
+        )
+
+    def handle(self, *args, **opts):
+        expected = set(MigrationLoader(None, ignore_no_migrations=True).graph.nodes)
+        target = hashlib.sha1(
+            "\n".join(sorted(f"{app}.{name}" for app, name in expected)).encode()
+        ).hexdigest()
+
+        schemas = self._schemas(opts["schemas"])
+        if not opts["restart"]:
+            done = set(
+                TenantMigrationState.objects.filter(
+                    target=target, status__in=["DONE", "SKIPPED"]
+                ).values_list("schema_name", flat=True)
+            )
+            schemas = [s for s in schemas if s not in done]
+
+        pending = []
+        for schema_name in schemas:
+            if expected <= self._applied(schema_name):
+                self._record(schema_name, target, "SKIPPED")
+            else:
+                pending.append(schema_name)
+
+        self.stdout.write(
+            f"{len(schemas)} esquemas por revisar, {len(pending)} con migraciones pendientes "
+            f"({opts['workers']} procesos)"
+        )
+        if not pending:
+            return
+
+        TenantMigrationState.objects.filter(schema_name__in=pending).delete()
+        TenantMigrationState.objects.bulk_create(
+            [TenantMigrationState(schema_name=s, target=target, status="RUNNING") for s in pending]
+        )
+
+        # Los hijos no deben heredar la conexión abierta del padre
+        connections.close_all()
+        failed = 0
+        started = time.perf_counter()
+        with multiprocessing.Pool(processes=min(opts["workers"], len(pending))) as pool:
+            for idx, (schema_name, error, ms) in enumerate(
+                pool.imap_unordered(_migrate_schema, pending), start=1
+            ):
+                status = "FAILED" if error else "DONE"
+                failed += bool(error)
+                self._record(schema_name, target, status, ms, error)
+                style = self.style.ERROR if error else self.style.SUCCESS
+                self.stdout.write(
+                    style(f"[{idx}/{len(pending)}] {schema_name}: {status} en {ms}ms")
+                )
+
+        self.stdout.write(
+            f"Total: {time.perf_counter() - started:.1f}s, {failed} fallidos"
+        )
+        if failed:
+            raise CommandError(
+                f"{failed} esquemas fallaron; vuelve a ejecutar para reanudar desde ahí."
+            )
+
+    def _schemas(self, only):
+        # Los colegios archivados (tenants/archival.py) no tienen esquema hasta
+        # que se restauran: no hay nada que migrar y no deben contar como fallo
+        archived = TenantArchive.objects.filter(restored_at__isnull=True).values("tenant_id")
+        qs = get_tenant_model().objects.exclude(schema_name=get_public_schema_name()).exclude(
+            pk__in=archived
+        )
+        if only:
+            qs = qs.filter(schema_name__in=only)
+        candidates = list(qs.order_by("id").values_list("schema_name", flat=True))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT schema_name FROM information_schema.schemata WHERE schema_name = ANY(%s)",
+                [candidates],
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+        missing = [s for s in candidates if s not in existing]
+        if missing:
+            self.stdout.write(f"Omitidos {len(missing)} colegios sin esquema: {', '.join(missing)}")
+        return [s for s in candidates if s in existing]
+
+    def _applied(self, schema_name):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s)", [f'"{schema_name}".django_migrations'])
+            if cursor.fetchone()[0] is None:
+                return set()
+            cursor.execute(f'SELECT app, name FROM "{schema_name}".django_migrations')
+            return set(cursor.fetchall())
+
+    def _record(self, schema_name, target, status, duration_ms=0, error=""):
+        TenantMigrationState.objects.update_or_create(
+            schema_name=schema_name,
+            defaults={
+                "target": target,
+                "status": status,
+                "duration_ms": duration_ms,
+                "error": error,
+            },
+        )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from tenants.provisioning import TEMPLATE_SCHEMA, prepare_template_schema
+
+
+class Command(BaseCommand):
+    help = "Crea/migra el esquema plantilla usado para clonar colegios nuevos."
+
+    def handle(self, *args, **opts):
+        prepare_template_schema(verbosity=opts["verbosity"])
+        self.stdout.write(self.style.SUCCESS(f"Plantilla '{TEMPLATE_SCHEMA}' lista."))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django_tenants.utils import get_public_schema_name
+
+from tenants.models import Client
+from tenants.quotas import assign_user_tenants, reconcile_usage
+
+
+class Command(BaseCommand):
+    help = (
+        "Asigna colegio a los usuarios que no tienen (anteriores a User.tenant) y "
+        "recalcula los contadores de uso (usuarios/estudiantes) de cada colegio. "
+        "Pensado para cron y para cada deploy."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("-s", "--schema", dest="schemas", action="append")
+
+    def handle(self, *args, **opts):
+        tenants = Client.objects.exclude(schema_name=get_public_schema_name())
+        if opts["schemas"]:
+            tenants = tenants.filter(schema_name__in=opts["schemas"])
+        tenants = list(tenants)
+        for tenant_id, count in assign_user_tenants(tenants if opts["schemas"] else None).items():
+            self.stdout.write(f"Colegio {tenant_id}: {count} usuarios sin colegio asignados")
+        for usage in reconcile_usage(tenants):
+            self.stdout.write(
+                f"{usage.tenant.schema_name}: {usage.users} usuarios, {usage.students} estudiantes"
+            )
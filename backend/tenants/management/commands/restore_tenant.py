@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tenants.archival import ArchiveError, restore_tenant
+from tenants.models import Client
+
+
+class Command(BaseCommand):
+    help = (
+        "Restaura el esquema de un colegio desde su último archivo (o --path), "
+        "verificando filas por tabla contra el manifest."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("schema_name")
+        parser.add_argument("--path", help="Archivo .tar.gz concreto en vez del último registrado.")
+
+    def handle(self, *args, **opts):
+        tenant = Client.objects.filter(schema_name=opts["schema_name"]).first()
+        if tenant is None:
+            raise CommandError(f"No existe el colegio {opts['schema_name']}")
+
+        started = time.perf_counter()
+        try:
+            manifest = restore_tenant(tenant, path=opts["path"], progress=self._progress)
+        except ArchiveError as exc:
+            raise CommandError(str(exc))
+
+        elapsed = time.perf_counter() - started
+        rows = sum(t["rows"] for t in manifest["tables"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{tenant.schema_name}: {len(manifest['tables'])} tablas, {rows} filas "
+                f"restauradas en {elapsed:.1f}s ({rows / elapsed:.0f} filas/s)"
+            )
+        )
+
+    def _progress(self, index, total, table, rows, bytes, elapsed, **kwargs):
+        rate = bytes / 1e6 / elapsed if elapsed else 0
+        self.stdout.write(f"[{index}/{total}] {table}: {rows} filas ({rate:.1f}MB/s)")
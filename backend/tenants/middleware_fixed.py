@@ -1,7 +1,8 @@
 from django.conf import settings
 from django.db import connection
 from django.http import HttpResponseServerError, HttpResponseBadRequest
-from django_tenants.utils import get_tenant_model
+
+from .cache import tenant_cache
 
 PUBLIC_PATH_PREFIXES = (
     "/admin",  # admin de Django
@@ -15,14 +16,8 @@ PUBLIC_PATH_PREFIXES = (
 
 
 def _pick_default_tenant():
-    Tenant = get_tenant_model()
-    schema = getattr(settings, "DEFAULT_TENANT_SCHEMA", None)
-    if schema:
-        try:
-            return Tenant.objects.get(schema_name=schema)
-        except Tenant.DoesNotExist:
-            return None
-    return Tenant.objects.filter(is_active=True).order_by("id").first()
+    # Resuelto desde la caché del proceso (sin queries en estado estable)
+    return tenant_cache.get_default()
 
 
 class FixedTenantDevMiddleware:
@@ -30,19 +25,16 @@ class FixedTenantDevMiddleware:
         self.get_response = get_response
 
     def __call__(self, request):
-        Tenant = get_tenant_model()
-
-        # 1) Si aún no hay tenants, o la ruta es pública -> no fijes tenant (usa 'public')
-        if not Tenant.objects.exists() or request.path.startswith(PUBLIC_PATH_PREFIXES):
+        # 1) Si la ruta es pública, o aún no hay tenants -> no fijes tenant (usa 'public')
+        if request.path.startswith(PUBLIC_PATH_PREFIXES) or not tenant_cache.has_tenants():
             return self.get_response(request)
 
         # 2) Override opcional ?__tenant=... (solo DEBUG)
         if settings.DEBUG:
             override = request.GET.get("__tenant")
             if override:
-                try:
-                    tenant = Tenant.objects.get(schema_name=override)
-                except Tenant.DoesNotExist:
+                tenant = tenant_cache.get_by_schema(override)
+                if tenant is None:
                     return HttpResponseBadRequest(f"Tenant '{override}' no existe")
                 request.tenant = tenant
                 connection.set_tenant(tenant)
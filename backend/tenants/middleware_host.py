@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.db import connection
+from django.http import Http404
+
+from .cache import tenant_cache
+from .middleware_fixed import PUBLIC_PATH_PREFIXES
+
+
+class HostTenantMiddleware:
+    """
+    Modo producción: resuelve el tenant a partir del header Host.
+
+    El lookup es un dict.get sobre el mapa dominio -> tenant que mantiene
+    tenant_cache (una sola query al arrancar o tras un cambio en Client/Domain);
+    en estado estable no se hace ninguna query por petición.
+    Hosts desconocidos caen en el esquema public con PUBLIC_SCHEMA_URLCONF,
+    salvo que TENANT_NOT_FOUND_EXCEPTION esté activo (404).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.path.startswith(PUBLIC_PATH_PREFIXES):
+            return self.get_response(request)
+
+        tenant = tenant_cache.get_by_host(request.get_host())
+        if tenant is None:
+            if getattr(settings, "TENANT_NOT_FOUND_EXCEPTION", False):
+                raise Http404("No hay un colegio asociado a este dominio")
+            request.urlconf = settings.PUBLIC_SCHEMA_URLCONF
+            return self.get_response(request)
+
+        request.tenant = tenant
+        connection.set_tenant(tenant)
+        try:
+            return self.get_response(request)
+        finally:
+            connection.set_schema_to_public()
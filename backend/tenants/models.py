@@ -42,3 +42,68 @@ class Domain(DomainMixin):
     # fields: domain (str), tenant (FK a Client), is_primary (bool)
     def __str__(self) -> str:
         return self.domain
+
+
+class TenantUsage(models.Model):
+    """
+    Contadores de uso por colegio frente a los límites del Plan.
+    Se actualizan incrementalmente (tenants/quotas.py + señales) y se
+    reconcilian periódicamente con reconcile_tenant_usage.
+    """
+
+    tenant = models.OneToOneField(Client, on_delete=models.CASCADE, related_name="usage")
+    users = models.IntegerField(default=0)
+    students = models.IntegerField(default=0)
+    reconciled_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        return f"{self.tenant.schema_name}: {self.users} usuarios, {self.students} estudiantes"
+
+
+class TenantArchive(models.Model):
+    """
+    Archivo en frío del esquema de un colegio inactivo (tenants/archival.py).
+    Mientras restored_at sea null, el esquema no existe en la base.
+    """
+
+    tenant = models.ForeignKey(Client, on_delete=models.CASCADE, related_name="archives")
+    path = models.CharField(max_length=500)
+    size_bytes = models.BigIntegerField(default=0)
+    tables = models.PositiveIntegerField(default=0)
+    rows = models.BigIntegerField(default=0)
+    sha256 = models.CharField(max_length=64)
+    archived_at = models.DateTimeField(auto_now_add=True)
+    restored_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-archived_at"]
+
+    def __str__(self) -> str:
+        return f"{self.tenant.schema_name} @ {self.archived_at:%Y-%m-%d}"
+
+
+class TenantMigrationState(models.Model):
+    """
+    Progreso de migrate_tenants por esquema (vive en public).
+    Permite reanudar una corrida fallida y ver tiempos por colegio.
+    """
+
+    STATUS_CHOICES = [
+        ("RUNNING", "En curso"),
+        ("DONE", "Completado"),
+        ("SKIPPED", "Al día"),
+        ("FAILED", "Fallido"),
+    ]
+
+    schema_name = models.CharField(max_length=63, unique=True)
+    target = models.CharField(max_length=64)  # hash del conjunto de migraciones esperado
+    status = models.CharField(max_length=8, choices=STATUS_CHOICES)
+    duration_ms = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["schema_name"]
+
+    def __str__(self) -> str:
+        return f"{self.schema_name}: {self.status}"
@@ -0,0 +1,39 @@
+"""
+Backend de django-tenants con pool de conexiones (psycopg2).
+
+Se activa con ENGINE = "tenants.postgresql_backend" y la clave POOL en
+DATABASES (ver config/settings.py, DB_POOL=1). Sin POOL se comporta igual que
+django_tenants.postgresql_backend.
+"""
+
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+from django_tenants.postgresql_backend.base import DatabaseWrapper as TenantDatabaseWrapper
+
+from .pool import get_pool
+
+
+class DatabaseWrapper(TenantDatabaseWrapper):
+    @property
+    def tenant_pool(self):
+        options = self.settings_dict.get("POOL")
+        return get_pool(self.alias, options) if options else None
+
+    def get_new_connection(self, conn_params):
+        pool = self.tenant_pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+
+        connect = super().get_new_connection
+        conn = pool.getconn(lambda: connect(conn_params))
+        # Lo que Django fija en get_new_connection() también para las reutilizadas
+        self.isolation_level = IsolationLevel(
+            self.settings_dict["OPTIONS"].get("isolation_level", IsolationLevel.READ_COMMITTED)
+        )
+        return conn
+
+    def _close(self):
+        pool = self.tenant_pool
+        if pool is None or self.connection is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            pool.putconn(self.connection)
@@ -0,0 +1,221 @@
+"""
+Pool de conexiones psycopg2 por proceso para el backend de tenants.
+
+Django (con psycopg2) abre y cierra una conexión por request cuando
+CONN_MAX_AGE=0; aquí close() devuelve la conexión al pool y la siguiente
+request la reutiliza. Como las conexiones pasan de un colegio a otro, en cada
+checkout se hace en un solo round-trip:
+
+    ROLLBACK de lo que haya quedado abierto (en el checkin)
+    SET search_path = public; SELECT 1      (reset determinista + health check)
+
+Si el health check falla la conexión se descarta y se abre otra. Después,
+django-tenants vuelve a fijar el search_path del tenant al abrir el cursor.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+from django.core.exceptions import ImproperlyConfigured
+
+try:
+    import psycopg2
+    from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+except ImportError:  # psycopg 3: Django ya trae su propio pool (OPTIONS["pool"])
+    psycopg2 = None
+
+from django_tenants.utils import get_public_schema_name
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    def __init__(self, max_size=10, timeout=5.0, max_age=1800.0):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_age = max_age
+        self._idle = deque()  # (conn, created_at), LIFO: la más reciente está "caliente"
+        self._born = {}  # id(conn) -> created_at, incluye las prestadas
+        self._size = 0  # conexiones abiertas + las que se están abriendo
+        self._cond = threading.Condition()
+        self._pid = os.getpid()
+        self._orphans = []
+        self.reset_stats()
+
+    # --- estadísticas ---
+    def reset_stats(self):
+        self.checkouts = 0
+        self.created = 0
+        self.discarded = 0
+        self.health_failures = 0
+        self.waits = 0
+        self.wait_ms = 0.0
+        self.timeouts = 0
+
+    def stats(self):
+        with self._cond:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "max_size": self.max_size,
+                "checkouts": self.checkouts,
+                "created": self.created,
+                "reused": self.checkouts - self.created,
+                "discarded": self.discarded,
+                "health_failures": self.health_failures,
+                "waits": self.waits,
+                "wait_ms": round(self.wait_ms, 2),
+                "timeouts": self.timeouts,
+            }
+
+    # --- checkout / checkin ---
+    def getconn(self, factory):
+        """`factory` abre una conexión nueva cuando no hay una libre reutilizable."""
+        self._check_fork()
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            while not self._idle and self._size >= self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.timeouts += 1
+                    raise PoolTimeout(
+                        f"Sin conexiones libres tras {self.timeout}s (max_size={self.max_size})"
+                    )
+                self.waits += 1
+                started = time.perf_counter()
+                self._cond.wait(remaining)
+                self.wait_ms += (time.perf_counter() - started) * 1000
+            self.checkouts += 1
+            if self._idle:
+                conn, created_at = self._idle.pop()
+            else:
+                conn, created_at = None, None
+                self._size += 1  # reserva el hueco mientras conectamos
+
+        if conn is not None:
+            if time.monotonic() - created_at <= self.max_age and self._check(conn):
+                return conn
+            self._close(conn)  # el hueco se reutiliza para la nueva
+        return self._connect(factory)
+
+    def putconn(self, conn):
+        self._check_fork()
+        with self._cond:
+            known = id(conn) in self._born
+            if not known:
+                # Heredada de otro proceso: no se cierra (mataría la sesión del padre)
+                self._orphans.append(conn)
+                return
+        healthy = not conn.closed
+        if healthy and conn.info.transaction_status != TRANSACTION_STATUS_IDLE:
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                healthy = False
+        if not healthy:
+            self._discard(conn)
+            return
+        with self._cond:
+            self._idle.append((conn, self._born[id(conn)]))
+            self._cond.notify()
+
+    def close_idle(self):
+        with self._cond:
+            idle, self._idle = list(self._idle), deque()
+        for conn, _ in idle:
+            self._discard(conn)
+
+    # --- internos ---
+    def _connect(self, factory):
+        try:
+            conn = factory()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._born[id(conn)] = time.monotonic()
+            self.created += 1
+        return conn
+
+    def _check(self, conn):
+        if not conn.closed:
+            try:
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        "SET search_path = %s; SELECT 1", [get_public_schema_name()]
+                    )
+                return True
+            except psycopg2.Error:
+                pass
+        with self._cond:
+            self.health_failures += 1
+        return False
+
+    def _close(self, conn):
+        with self._cond:
+            self._born.pop(id(conn), None)
+            self.discarded += 1
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+
+    def _discard(self, conn):
+        self._close(conn)
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    def _check_fork(self):
+        # Un hijo (multiprocessing / gunicorn --preload) no debe usar ni cerrar
+        # los sockets heredados: se guardan sin tocar y el hijo empieza de cero.
+        if os.getpid() == self._pid:
+            return
+        with self._cond:
+            self._orphans.extend(conn for conn, _ in self._idle)
+            self._idle = deque()
+            self._born = {}
+            self._size = 0
+            self._pid = os.getpid()
+            self.reset_stats()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, options):
+    if psycopg2 is None:
+        raise ImproperlyConfigured(
+            "tenants.postgresql_backend requiere psycopg2; con psycopg 3 usa OPTIONS['pool']."
+        )
+    with _pools_lock:
+        pool = _pools.get(alias)
+        if pool is None:
+            pool = _pools[alias] = ConnectionPool(
+                max_size=options.get("MAX_SIZE", 10),
+                timeout=options.get("TIMEOUT", 5.0),
+                max_age=options.get("MAX_AGE", 1800.0),
+            )
+        return pool
+
+
+def pool_stats():
+    return {alias: pool.stats() for alias, pool in _pools.items()}
+
+
+def _close_idle_before_fork():
+    for pool in list(_pools.values()):
+        pool.close_idle()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(before=_close_idle_before_fork)
@@ -0,0 +1,160 @@
+"""
+Alta rápida de colegios clonando un esquema plantilla.
+
+En lugar de correr todo el historial de migraciones de TENANT_APPS por cada
+Client nuevo (auto_create_schema), se mantiene un esquema plantilla ya migrado
+(settings.TENANT_TEMPLATE_SCHEMA) y se copia a nivel SQL con la función
+clone_schema de django-tenants. La plantilla solo contiene tablas vacías y las
+filas de django_migrations, así que el esquema nuevo queda "al día" sin
+ejecutar ni fingir migraciones.
+
+La plantilla se crea, migra y se le instala clone_schema() solo desde
+manage.py prepare_tenant_template (entrypoint.prod.sh lo corre en cada
+deploy). En el alta (request) check_template_schema() apenas comprueba que
+esté lista y, si no, responde 503 pidiendo correr ese comando.
+
+El INSERT del Client, el clonado y la carga de catálogos base ocurren en una
+sola transacción: si algo falla no queda ni el Client ni el esquema.
+"""
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.migrations.executor import MigrationExecutor
+from django_tenants.clone import CloneSchema
+from django_tenants.utils import schema_context, schema_exists
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+TEMPLATE_SCHEMA = getattr(settings, "TENANT_TEMPLATE_SCHEMA", "tenant_template")
+
+# Catálogos base que recibe todo colegio nuevo
+DEFAULT_GRADING_DIMENSIONS = [
+    ("SER", "Dimensión Ser"),
+    ("SABER", "Dimensión Saber"),
+    ("HACER", "Dimensión Hacer"),
+    ("DECIDIR", "Dimensión Decidir"),
+]
+DEFAULT_EDUCATION_LEVELS = [
+    ("Inicial", "INI"),
+    ("Primaria", "PRI"),
+    ("Secundaria", "SEC"),
+]
+
+_template_checked = False
+
+
+class TemplateNotReady(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "La plantilla de colegios no está lista."
+    default_code = "template_not_ready"
+
+
+def prepare_template_schema(verbosity=0):
+    """
+    Crea (si falta) y migra el esquema plantilla, e instala clone_schema().
+    Solo para comandos de gestión (prepare_tenant_template en el deploy).
+    """
+    connection.set_schema_to_public()
+    with connection.cursor() as cursor:
+        if not schema_exists(TEMPLATE_SCHEMA):
+            cursor.execute(f'CREATE SCHEMA "{TEMPLATE_SCHEMA}"')
+    call_command(
+        "migrate_schemas",
+        tenant=True,
+        schema_name=TEMPLATE_SCHEMA,
+        interactive=False,
+        verbosity=verbosity,
+    )
+    CloneSchema()._create_clone_schema_function()
+    connection.set_schema_to_public()
+
+
+def _template_problem():
+    if not schema_exists(TEMPLATE_SCHEMA):
+        return f"no existe el esquema {TEMPLATE_SCHEMA}"
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT EXISTS (SELECT 1 FROM pg_proc p JOIN pg_namespace n ON n.oid = p.pronamespace"
+            " WHERE n.nspname = 'public' AND p.proname = 'clone_schema')"
+        )
+        if not cursor.fetchone()[0]:
+            return "falta la función clone_schema()"
+    with schema_context(TEMPLATE_SCHEMA):
+        executor = MigrationExecutor(connection)
+        pending = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    if pending:
+        return f"{len(pending)} migraciones pendientes en {TEMPLATE_SCHEMA}"
+    return None
+
+
+def check_template_schema():
+    """
+    Sin modificar nada: TemplateNotReady si la plantilla no existe, no está
+    migrada al día o falta clone_schema(). Un resultado positivo se recuerda
+    en el proceso (el código, y con él las migraciones, no cambia sin reiniciar).
+    """
+    global _template_checked
+    if _template_checked:
+        return
+    connection.set_schema_to_public()
+    problem = _template_problem()
+    connection.set_schema_to_public()
+    if problem:
+        raise TemplateNotReady(
+            f"Plantilla de colegios no lista: {problem}. "
+            "Ejecuta manage.py prepare_tenant_template."
+        )
+    _template_checked = True
+
+
+def clone_template(schema_name, clone_mode="DATA"):
+    """
+    Copia la plantilla en un esquema nuevo. Con "DATA" (por defecto) se copian
+    también las filas de django_migrations; "NODATA" copia solo la estructura.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT clone_schema(%s, %s, %s)", [TEMPLATE_SCHEMA, schema_name, clone_mode]
+        )
+
+
+def seed_tenant_catalogs():
+    """Carga catálogos base en el esquema activo (idempotente)."""
+    from academics.models import EducationLevel, GradingDimension
+
+    GradingDimension.objects.bulk_create(
+        [
+            GradingDimension(name=name, description=description, default_weight=25)
+            for name, description in DEFAULT_GRADING_DIMENSIONS
+        ],
+        ignore_conflicts=True,
+    )
+    EducationLevel.objects.bulk_create(
+        [
+            EducationLevel(name=name, short_name=short_name)
+            for name, short_name in DEFAULT_EDUCATION_LEVELS
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def provision_tenant(client, seed=True):
+    """
+    Guarda un Client nuevo y crea su esquema clonando la plantilla.
+    Devuelve el Client guardado.
+    """
+    if not getattr(settings, "TENANT_CLONE_PROVISIONING", True):
+        client.save()
+        return client
+
+    check_template_schema()
+
+    with transaction.atomic():
+        client.auto_create_schema = False  # el esquema lo creamos nosotros
+        client.save()
+        clone_template(client.schema_name)
+        if seed:
+            with schema_context(client.schema_name):
+                seed_tenant_catalogs()
+    return client
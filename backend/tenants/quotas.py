@@ -0,0 +1,187 @@
+"""
+Cuotas del Plan (max_users / max_students) con contadores cacheados.
+
+En vez de hacer COUNT(*) en cada alta, TenantUsage guarda el uso actual de
+cada colegio. Las señales de User y Student lo ajustan con un UPDATE atómico
+(F() +/- 1) y enforce_quota() compara contra el Plan leyendo una sola fila.
+reconcile_usage() recalcula los contadores desde cero (cron / comando).
+
+enforce_quota() toma la fila con SELECT ... FOR UPDATE: se llama dentro del
+mismo atomic() que el alta, así dos altas simultáneas se turnan y la segunda
+ve el contador ya incrementado por la primera.
+
+Los usuarios anteriores a User.tenant tienen tenant NULL y no cuentan;
+assign_user_tenants() se los asigna (manage.py reconcile_tenant_usage, que
+entrypoint.prod.sh corre en cada deploy).
+"""
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, F
+from django.utils import timezone
+from django_tenants.utils import get_public_schema_name, schema_context, schema_exists
+from rest_framework.exceptions import PermissionDenied
+
+from .cache import tenant_cache
+from .models import Client, TenantUsage
+
+# recurso -> campo límite en Plan
+LIMITS = {
+    "users": "max_users",
+    "students": "max_students",
+}
+
+
+class QuotaExceeded(PermissionDenied):
+    default_detail = "El plan del colegio no permite más registros."
+    default_code = "quota_exceeded"
+
+
+def current_tenant():
+    """Client del esquema activo, o None si estamos en public."""
+    tenant = getattr(connection, "tenant", None)
+    if isinstance(tenant, Client):
+        return tenant
+    if connection.schema_name == get_public_schema_name():
+        return None
+    return tenant_cache.get_by_schema(connection.schema_name)
+
+
+def request_tenant(request):
+    """
+    Colegio de la petición aunque la ruta sea pública (p. ej. /api/auth/signup):
+    el resuelto por el middleware, o el que resolvería según TENANT_ROUTING.
+    """
+    tenant = getattr(request, "tenant", None)
+    if tenant is not None:
+        return tenant
+    if getattr(settings, "TENANT_ROUTING", "fixed") == "host":
+        return tenant_cache.get_by_host(request.get_host())
+    return tenant_cache.get_default()
+
+
+def get_usage(tenant, lock=False):
+    """TenantUsage del colegio (lo crea si falta); lock=True: FOR UPDATE."""
+    usage = TenantUsage.objects.select_related("tenant__plan").filter(tenant_id=tenant.pk)
+    if lock:
+        usage = usage.select_for_update(of=("self",))
+    if usage.first() is None:
+        reconcile_usage([tenant])
+    return usage.first()
+
+
+def enforce_quota(tenant, resource, amount=1):
+    """
+    Lanza QuotaExceeded si agregar `amount` supera el límite del plan. Debe
+    llamarse en el atomic() del alta: la fila queda bloqueada hasta el COMMIT.
+    """
+    if tenant is None:
+        return
+    usage = get_usage(tenant, lock=True)
+    plan = usage.tenant.plan
+    if plan is None:
+        return
+    limit = getattr(plan, LIMITS[resource])
+    current = getattr(usage, resource)
+    if current + amount > limit:
+        raise QuotaExceeded(
+            f"Límite del plan {plan.name} alcanzado: {current}/{limit} {resource}."
+        )
+
+
+def adjust_usage(tenant_id, resource, delta):
+    if tenant_id is None:
+        return
+    updated = TenantUsage.objects.filter(tenant_id=tenant_id).update(
+        **{resource: F(resource) + delta}
+    )
+    if not updated:
+        # Primera vez para este colegio: el conteo completo ya incluye el cambio
+        tenant = Client.objects.filter(pk=tenant_id).first()
+        if tenant:
+            reconcile_usage([tenant])
+
+
+def reconcile_usage(tenants=None):
+    """Recalcula los contadores (1 query de usuarios + 1 COUNT por esquema)."""
+    from academics.models import Student
+
+    if tenants is None:
+        tenants = list(Client.objects.exclude(schema_name=get_public_schema_name()))
+    user_counts = dict(
+        Client.objects.filter(pk__in=[t.pk for t in tenants])
+        .annotate(total=Count("users"))
+        .values_list("pk", "total")
+    )
+
+    now = timezone.now()
+    result = []
+    for tenant in tenants:
+        defaults = {"users": user_counts.get(tenant.pk, 0), "reconciled_at": now}
+        if schema_exists(tenant.schema_name):  # archivado: se conserva el conteo previo
+            with schema_context(tenant.schema_name):
+                defaults["students"] = Student.objects.count()
+        usage, _ = TenantUsage.objects.update_or_create(tenant=tenant, defaults=defaults)
+        result.append(usage)
+    return result
+
+
+def assign_user_tenants(tenants=None):
+    """
+    Asigna colegio a los usuarios con tenant NULL (creados antes del campo): el
+    del único esquema donde aparecen referenciados (docente, notas,
+    asistencia...); con TENANT_ROUTING "fixed" el resto va al colegio por
+    defecto, que es el que les asignaría el signup. Los superusuarios quedan
+    como usuarios de plataforma. Con `tenants` solo se revisan esos esquemas
+    y no se usa el colegio por defecto (el usuario podría estar en otro).
+    Devuelve {tenant_id: usuarios asignados}.
+    """
+    from accounts.models import User
+    from accounts.tokens import bump_auth_version
+
+    pending = set(
+        User.objects.filter(tenant__isnull=True, is_superuser=False).values_list("pk", flat=True)
+    )
+    if not pending:
+        return {}
+    scan_all = tenants is None
+    if scan_all:
+        tenants = list(Client.objects.exclude(schema_name=get_public_schema_name()))
+
+    references = [
+        (model, field.attname)
+        for app in settings.TENANT_APPS
+        for model in apps.get_app_config(app.split(".")[-1]).get_models()
+        for field in model._meta.concrete_fields
+        if field.is_relation and field.related_model is User
+    ]
+    owners = {}
+    for tenant in tenants:
+        if not schema_exists(tenant.schema_name):  # archivado
+            continue
+        with schema_context(tenant.schema_name):
+            for model, attname in references:
+                for user_id in (
+                    model.objects.filter(**{f"{attname}__in": pending})
+                    .order_by()
+                    .values_list(attname, flat=True)
+                    .distinct()
+                ):
+                    owners.setdefault(user_id, set()).add(tenant.pk)
+
+    assigned = {}
+    for user_id, tenant_ids in owners.items():
+        if len(tenant_ids) == 1:
+            assigned.setdefault(next(iter(tenant_ids)), []).append(user_id)
+    default = None
+    if scan_all and getattr(settings, "TENANT_ROUTING", "fixed") == "fixed":
+        default = tenant_cache.get_default()
+    if default is not None:
+        assigned.setdefault(default.pk, []).extend(pending - owners.keys())
+
+    for tenant_id, user_ids in assigned.items():
+        User.objects.filter(pk__in=user_ids, tenant__isnull=True).update(tenant_id=tenant_id)
+        # tenant_id viaja en el JWT: los tokens emitidos sin colegio se renuevan
+        bump_auth_version(*user_ids)
+    return {tenant_id: len(user_ids) for tenant_id, user_ids in assigned.items()}
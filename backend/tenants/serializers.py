@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Plan, Client, Domain
+from .models import Plan, Client, Domain, TenantUsage
 
 
 class PlanSerializer(serializers.ModelSerializer):
@@ -36,3 +36,26 @@ class DomainSerializer(serializers.ModelSerializer):
             "is_primary",
         ]
         read_only_fields = ["id"]
+
+
+class TenantUsageSerializer(serializers.ModelSerializer):
+    schema_name = serializers.CharField(source="tenant.schema_name", read_only=True)
+    plan_name = serializers.CharField(source="tenant.plan.name", read_only=True, default=None)
+    max_users = serializers.IntegerField(source="tenant.plan.max_users", read_only=True, default=None)
+    max_students = serializers.IntegerField(
+        source="tenant.plan.max_students", read_only=True, default=None
+    )
+
+    class Meta:
+        model = TenantUsage
+        fields = [
+            "tenant",
+            "schema_name",
+            "plan_name",
+            "users",
+            "max_users",
+            "students",
+            "max_students",
+            "reconciled_at",
+        ]
+        read_only_fields = fields
@@ -0,0 +1,43 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from accounts.models import User
+from academics.models import Student
+
+from .cache import tenant_cache
+from .models import Client, Domain
+from .quotas import adjust_usage, current_tenant
+
+
+@receiver(post_save, sender=Client)
+@receiver(post_delete, sender=Client)
+@receiver(post_save, sender=Domain)
+@receiver(post_delete, sender=Domain)
+def invalidate_tenant_cache(sender, **kwargs):
+    """Cualquier cambio en Client/Domain invalida la resolución cacheada."""
+    tenant_cache.clear()
+
+
+# --- Contadores de cuota (tenants/quotas.py) ---
+@receiver(post_save, sender=User)
+def count_user_created(sender, instance, created, **kwargs):
+    if created:
+        adjust_usage(instance.tenant_id, "users", 1)
+
+
+@receiver(post_delete, sender=User)
+def count_user_deleted(sender, instance, **kwargs):
+    adjust_usage(instance.tenant_id, "users", -1)
+
+
+@receiver(post_save, sender=Student)
+def count_student_created(sender, instance, created, **kwargs):
+    if created:
+        tenant = current_tenant()
+        adjust_usage(tenant and tenant.pk, "students", 1)
+
+
+@receiver(post_delete, sender=Student)
+def count_student_deleted(sender, instance, **kwargs):
+    tenant = current_tenant()
+    adjust_usage(tenant and tenant.pk, "students", -1)
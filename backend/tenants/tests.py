@@ -0,0 +1,125 @@
+import io
+import tarfile
+import tempfile
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TransactionTestCase
+from django_tenants.utils import schema_exists
+
+from tenants.archival import archive_tenant, read_manifest
+from tenants.cache import SHARED_VERSION_KEY, TenantResolutionCache
+from tenants.models import Client
+
+
+class MigrateTenantsArchivedTests(TransactionTestCase):
+    """migrate_tenants no debe fallar por colegios archivados (sin esquema)."""
+
+    def setUp(self):
+        connection.set_schema_to_public()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def _client(self, schema_name, **extra):
+        client = Client(
+            schema_name=schema_name,
+            legal_name=schema_name,
+            code=schema_name,
+            official_email=f"{schema_name}@example.com",
+            **extra,
+        )
+        client.save()
+        return client
+
+    def _migrate_tenants(self, *schemas):
+        out = io.StringIO()
+        args = [arg for schema in schemas for arg in ("--schema", schema)]
+        call_command("migrate_tenants", *args, "--workers", "1", stdout=out)
+        return out.getvalue()
+
+    def test_archived_tenant_is_skipped(self):
+        client = self._client("archivado_test")
+        client.is_active = False
+        client.save()
+        archive_tenant(client, directory=self.directory.name)
+        self.assertFalse(schema_exists("archivado_test"))
+
+        output = self._migrate_tenants("archivado_test")
+
+        self.assertIn("0 esquemas por revisar", output)
+
+    def test_client_without_schema_is_skipped(self):
+        client = Client(
+            schema_name="sin_esquema_test",
+            legal_name="sin esquema",
+            code="sin_esquema_test",
+            official_email="sin_esquema@example.com",
+        )
+        client.auto_create_schema = False
+        client.save()
+
+        output = self._migrate_tenants("sin_esquema_test")
+
+        self.assertIn("Omitidos 1 colegios sin esquema: sin_esquema_test", output)
+        self.assertIn("0 esquemas por revisar", output)
+
+
+class ArchiveTenantTests(TransactionTestCase):
+    def setUp(self):
+        connection.set_schema_to_public()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_force_keeps_schema(self):
+        client = Client(
+            schema_name="activo_test",
+            legal_name="activo",
+            code="activo_test",
+            official_email="activo@example.com",
+        )
+        client.save()
+
+        archive = archive_tenant(client, directory=self.directory.name, force=True)
+
+        self.assertTrue(schema_exists("activo_test"))
+        with tarfile.open(archive.path, "r:gz") as tar:
+            manifest = read_manifest(tar)
+        self.assertTrue(manifest["leaves"])
+        self.assertEqual(
+            {app for app, _ in manifest["leaves"]}, {app for app, _ in manifest["migrations"]}
+        )
+
+
+class TenantResolutionCacheSyncTests(SimpleTestCase):
+    """Un clear() en un proceso vacía la copia en memoria de los demás."""
+
+    def setUp(self):
+        cache.delete(SHARED_VERSION_KEY)
+        self.loads = 0
+
+    def _load(self):
+        self.loads += 1
+        return self.loads
+
+    def test_clear_in_other_process_invalidates(self):
+        worker, other = TenantResolutionCache(sync_every=0), TenantResolutionCache(sync_every=0)
+        self.assertEqual(worker._lookup(worker._misc, "default", self._load), 1)
+        worker._sync()
+        self.assertEqual(worker._lookup(worker._misc, "default", self._load), 1)
+
+        other.clear()
+        worker._sync()
+
+        self.assertEqual(worker._lookup(worker._misc, "default", self._load), 2)
+
+    def test_evicted_version_invalidates(self):
+        worker = TenantResolutionCache(sync_every=0)
+        TenantResolutionCache(sync_every=0).clear()
+        worker._sync()
+        worker._lookup(worker._misc, "default", self._load)
+
+        cache.delete(SHARED_VERSION_KEY)
+        worker._sync()
+
+        self.assertEqual(worker._lookup(worker._misc, "default", self._load), 2)
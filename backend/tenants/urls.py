@@ -6,6 +6,10 @@ from .views import (
     ClientDetailView,
     DomainCreateView,
     DomainListView,
+    TenantUsageListView,
+    tenant_cache_stats,
+    analytics_list,
+    analytics_run,
 )
 
 urlpatterns = [
@@ -15,4 +19,8 @@ urlpatterns = [
     path("tenants/<int:pk>", ClientDetailView.as_view(), name="tenant_detail"),
     path("domains", DomainCreateView.as_view(), name="domain_create"),
     path("domains/list", DomainListView.as_view(), name="domain_list"),
+    path("tenants/usage", TenantUsageListView.as_view(), name="tenant_usage"),
+    path("tenants/cache-stats", tenant_cache_stats, name="tenant_cache_stats"),
+    path("tenants/analytics", analytics_list, name="tenant_analytics_list"),
+    path("tenants/analytics/<str:name>", analytics_run, name="tenant_analytics_run"),
 ]
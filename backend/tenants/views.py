@@ -1,6 +1,17 @@
 from rest_framework import generics, permissions
-from .models import Plan, Client, Domain
-from .serializers import PlanSerializer, ClientSerializer, DomainSerializer
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from .analytics import AGGREGATES, InvalidParams, run_aggregate
+from .cache import tenant_cache
+from .models import Plan, Client, Domain, TenantUsage
+from .provisioning import provision_tenant
+from .serializers import (
+    PlanSerializer,
+    ClientSerializer,
+    DomainSerializer,
+    TenantUsageSerializer,
+)
 
 
 # GET POST
@@ -20,6 +31,10 @@ class ClientCreateView(generics.CreateAPIView):
     serializer_class = ClientSerializer
     permission_classes = [permissions.IsAdminUser]
 
+    def perform_create(self, serializer):
+        # Esquema clonado desde la plantilla (ver tenants/provisioning.py)
+        serializer.instance = provision_tenant(Client(**serializer.validated_data))
+
 
 class ClientDetailView(generics.RetrieveAPIView):
     queryset = Client.objects.all()
@@ -47,3 +62,62 @@ class DomainListView(generics.ListAPIView):
     queryset = Domain.objects.all().select_related("tenant")
     serializer_class = DomainSerializer
     permission_classes = [permissions.IsAdminUser]
+
+
+class TenantUsageListView(generics.ListAPIView):
+    """
+    Uso actual vs límites del plan por colegio (contadores cacheados, 1 query).
+    Filtro: ?tenant=<id>
+    Requiere usuario staff (IsAdminUser).
+    """
+
+    queryset = TenantUsage.objects.select_related("tenant__plan").order_by("tenant_id")
+    serializer_class = TenantUsageSerializer
+    permission_classes = [permissions.IsAdminUser]
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        tenant_id = self.request.query_params.get("tenant")
+        if tenant_id:
+            if not tenant_id.isdigit():
+                raise ValidationError({"tenant": ["Debe ser un id numérico."]})
+            qs = qs.filter(tenant_id=tenant_id)
+        return qs
+
+
+@api_view(["GET"])
+@permission_classes([permissions.IsAdminUser])
+def tenant_cache_stats(request):
+    """
+    Aciertos/fallos de la caché de resolución de tenants (proceso actual).
+    En estado estable 'misses' no debería crecer: el middleware no hace queries.
+    """
+    return Response(tenant_cache.stats())
+
+
+@api_view(["GET"])
+@permission_classes([permissions.IsAdminUser])
+def analytics_list(request):
+    """Agregados de plataforma disponibles (GET /api/tenants/analytics)."""
+    return Response([
+        {"name": a.name, "params": list(a.params), "description": a.description}
+        for a in AGGREGATES.values()
+    ])
+
+
+@api_view(["GET"])
+@permission_classes([permissions.IsAdminUser])
+def analytics_run(request, name):
+    """
+    Ejecuta un agregado en todos los colegios activos y devuelve totales + detalle.
+    GET /api/tenants/analytics/<name>?date=...&refresh=1
+    """
+    if name not in AGGREGATES:
+        return Response({"error": f"Agregado '{name}' no existe"}, status=404)
+    params = request.query_params.dict()
+    use_cache = params.pop("refresh", None) not in ("1", "true")
+    params.pop("format", None)  # ?format= de DRF
+    try:
+        return Response(run_aggregate(name, params, use_cache=use_cache))
+    except InvalidParams as exc:
+        return Response({"error": "Parámetros inválidos", "params": exc.errors}, status=400)